@@ -0,0 +1,201 @@
+"""
+동기(WSGI) 리스트와 async(ASGI) 리스트를 동시 요청 수를 올려가며 비교
+
+    python -m benchmarks.async_endpoints --concurrency 200 --delay 50
+
+--delay ms 만큼 쿼리마다 sleep 해서 느린 DB를 흉내낸다. WSGI는 --threads 개의
+worker thread(gunicorn gthread와 같은 방식)로, ASGI는 ASGIHandler를 이벤트 루프
+하나에서 직접 호출해서 처리한다. 매 round마다 --concurrency 개의 요청을 한번에 보냄
+"""
+
+import argparse
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.utils import setup_django, summarize, test_databases
+
+
+def seed(rows):
+    from django.contrib.auth import get_user_model
+    from rest_framework.authtoken.models import Token
+
+    from core.models import Blog, BlogTag
+
+    user = get_user_model().objects.create_user("bench@example.com", "test123!@#")
+    tag = BlogTag.objects.create(user=user, name="tag")
+    for i in range(rows):
+        Blog.objects.create(user=user, title=f"title {i}", content="content").tags.add(
+            tag
+        )
+    return Token.objects.create(user=user).key
+
+
+def slow_queries(delay):
+    """새로 열리는 모든 DB 연결의 쿼리에 delay초 지연을 넣음"""
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(delay)
+        return execute(sql, params, many, context)
+
+    def add_wrapper(sender, connection, **kwargs):
+        connection.execute_wrappers.append(wrapper)
+
+    connection_created.connect(add_wrapper, weak=False)
+    for connection in connections.all():
+        connection.execute_wrappers.append(wrapper)
+
+
+class ThreadCounter:
+    """round 동안 살아있던 thread 수의 최대값"""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(0.005):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_wsgi(url, token, concurrency, threads):
+    from django.test import Client
+
+    local = threading.local()
+
+    def request(sent):
+        if not hasattr(local, "client"):
+            local.client = Client(HTTP_AUTHORIZATION=f"Token {token}")
+        res = local.client.get(url)
+        assert res.status_code == 200, res.status_code
+        return (time.perf_counter() - sent) * 1000
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        sent = time.perf_counter()
+        futures = [pool.submit(request, sent) for _ in range(concurrency)]
+        return [future.result() for future in futures]
+
+
+async def asgi_get(application, path, token):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"authorization", f"Token {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    messages = []
+    disconnect = asyncio.Event()
+
+    async def receive():
+        if not messages:
+            messages.append(None)
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    status = None
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif not message.get("more_body"):
+            disconnect.set()
+
+    await application(scope, receive, send)
+    assert status == 200, status
+
+
+def run_asgi(application, url, token, concurrency):
+    async def request(sent):
+        await asgi_get(application, url, token)
+        return (time.perf_counter() - sent) * 1000
+
+    async def burst():
+        sent = time.perf_counter()
+        return await asyncio.gather(*[request(sent) for _ in range(concurrency)])
+
+    return asyncio.run(burst())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--settings", default=None)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=20, help="쿼리당 지연 (ms)")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--cache", action="store_true", help="응답 캐시를 켜고 측정 (기본은 DB까지 감)"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.cache:
+        os.environ["API_CACHE_BACKEND"] = "django.core.cache.backends.dummy.DummyCache"
+    setup_django(args.settings)
+
+    from django.core.asgi import get_asgi_application
+
+    with test_databases():
+        token = seed(args.rows)
+        slow_queries(args.delay / 1000)
+        application = get_asgi_application()
+
+        print(
+            f"rows={args.rows} concurrency={args.concurrency} "
+            f"wsgi threads={args.threads} delay={args.delay}ms rounds={args.rounds}"
+        )
+        print(
+            f"{'path':<22}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'p99 ms':>10}{'threads':>9}"
+        )
+        cases = [
+            (
+                "wsgi /blog/",
+                lambda: run_wsgi("/blog/", token, args.concurrency, args.threads),
+            ),
+            (
+                "asgi /blog/async/",
+                lambda: run_asgi(application, "/blog/async/", token, args.concurrency),
+            ),
+        ]
+        for name, run in cases:
+            samples, elapsed = [], 0
+            with ThreadCounter() as threads:
+                for _ in range(args.rounds):
+                    start = time.perf_counter()
+                    samples += run()
+                    elapsed += time.perf_counter() - start
+            result = summarize(samples)
+            print(
+                f"{name:<22}{len(samples) / elapsed:>9.1f}{result['p50']:>10.1f}"
+                f"{result['p95']:>10.1f}{result['p99']:>10.1f}{threads.peak:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+blog 리스트 응답(기본 1000개)을 JSONRenderer와 ORJSONRenderer로 인코딩하는 시간,
+JSONParser와 ORJSONParser로 디코딩하는 시간 비교
+
+    python -m benchmarks.json_renderers --rows 1000 --repeat 50
+
+직렬화(serializer.data)는 한번만 하고 그 결과를 반복해서 인코딩함
+"""
+
+import argparse
+import gc
+import io
+
+from benchmarks.utils import setup_django, summarize, test_databases, timeit
+
+
+def seed(rows, tags_per_row):
+    from django.contrib.auth import get_user_model
+
+    from core.models import Blog, BlogTag
+
+    user = get_user_model().objects.create_user("bench@example.com", "test123!@#")
+    tags = BlogTag.objects.bulk_create(
+        BlogTag(user=user, name=f"tag{i}", slug=f"tag{i}") for i in range(tags_per_row)
+    )
+    blogs = Blog.objects.bulk_create(
+        Blog(user=user, title=f"title {i}", content="블로그 내용 content " * 30)
+        for i in range(rows)
+    )
+    Blog.tags.through.objects.bulk_create(
+        Blog.tags.through(blog_id=blog.pk, blogtag_id=tag.pk)
+        for blog in blogs
+        for tag in tags
+    )
+    return user
+
+
+def payload(user):
+    from blog.serializers import BlogOutSerializer
+    from blog.views import BlogAPIView
+
+    queryset = BlogAPIView.queryset.filter(user=user).prefetch_related(
+        *BlogAPIView().bulk_prefetch
+    )
+    results = BlogOutSerializer(queryset, many=True).data
+    return {"next": None, "previous": None, "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--settings", default=None)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--tags", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    setup_django(args.settings)
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from core.parsers import ORJSONParser
+    from core.renderers import ORJSONRenderer
+
+    with test_databases():
+        data = payload(seed(args.rows, args.tags))
+
+    body = JSONRenderer().render(data)
+    assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(
+        io.BytesIO(ORJSONRenderer().render(data))
+    )
+
+    print(
+        f"rows={args.rows} tags={args.tags} repeat={args.repeat} "
+        f"body={len(body) / 1024:.0f}KiB"
+    )
+    print(f"{'case':<24}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'speedup':>9}")
+    cases = [
+        ("render", JSONRenderer().render, ORJSONRenderer().render, data),
+        (
+            "parse",
+            lambda body: JSONParser().parse(io.BytesIO(body)),
+            lambda body: ORJSONParser().parse(io.BytesIO(body)),
+            body,
+        ),
+    ]
+    for name, stdlib, fast, value in cases:
+        results = {}
+        for label, func in [("json", stdlib), ("orjson", fast)]:
+            gc.collect()
+            results[label] = summarize(timeit(lambda: func(value), args.repeat))
+        for label, result in results.items():
+            print(
+                f"{name + ' ' + label:<24}{result['mean']:>10.2f}"
+                f"{result['p50']:>10.2f}{result['p95']:>10.2f}"
+                f"{results['json']['mean'] / result['mean']:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
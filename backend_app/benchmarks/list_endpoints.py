@@ -0,0 +1,88 @@
+"""
+/blog/, /camping/ 리스트 엔드포인트 쿼리 수와 응답시간 측정
+
+    python -m benchmarks.list_endpoints --rows 500 --repeat 50
+"""
+
+import argparse
+
+from benchmarks.utils import setup_django, summarize, test_databases, timeit
+
+
+def seed(rows, tags_per_row):
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+
+    from core.models import Blog, BlogTag, Camping, CampingTag
+
+    user = get_user_model().objects.create_user("bench@example.com", "test123!@#")
+    with transaction.atomic():
+        blog_tags = [
+            BlogTag.objects.create(user=user, name=f"tag{i}")
+            for i in range(tags_per_row)
+        ]
+        camping_tags = [
+            CampingTag.objects.create(user=user, name=f"tag{i}")
+            for i in range(tags_per_row)
+        ]
+        for i in range(rows):
+            blog = Blog.objects.create(
+                user=user, title=f"title {i}", content="content " * 50
+            )
+            blog.tags.set(blog_tags)
+            camping = Camping.objects.create(
+                user=user, title=f"title {i}", review="review " * 50
+            )
+            camping.tags.set(camping_tags)
+    return user
+
+
+def measure(client, url, repeat):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = client.get(url)
+    assert res.status_code == 200, res.status_code
+
+    queries = [query["sql"] for query in ctx.captured_queries]
+    samples = timeit(lambda: client.get(url), repeat)
+    return dict(
+        queries=len(queries),
+        joins=sum(sql.upper().count(" JOIN ") for sql in queries),
+        **summarize(samples),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--settings", default=None)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--tags", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    setup_django(args.settings)
+
+    from rest_framework.test import APIClient
+
+    with test_databases():
+        user = seed(args.rows, args.tags)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        print(f"rows={args.rows} tags/row={args.tags} repeat={args.repeat}")
+        print(
+            f"{'endpoint':<12}{'queries':>9}{'joins':>7}"
+            f"{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        )
+        for url in ["/blog/", "/camping/"]:
+            result = measure(client, url, args.repeat)
+            print(
+                f"{url:<12}{result['queries']:>9}{result['joins']:>7}"
+                f"{result['mean']:>10.1f}{result['p50']:>10.1f}{result['p95']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
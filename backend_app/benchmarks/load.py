@@ -0,0 +1,610 @@
+"""
+user, blog, camping API를 실제 HTTP로 동시에 요청해서 경로별 처리량과
+p50/p95/p99를 재고 JSON으로 저장. 버전끼리 결과를 비교해서 느려진 경로를 찾음
+
+    python -m benchmarks.load --users 20 --posts 5000 --concurrency 16
+    python -m benchmarks.load --url http://127.0.0.1:8000 --output v2.json
+    python -m benchmarks.load --compare v1.json v2.json
+
+--url이 없으면 테스트 DB를 만들고 같은 process에서 서버를 띄움 (uvicorn이 있으면
+운영과 같은 ASGI, 없으면 Django ThreadedWSGIServer). 부하를 주는 thread와 GIL을
+나눠 쓰므로 절대값보다는 같은 머신에서 버전끼리 비교하는 용도. 운영에 가까운 값은
+uvicorn을 따로 띄우고 --url로
+
+데이터는 --seed로 고정한 난수로 API를 통해 넣음 (user마다 글 수가 치우치게).
+--url 서버에도 똑같이 넣을 수 있고 이메일에 실행 id를 붙여서 겹치지 않음
+
+경로마다 --concurrency 개 thread가 keep-alive 연결 하나씩으로 --requests 번을
+나눠 보냄. i번째 요청이 쓰는 user, 글은 i로 정해져서 실행마다 같은 요청이 나감
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from benchmarks.utils import BASE_DIR, setup_django, summarize, test_databases
+
+RESULTS_DIR = BASE_DIR / "benchmarks" / "results"
+PASSWORD = "bench123!@#"
+BULK_SIZE = 500
+
+WORDS = (
+    "캠핑 텐트 타프 화로대 장작 불멍 바베큐 오토캠핑 글램핑 차박 계곡 바다 "
+    "숲속 별보기 사이트 전기 개수대 샤워장 매너타임 주차 예약 후기 가족 "
+    "아이들 강아지 날씨 비 바람 새벽 아침 커피 라면 고기 맛있게 조용한 "
+    "깨끗한 넓은 추천 다시 가고싶은 주말 여행 준비물 장비 의자 테이블"
+).split()
+
+
+class Client:
+    """keep-alive 연결 하나. 서버가 idle 연결을 닫았으면 한번 다시 연결"""
+
+    def __init__(self, base_url):
+        url = urlsplit(base_url)
+        self.connection_class = (
+            http.client.HTTPSConnection
+            if url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self.netloc = url.netloc
+        self.prefix = url.path.rstrip("/")
+        self.connection = None
+
+    def request(self, method, path, body=None, auth=None):
+        headers = {"Accept": "application/json"}
+        if auth:
+            headers["Authorization"] = auth
+        if body is not None:
+            body = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+
+        for retry in [True, False]:
+            if self.connection is None:
+                self.connection = self.connection_class(self.netloc, timeout=60)
+            try:
+                self.connection.request(method, self.prefix + path, body, headers)
+                response = self.connection.getresponse()
+                data = response.read()
+            except (
+                http.client.RemoteDisconnected,
+                ConnectionResetError,
+                BrokenPipeError,
+            ):
+                self.connection.close()
+                self.connection = None
+                if not retry:
+                    raise
+                continue
+            if response.will_close:
+                self.connection.close()
+                self.connection = None
+            return response.status, data
+
+    def json(self, method, path, body=None, auth=None, expect=200):
+        status, data = self.request(method, path, body, auth)
+        if status != expect:
+            raise RuntimeError(f"{method} {path} -> {status}: {data[:200]!r}")
+        return json.loads(data) if data else None
+
+
+def text(rng, words):
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def post_counts(rng, users, posts):
+    """user별 글 수. 앞쪽 user일수록 많이 쓰는 Zipf 분포"""
+    weights = [1 / (rank + 1) for rank in range(users)]
+    counts = [0] * users
+    for index in rng.choices(range(users), weights=weights, k=posts):
+        counts[index] += 1
+    return counts
+
+
+def make_posts(rng, count, text_field, vocabulary):
+    return [
+        {
+            "title": text(rng, rng.randint(2, 6)),
+            text_field: text(rng, rng.randint(30, 300)),
+            "tags": [
+                {"name": name}
+                for name in rng.sample(
+                    vocabulary, rng.randint(0, min(3, len(vocabulary)))
+                )
+            ],
+        }
+        for _ in range(count)
+    ]
+
+
+def seed(client, args):
+    """API로 user, 글, 태그를 넣고 user별 {email, auth, blog, camping} 목록을 돌려줌"""
+    rng = random.Random(args.seed)
+    run_id = secrets.token_hex(4)
+    accounts = []
+    counts = post_counts(rng, args.users, args.posts)
+    for i, count in enumerate(counts):
+        email = f"bench-{run_id}-{i}@example.com"
+        client.json(
+            "POST",
+            "/user/create/",
+            {"email": email, "password": PASSWORD, "name": f"bench{i}"},
+            expect=201,
+        )
+        token = client.json(
+            "POST", "/user/token/", {"email": email, "password": PASSWORD}
+        )["token"]
+        vocabulary = rng.sample(WORDS, args.tags)
+        auth = f"Token {token}"
+        account = {"email": email, "auth": auth, "vocabulary": vocabulary}
+        for prefix, text_field in [("blog", "content"), ("camping", "review")]:
+            ids = []
+            posts = make_posts(rng, max(count, 1), text_field, vocabulary)
+            for start in range(0, len(posts), BULK_SIZE):
+                created = client.json(
+                    "POST",
+                    f"/{prefix}/bulk/",
+                    posts[start : start + BULK_SIZE],
+                    auth,
+                    expect=201,
+                )
+                ids += [item["id"] for item in created]
+            account[prefix] = ids
+        accounts.append(account)
+    return accounts
+
+
+def pick(items, i):
+    """i마다 정해진 항목 (실행마다 같은 순서)"""
+    return items[(i * 7919) % len(items)]
+
+
+class Scenario:
+    """
+    경로 하나. request(ctx, i)가 (method, path, body, Authorization)을 돌려줌
+
+    setup(ctx, client, n)은 시간을 재기 전에 n번 요청에 필요한 데이터를 만듦
+    (지울 글, 폐기할 토큰 등)
+    """
+
+    def __init__(self, name, request, expect=200, setup=None):
+        self.name = name
+        self.request = request
+        self.expect = expect
+        self.setup = setup
+
+
+def account(ctx, i):
+    return pick(ctx["accounts"], i)
+
+
+def create_throwaway(prefix, text_field):
+    def setup(ctx, client, n):
+        rng = random.Random(n)
+        ctx[f"{prefix}-throwaway"] = ids = []
+        for i, owner in enumerate(ctx["accounts"]):
+            count = len(range(i, n, len(ctx["accounts"])))
+            posts = make_posts(rng, count, text_field, owner["vocabulary"])
+            for start in range(0, len(posts), BULK_SIZE):
+                created = client.json(
+                    "POST",
+                    f"/{prefix}/bulk/",
+                    posts[start : start + BULK_SIZE],
+                    owner["auth"],
+                    expect=201,
+                )
+                ids += [(owner["auth"], item["id"]) for item in created]
+
+    return setup
+
+
+def issue_signed_tokens(ctx, client, n):
+    ctx["signed"] = [
+        "Bearer "
+        + client.json(
+            "POST",
+            "/user/token/signed/",
+            {"email": account(ctx, i)["email"], "password": PASSWORD},
+        )["token"]
+        for i in range(n)
+    ]
+
+
+def post_scenarios(prefix, text_field):
+    def owner_post(ctx, i):
+        owner = account(ctx, i)
+        return owner, pick(owner[prefix], i)
+
+    def new_post(ctx, i):
+        owner = account(ctx, i)
+        rng = random.Random(i)
+        return make_posts(rng, 1, text_field, owner["vocabulary"])[0]
+
+    def detail(method, body=None):
+        def request(ctx, i):
+            owner, id = owner_post(ctx, i)
+            return method, f"/{prefix}/{id}/", body and body(ctx, i), owner["auth"]
+
+        return request
+
+    def get(path):
+        return lambda ctx, i: ("GET", path(ctx, i), None, account(ctx, i)["auth"])
+
+    def delete(ctx, i):
+        auth, id = ctx[f"{prefix}-throwaway"].pop()
+        return "DELETE", f"/{prefix}/{id}/", None, auth
+
+    return [
+        Scenario(f"GET /{prefix}/", get(lambda ctx, i: f"/{prefix}/")),
+        Scenario(
+            f"GET /{prefix}/?view=summary",
+            get(lambda ctx, i: f"/{prefix}/?view=summary"),
+        ),
+        Scenario(f"GET /{prefix}/async/", get(lambda ctx, i: f"/{prefix}/async/")),
+        Scenario(
+            f"GET /{prefix}/search/?q=",
+            get(lambda ctx, i: f"/{prefix}/search/?q={quote(pick(WORDS, i))}"),
+        ),
+        Scenario(f"GET /{prefix}/{{id}}/", detail("GET")),
+        Scenario(
+            f"POST /{prefix}/",
+            lambda ctx, i: (
+                "POST",
+                f"/{prefix}/",
+                new_post(ctx, i),
+                account(ctx, i)["auth"],
+            ),
+            expect=201,
+        ),
+        Scenario(
+            f"POST /{prefix}/bulk/",
+            lambda ctx, i: (
+                "POST",
+                f"/{prefix}/bulk/",
+                [new_post(ctx, i * 20 + j) for j in range(20)],
+                account(ctx, i)["auth"],
+            ),
+            expect=201,
+        ),
+        Scenario(
+            f"PATCH /{prefix}/{{id}}/",
+            detail("PATCH", lambda ctx, i: {"title": text(random.Random(i), 4)}),
+        ),
+        Scenario(
+            f"DELETE /{prefix}/{{id}}/",
+            delete,
+            expect=204,
+            setup=create_throwaway(prefix, text_field),
+        ),
+    ]
+
+
+SCENARIOS = [
+    Scenario(
+        "POST /user/token/",
+        lambda ctx, i: (
+            "POST",
+            "/user/token/",
+            {"email": account(ctx, i)["email"], "password": PASSWORD},
+            None,
+        ),
+    ),
+    Scenario(
+        "POST /user/token/signed/",
+        lambda ctx, i: (
+            "POST",
+            "/user/token/signed/",
+            {"email": account(ctx, i)["email"], "password": PASSWORD},
+            None,
+        ),
+    ),
+    Scenario(
+        "POST /user/token/revoke/",
+        lambda ctx, i: ("POST", "/user/token/revoke/", None, ctx["signed"][i]),
+        expect=204,
+        setup=issue_signed_tokens,
+    ),
+    Scenario(
+        "POST /user/create/",
+        lambda ctx, i: (
+            "POST",
+            "/user/create/",
+            {
+                "email": f"new-{ctx['run_id']}-{i}@example.com",
+                "password": PASSWORD,
+                "name": "new",
+            },
+            None,
+        ),
+        expect=201,
+    ),
+    Scenario(
+        "GET /blog/tag/",
+        lambda ctx, i: ("GET", "/blog/tag/", None, account(ctx, i)["auth"]),
+    ),
+    *post_scenarios("blog", "content"),
+    *post_scenarios("camping", "review"),
+]
+
+
+def run_scenario(scenario, base_url, ctx, concurrency, requests, warmup):
+    """warmup번 먼저 보내고 requests번의 latency(ms), 에러 수, 처리량"""
+    total = warmup + requests
+    if scenario.setup:
+        scenario.setup(ctx, Client(base_url), total)
+
+    def worker(counter, limit):
+        client = Client(base_url)
+        latencies, errors = [], 0
+        while (i := next(counter)) < limit:
+            method, path, body, auth = scenario.request(ctx, i)
+            start = time.perf_counter()
+            try:
+                status, _ = client.request(method, path, body, auth)
+            except OSError:
+                status = None
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != scenario.expect:
+                errors += 1
+        return latencies, errors
+
+    def burst(start, limit):
+        counter = itertools.count(start)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            started = time.perf_counter()
+            futures = [pool.submit(worker, counter, limit) for _ in range(concurrency)]
+            results = [future.result() for future in futures]
+            return results, time.perf_counter() - started
+
+    burst(0, warmup)
+    results, elapsed = burst(warmup, total)
+    latencies = [value for samples, _ in results for value in samples]
+    return dict(
+        requests=len(latencies),
+        errors=sum(errors for _, errors in results),
+        rps=len(latencies) / elapsed,
+        **summarize(latencies),
+        max=max(latencies),
+    )
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def local_server():
+    """같은 process에 서버를 띄우고 (base_url, 종류)"""
+    port = free_port()
+    try:
+        import uvicorn
+    except ImportError:
+        uvicorn = None
+
+    if uvicorn is not None:
+        from django.core.asgi import get_asgi_application
+
+        config = uvicorn.Config(
+            get_asgi_application(),
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+            lifespan="off",
+        )
+        server = uvicorn.Server(config)
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.01)
+        try:
+            yield f"http://127.0.0.1:{port}", "asgi (uvicorn)"
+        finally:
+            server.should_exit = True
+            thread.join()
+        return
+
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadedWSGIServer(("127.0.0.1", port), QuietHandler)
+    server.set_app(WSGIHandler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{port}", "wsgi (ThreadedWSGIServer)"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def sqlite_for_threads(directory):
+    """
+    sqlite 메모리 테스트 DB는 thread끼리 쓰기가 겹치면 기다리지 않고 바로
+    table lock 에러라서 파일로 만들고, transaction도 처음부터 쓰기 lock을 잡아서
+    읽다가 쓰기로 올리며 서로 막히지 않게 함
+    """
+    from django.db import connections
+
+    for alias in connections:
+        database = connections[alias].settings_dict
+        if not database["ENGINE"].endswith("sqlite3"):
+            continue
+        if not database["TEST"]["NAME"]:
+            database["TEST"]["NAME"] = str(Path(directory) / f"load_{alias}.sqlite3")
+        database["OPTIONS"] = {
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 60,
+            **database["OPTIONS"],
+        }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark(base_url, server, args):
+    scenarios = [
+        scenario
+        for scenario in SCENARIOS
+        if not args.only or any(part in scenario.name for part in args.only)
+    ]
+    client = Client(base_url)
+    started = time.perf_counter()
+    ctx = {"accounts": seed(client, args), "run_id": secrets.token_hex(4)}
+    print(
+        f"server={server} users={args.users} posts={args.posts} "
+        f"seeded in {time.perf_counter() - started:.1f}s"
+    )
+    print(f"concurrency={args.concurrency} requests={args.requests}")
+    print(
+        f"{'route':<32}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'errors':>8}"
+    )
+
+    results = {}
+    for scenario in scenarios:
+        result = run_scenario(
+            scenario, base_url, ctx, args.concurrency, args.requests, args.warmup
+        )
+        results[scenario.name] = result
+        print(
+            f"{scenario.name:<32}{result['rps']:>9.1f}{result['p50']:>9.1f}"
+            f"{result['p95']:>9.1f}{result['p99']:>9.1f}{result['errors']:>8}"
+        )
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "server": server,
+            "url": args.url,
+            "python": platform.python_version(),
+            "settings": os.environ.get("DJANGO_SETTINGS_MODULE"),
+            "cache": args.cache,
+            **{
+                name: getattr(args, name)
+                for name in [
+                    "users",
+                    "posts",
+                    "tags",
+                    "seed",
+                    "concurrency",
+                    "requests",
+                    "warmup",
+                ]
+            },
+        },
+        "results": results,
+    }
+
+
+def compare(old_path, new_path, threshold):
+    """경로별 처리량, p95 변화. threshold % 넘게 나빠진 경로가 있으면 1"""
+    old = json.loads(Path(old_path).read_text())
+    new = json.loads(Path(new_path).read_text())
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']}")
+    print(f"{'route':<32}{'req/s':>10}{'p95 ms':>10}")
+
+    regressions = []
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            continue
+        rps = (result["rps"] / before["rps"] - 1) * 100
+        p95 = (result["p95"] / before["p95"] - 1) * 100
+        mark = ""
+        if rps < -threshold or p95 > threshold:
+            regressions.append(name)
+            mark = "  <- slower"
+        print(f"{name:<32}{rps:>+9.1f}%{p95:>+9.1f}%{mark}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--settings", default=None)
+    parser.add_argument("--url", help="떠 있는 서버 (없으면 테스트 DB로 직접 띄움)")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--posts", type=int, default=2000, help="blog, camping 각각")
+    parser.add_argument("--tags", type=int, default=10, help="user별 태그 종류")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="경로마다")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--only", nargs="*", help="이름에 들어간 경로만")
+    parser.add_argument(
+        "--cache", action="store_true", help="응답 캐시를 켜고 측정 (직접 띄울 때)"
+    )
+    parser.add_argument("--output", help=f"결과 JSON (기본 {RESULTS_DIR}/...)")
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("OLD", "NEW"), help="두 결과 JSON 비교"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=15, help="--compare에서 나빠졌다고 볼 %%"
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        sys.exit(compare(*args.compare, args.threshold))
+
+    if args.url:
+        result = benchmark(args.url, "external", args)
+    else:
+        if not args.cache:
+            os.environ["API_CACHE_BACKEND"] = (
+                "django.core.cache.backends.dummy.DummyCache"
+            )
+        setup_django(args.settings)
+        # 느린 요청, SQL 로그가 결과 표 사이에 섞이지 않도록
+        logging.getLogger("core.timing").setLevel(logging.ERROR)
+        with tempfile.TemporaryDirectory() as directory:
+            sqlite_for_threads(directory)
+            with test_databases(), local_server() as (base_url, server):
+                result = benchmark(base_url, server, args)
+
+    output = Path(
+        args.output
+        or RESULTS_DIR
+        / f"load-{result['meta']['commit']}-{datetime.now():%Y%m%d%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+    print(f"saved {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from core.models import Blog, BlogTag
 from user.serializers import UserOutSerializer
+from core.bulk import BulkListSerializer
+from core.serializers import WritableTagsMixin
 
 
 class TagInSerializer(serializers.ModelSerializer):
@@ -18,16 +20,36 @@ class TagOutSerializer(TagInSerializer):
         read_only_fields = TagInSerializer.Meta.read_only_fields + ["slug"]
 
 
-class BlogInSerializer(serializers.ModelSerializer):
+class BlogInSerializer(WritableTagsMixin, serializers.ModelSerializer):
     user = UserOutSerializer(read_only=True)
     tags = TagOutSerializer(required=False, many=True)
 
     class Meta:
         model = Blog
-        fields = ["id", "title", "content"]
+        fields = ["id", "title", "content", "tags"]
         read_only_fields = ["id"]
+        list_serializer_class = BulkListSerializer
 
 
 class BlogOutSerializer(BlogInSerializer):
     class Meta(BlogInSerializer.Meta):
         fields = BlogInSerializer.Meta.fields + ["updated_at", "created_at"]
+
+
+class BlogSummarySerializer(BlogOutSerializer):
+    """?view=summary 목록. 본문 대신 저장해둔 앞부분, 단어 수"""
+
+    class Meta(BlogOutSerializer.Meta):
+        fields = [
+            "id",
+            "title",
+            "excerpt",
+            "word_count",
+            "tags",
+            "updated_at",
+            "created_at",
+        ]
+        read_only_fields = BlogOutSerializer.Meta.read_only_fields + [
+            "excerpt",
+            "word_count",
+        ]
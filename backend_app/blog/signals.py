@@ -0,0 +1,12 @@
+from django.contrib.auth import get_user_model
+
+from core.cache import invalidate_on_change
+from core import search
+from core.models import Blog, BlogTag, BlogTerm
+
+invalidate_on_change(Blog, ["blog"])
+invalidate_on_change(BlogTag, ["blog", "blogtag"])
+# 태그 응답에 user가 nested로 들어감
+invalidate_on_change(get_user_model(), ["blog", "blogtag"], user_attr="pk", m2m=False)
+
+search.register(Blog, BlogTerm, {"title": 3, "content": 1})
@@ -1,14 +1,26 @@
+import csv
+import json
+from unittest import mock
+
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
+from asgiref.sync import sync_to_async
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from rest_framework.test import APIClient
 from rest_framework import status
 
-from core.models import Blog
+from core.models import Blog, BlogTag
 from django.shortcuts import get_object_or_404
 
 from blog.serializers import BlogOutSerializer
+from blog.views import BlogAPIView
+from rest_framework.authtoken.models import Token
+from user.authentication import issue_token
+from core.tests.utils import QueryBudgetTestMixin
 
 
 def create_user(**kwargs):
@@ -20,6 +32,7 @@ def create_user(**kwargs):
         raise ValueError("user 만들기 실패 ㅅㄱ")
     return user
 
+
 def create_blog(user, **kwargs):
     title = kwargs.pop("title", "sample title")
     content = kwargs.pop("content", "sample content")
@@ -34,6 +47,9 @@ def create_blog(user, **kwargs):
 
 
 BLOG_URL = reverse("blog:blog-list")
+BULK_URL = reverse("blog:blog-bulk")
+
+
 def detail_url(blog_id):
     return reverse("blog:blog-detail", args=[blog_id])
 
@@ -47,7 +63,8 @@ class PublicBlogApisTest(TestCase):
         res = self.client.get(BLOG_URL)
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
-class PrivateBlogApisTest(TestCase):
+
+class PrivateBlogApisTest(QueryBudgetTestMixin, TestCase):
     def setUp(self) -> None:
         self.user = create_user()
         self.client = APIClient()
@@ -61,13 +78,12 @@ class PrivateBlogApisTest(TestCase):
         res = self.client.get(BLOG_URL)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        self.assertEqual(len(res.data), 2)
+        self.assertEqual(len(res.data["results"]), 2)
 
     def test_get_blog_list_limited_user(self) -> None:
         """본인이 소유한 모든 블로그 리스트 조회"""
         other_user = create_user(email="other@example.com")
         create_blog(user=other_user)
-        
 
         res = self.client.get(BLOG_URL)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -79,7 +95,6 @@ class PrivateBlogApisTest(TestCase):
         """작성한 글 한개 조회"""
         blog = create_blog(self.user)
 
-
         url = detail_url(blog.id)
         res = self.client.get(url)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -92,8 +107,8 @@ class PrivateBlogApisTest(TestCase):
     def test_create_blog_validated_data(self) -> None:
         """올바른 데이터에 대해서 블로그 생성"""
         payload = dict(
-            title = "sample title",
-            content = "content",
+            title="sample title",
+            content="content",
         )
         res = self.client.post(BLOG_URL, payload)
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
@@ -102,10 +117,7 @@ class PrivateBlogApisTest(TestCase):
         """유효한 데이터에 대해서 전체 업데이트"""
         blog = create_blog(self.user)
 
-        payload = dict(
-            title="new title",
-            content="new content"
-        )
+        payload = dict(title="new title", content="new content")
 
         url = detail_url(blog.id)
 
@@ -115,17 +127,13 @@ class PrivateBlogApisTest(TestCase):
         blog.refresh_from_db()
         for key, value in payload.items():
             self.assertEqual(getattr(blog, key), value)
-        
 
     def test_put_blog_invalid_user_raise_error(self) -> None:
         """다른 유저가 수정하려 하면 error"""
         other_user = create_user(email="other@example.com")
         blog = create_blog(other_user)
 
-        payload = dict(
-            title="new title",
-            content="new content"
-        )
+        payload = dict(title="new title", content="new content")
 
         url = detail_url(blog.id)
         res = self.client.put(url, payload)
@@ -135,9 +143,7 @@ class PrivateBlogApisTest(TestCase):
         """유효한 데이터에 대해서 부분 업데이트"""
         blog = create_blog(self.user)
 
-        payload = dict(            
-            content="new content"
-        )
+        payload = dict(content="new content")
 
         url = detail_url(blog.id)
 
@@ -147,15 +153,13 @@ class PrivateBlogApisTest(TestCase):
         blog.refresh_from_db()
         for key, value in payload.items():
             self.assertEqual(getattr(blog, key), value)
-        
+
     def test_patch_blog_invalid_user_raise_error(self) -> None:
         """다른 유저가 수정하려 하면 error"""
         other_user = create_user(email="other@example.com")
         blog = create_blog(other_user)
 
-        payload = dict(
-            content="new content"
-        )
+        payload = dict(content="new content")
 
         url = detail_url(blog.id)
         res = self.client.patch(url, payload)
@@ -183,9 +187,388 @@ class PrivateBlogApisTest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
         exists = Blog.objects.filter(user=other_user).exists()
         self.assertTrue(exists)
-    
 
+    def test_blog_list_paginated_by_updated_at_and_id(self) -> None:
+        """updated_at이 같아도 (updated_at, id) 커서로 빠짐없이 페이지 조회"""
+        blogs = [create_blog(self.user, title=f"title {i}") for i in range(5)]
+        Blog.objects.filter(id__in=[blog.id for blog in blogs[1:4]]).update(
+            updated_at=blogs[0].updated_at
+        )
+        expected = list(
+            Blog.objects.order_by("-updated_at", "-id").values_list("id", flat=True)
+        )
+
+        ids, pages = [], []
+        url = f"{BLOG_URL}?page_size=2"
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids += [blog["id"] for blog in res.data["results"]]
+            pages.append(res.data)
+            url = res.data["next"]
+
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]["previous"])
+
+        res = self.client.get(pages[-1]["previous"])
+        self.assertEqual(res.data["results"], pages[1]["results"])
+
+    def test_blog_list_deep_page_without_offset(self) -> None:
+        """다음 페이지 조회에 OFFSET을 쓰지 않아야함"""
+        for i in range(3):
+            create_blog(self.user, title=f"title {i}")
+        res = self.client.get(f"{BLOG_URL}?page_size=1")
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(res.data["next"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 1)
+        for query in ctx.captured_queries:
+            self.assertNotIn("OFFSET", query["sql"].upper())
+
+    def test_blog_list_invalid_cursor_raise_error(self) -> None:
+        """잘못된 커서는 404"""
+        res = self.client.get(f"{BLOG_URL}?cursor=invalid")
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_blog_list_query_budget(self) -> None:
+        """글 수와 상관없이 블로그 리스트 쿼리 수가 일정해야함"""
+
+        def grow():
+            for i in range(5):
+                blog = create_blog(self.user, title=f"title {i}")
+                blog.tags.add(BlogTag.objects.create(user=self.user, name=f"tag{i}"))
+
+        grow()
+        # ETag probe, blog, tags + user, user groups, user permissions
+        self.assertQueryBudget(5, lambda: self.client.get(BLOG_URL), grow)
+
+    def test_bulk_create_blogs(self) -> None:
+        """여러 블로그를 한번에 생성하고 항목별 결과 반환"""
+        payload = [dict(title=f"title {i}", content="content") for i in range(500)]
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.post(BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        # 검색 색인 insert는 sqlite 변수 개수 제한 때문에 batch가 잘게 나뉘어서 제외
+        queries = [q for q in ctx.captured_queries if "core_blogterm" not in q["sql"]]
+        self.assertLess(len(queries), 10)
+
+        self.assertEqual(len(res.data), 500)
+        self.assertEqual(Blog.objects.filter(user=self.user).count(), 500)
+        self.assertEqual(res.data[0]["title"], "title 0")
+        self.assertIsNotNone(res.data[0]["id"])
+
+    def test_bulk_create_invalid_item_saves_nothing(self) -> None:
+        """하나라도 잘못되면 아무것도 저장하지 않고 항목별 에러 반환"""
+        payload = [dict(title="title", content="content"), dict(title="")]
+
+        res = self.client.post(BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = res.data["non_field_errors"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("title", errors[1])
+        self.assertFalse(Blog.objects.exists())
+
+    def test_bulk_update_blogs(self) -> None:
+        """본인 글만 한번에 수정"""
+        blogs = [create_blog(self.user, title=f"title {i}") for i in range(3)]
+        payload = [dict(id=blog.id, title=f"new {blog.id}") for blog in blogs]
+
+        res = self.client.patch(BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        for blog in blogs:
+            old_updated_at = blog.updated_at
+            blog.refresh_from_db()
+            self.assertEqual(blog.title, f"new {blog.id}")
+            self.assertGreater(blog.updated_at, old_updated_at)
+
+        other_blog = create_blog(create_user(email="other@example.com"))
+        res = self.client.patch(
+            BULK_URL, [dict(id=other_blog.id, title="new")], format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        other_blog.refresh_from_db()
+        self.assertNotEqual(other_blog.title, "new")
+
+    def test_bulk_delete_blogs(self) -> None:
+        """본인 글만 한번에 삭제하고 항목별 결과 반환"""
+        blog = create_blog(self.user)
+        other_blog = create_blog(create_user(email="other@example.com"))
+
+        res = self.client.delete(BULK_URL, [blog.id, other_blog.id], format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["status"] for item in res.data],
+            [status.HTTP_204_NO_CONTENT, status.HTTP_404_NOT_FOUND],
+        )
+        self.assertFalse(Blog.objects.filter(id=blog.id).exists())
+        self.assertTrue(Blog.objects.filter(id=other_blog.id).exists())
+
+    def test_bulk_create_invalidates_list_cache(self) -> None:
+        """bulk 생성 후 리스트 조회에 바로 반영"""
+        self.client.get(BLOG_URL)
+        self.client.post(BULK_URL, [dict(title="t", content="c")], format="json")
+
+        res = self.client.get(BLOG_URL)
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_create_blog_with_tags(self) -> None:
+        """태그 이름으로 생성하면 기존 태그는 재사용하고 없는 태그만 생성"""
+        tag = BlogTag.objects.create(user=self.user, name="여행")
+        payload = dict(
+            title="title",
+            content="content",
+            tags=[dict(name="여행"), dict(name="캠핑 장비")],
+        )
+
+        res = self.client.post(BLOG_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        blog = Blog.objects.get(id=res.data["id"])
+        self.assertEqual(
+            sorted(blog.tags.values_list("slug", flat=True)), ["여행", "캠핑-장비"]
+        )
+        self.assertIn(tag, blog.tags.all())
+        self.assertEqual(BlogTag.objects.filter(user=self.user).count(), 2)
+
+    def test_create_blog_tag_queries_constant(self) -> None:
+        """태그 수와 상관없이 생성 쿼리 수가 일정해야함"""
+
+        def post(count):
+            payload = dict(
+                title="title",
+                content="content",
+                tags=[dict(name=f"tag {count} {i}") for i in range(count)],
+            )
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.post(BLOG_URL, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            return len(ctx)
+
+        self.assertEqual(post(2), post(20))
+
+    def test_update_blog_replace_tags(self) -> None:
+        """수정시 태그 목록을 교체"""
+        blog = create_blog(self.user)
+        blog.tags.add(BlogTag.objects.create(user=self.user, name="old"))
+
+        res = self.client.patch(
+            detail_url(blog.id), dict(tags=[dict(name="new")]), format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([tag["name"] for tag in res.data["tags"]], ["new"])
+        self.assertEqual(list(blog.tags.values_list("name", flat=True)), ["new"])
+
+    def test_search_blogs(self) -> None:
+        """내 글만 관련도 순으로 검색"""
+        other_user = create_user(email="other@example.com")
+        create_blog(other_user, title="캠핑 후기", content="캠핑 후기")
+        best = create_blog(self.user, title="캠핑 후기", content="캠핑장 후기")
+        second = create_blog(self.user, title="일기", content="오늘 캠핑 후기")
+        create_blog(self.user, title="일기", content="캠핑")
+
+        res = self.client.get(BLOG_URL + "search/", {"q": "캠핑 후기"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 2)
+        self.assertEqual(
+            [blog["id"] for blog in res.data["results"]], [best.id, second.id]
+        )
+
+    def test_search_blogs_after_update(self) -> None:
+        """수정, bulk 생성한 글도 바로 검색됨"""
+        blog = create_blog(self.user, title="title", content="content")
+        self.client.patch(detail_url(blog.id), dict(content="바닷가"), format="json")
+        self.client.post(
+            BLOG_URL + "bulk/", [dict(title="바닷가", content="c")], format="json"
+        )
+
+        res = self.client.get(BLOG_URL + "search/", {"q": "바닷가"})
+        self.assertEqual(res.data["count"], 2)
+        res = self.client.get(BLOG_URL + "search/", {"q": "content"})
+        self.assertEqual(res.data["count"], 0)
+
+    def test_search_blogs_without_query_raise_error(self) -> None:
+        res = self.client.get(BLOG_URL + "search/")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_blogs_jsonl(self) -> None:
+        """chunk 단위로 나눠서 읽어도 내 글 전체가 한줄씩 나와야함"""
+        other_user = create_user(email="other@example.com")
+        create_blog(other_user)
+        tag = BlogTag.objects.create(user=self.user, name="tag")
+        for i in range(5):
+            create_blog(self.user, title=f"title {i}").tags.add(tag)
+
+        url = reverse("blog:blog-export")
+        with mock.patch.object(BlogAPIView, "export_chunk_size", 2):
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.get(url)
+                lines = b"".join(res.streaming_content).decode().splitlines()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "application/x-ndjson; charset=utf-8")
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(
+            [row["title"] for row in rows], [f"title {i}" for i in range(5)]
+        )
+        self.assertEqual(rows[0]["tags"][0]["name"], "tag")
+        # chunk 3개 + 마지막 빈 chunk
+        blog_queries = [
+            q for q in ctx.captured_queries if 'FROM "core_blog"' in q["sql"]
+        ]
+        self.assertEqual(len(blog_queries), 4)
+
+    def test_export_blogs_csv(self) -> None:
+        blog = create_blog(self.user, title="제목, 쉼표")
+        blog.tags.add(BlogTag.objects.create(user=self.user, name="a"))
+        blog.tags.add(BlogTag.objects.create(user=self.user, name="b"))
+
+        res = self.client.get(reverse("blog:blog-export"), {"type": "csv"})
+        content = b"".join(res.streaming_content).decode()
+        rows = list(csv.reader(content.splitlines()))
+
+        self.assertEqual(rows[0][:4], ["id", "title", "content", "tags"])
+        self.assertEqual(rows[1][1], "제목, 쉼표")
+        self.assertEqual(sorted(rows[1][3].split("|")), ["a", "b"])
+
+    def test_export_invalid_type_raise_error(self) -> None:
+        res = self.client.get(reverse("blog:blog-export"), {"type": "xml"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_blogs_jsonl(self) -> None:
+        """잘못된 row는 건너뛰고 나머지는 태그와 함께 저장"""
+        lines = [
+            json.dumps(dict(title=f"title {i}", content="c", tags=[dict(name="t")]))
+            for i in range(5)
+        ]
+        lines.insert(2, json.dumps(dict(content="제목 없음")))
+        lines.insert(4, "{broken")
+        file = SimpleUploadedFile("blogs.jsonl", "\n".join(lines).encode())
+
+        with mock.patch.object(BlogAPIView, "import_batch_size", 2):
+            res = self.client.post(reverse("blog:blog-import"), {"file": file})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["created"], 5)
+        self.assertEqual([error["row"] for error in res.data["errors"]], [3, 5])
+        self.assertIn("title", res.data["errors"][0]["errors"])
+        self.assertEqual(Blog.objects.filter(user=self.user).count(), 5)
+        self.assertEqual(BlogTag.objects.filter(user=self.user).count(), 1)
+
+    def test_import_blogs_csv_from_export(self) -> None:
+        """export한 csv를 그대로 import"""
+        blog = create_blog(self.user, title="제목, 쉼표", content="줄\n바꿈")
+        blog.tags.add(BlogTag.objects.create(user=self.user, name="a"))
+        content = b"".join(
+            self.client.get(
+                reverse("blog:blog-export"), {"type": "csv"}
+            ).streaming_content
+        )
 
-    
-        
-        
\ No newline at end of file
+        file = SimpleUploadedFile("blogs.csv", content)
+        res = self.client.post(reverse("blog:blog-import"), {"file": file})
+
+        self.assertEqual(res.data["created"], 1)
+        imported = Blog.objects.exclude(id=blog.id).get(user=self.user)
+        self.assertEqual(imported.title, "제목, 쉼표")
+        self.assertEqual(imported.content, "줄\n바꿈")
+        self.assertEqual(list(imported.tags.values_list("name", flat=True)), ["a"])
+
+    def test_import_non_utf8_rows(self) -> None:
+        """UTF-8이 아닌 줄은 그 row만 실패로 남기고 나머지는 저장"""
+        for name, content in [
+            ("blogs.jsonl", b'{"title": "a", "content": "c"}\n\xff\xfe\n'),
+            ("blogs.csv", b"title,content\na,c\n\xff,c\nb,c\n"),
+        ]:
+            with self.subTest(name):
+                Blog.objects.filter(user=self.user).delete()
+                file = SimpleUploadedFile(name, content)
+                res = self.client.post(reverse("blog:blog-import"), {"file": file})
+
+                self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+                self.assertEqual(res.data["failed"], 1)
+                self.assertEqual(res.data["errors"][0]["row"], 2)
+                self.assertEqual(
+                    res.data["created"], Blog.objects.filter(user=self.user).count()
+                )
+
+
+class AsyncBlogApisTest(TestCase):
+    def setUp(self) -> None:
+        self.user = create_user()
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        tag = BlogTag.objects.create(user=self.user, name="tag")
+        self.blogs = [create_blog(self.user, title=f"title {i}") for i in range(3)]
+        for blog in self.blogs:
+            blog.tags.add(tag)
+        create_blog(create_user(email="other@example.com"))
+
+    async def test_async_list_same_as_sync_list(self) -> None:
+        """async 리스트도 동기 리스트와 같은 결과, 같은 커서"""
+        sync_res = await sync_to_async(self.client.get)(BLOG_URL, {"page_size": 2})
+
+        res = await self.async_client.get(
+            reverse("blog:blog-async-list"),
+            {"page_size": 2},
+            headers={"authorization": f"Token {self.token.key}"},
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        data = res.json()
+        self.assertEqual(data["results"], json.loads(sync_res.content)["results"])
+        self.assertIsNone(data["previous"])
+        self.assertIn("cursor=", data["next"])
+
+    async def test_async_detail_with_signed_token(self) -> None:
+        """서명 토큰으로 상세 조회, 다른 유저 글은 404"""
+        token, _ = await sync_to_async(issue_token)(self.user)
+        headers = {"authorization": f"Bearer {token}"}
+
+        res = await self.async_client.get(
+            reverse("blog:blog-async-detail", args=[self.blogs[0].id]), headers=headers
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["title"], "title 0")
+        self.assertEqual(res.json()["tags"][0]["name"], "tag")
+
+        other = await Blog.objects.exclude(user=self.user).afirst()
+        res = await self.async_client.get(
+            reverse("blog:blog-async-detail", args=[other.id]), headers=headers
+        )
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_export_streams_under_asgi(self) -> None:
+        """ASGI에서는 export를 chunk마다 읽어서 보냄 (전체를 먼저 읽지 않음)"""
+        with mock.patch.object(BlogAPIView, "export_chunk_size", 2):
+            res = await self.async_client.get(
+                reverse("blog:blog-export"),
+                headers={"authorization": f"Token {self.token.key}"},
+            )
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertTrue(res.is_async)
+
+            chunks = aiter(res.streaming_content)
+            first = await anext(chunks)
+            # 첫 chunk를 보낸 뒤에 쓴 글도 뒤 chunk에 나옴
+            await Blog.objects.acreate(user=self.user, title="late", content="c")
+            rest = [chunk async for chunk in chunks]
+
+        self.assertEqual(len(first.splitlines()), 2)
+        self.assertEqual(len(rest), 1)
+        rows = [json.loads(line) for line in b"".join([first, *rest]).splitlines()]
+        self.assertEqual(
+            [row["title"] for row in rows], ["title 0", "title 1", "title 2", "late"]
+        )
+
+    async def test_async_list_without_auth_raise_error(self) -> None:
+        res = await self.async_client.get(reverse("blog:blog-async-list"))
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        res = await self.async_client.get(
+            reverse("blog:blog-async-list"), headers={"authorization": "Token wrong"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
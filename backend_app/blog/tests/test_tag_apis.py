@@ -6,6 +6,7 @@ from rest_framework.test import APIClient
 from rest_framework import status
 
 from core.models import BlogTag
+from core.tests.utils import QueryBudgetTestMixin
 
 TAG_URL = reverse("blog:blogtag-list")
 
@@ -43,7 +44,7 @@ class PublicBlogTagAPIsTest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateBlogTagAPIsTest(TestCase):
+class PrivateBlogTagAPIsTest(QueryBudgetTestMixin, TestCase):
     def setUp(self) -> None:
         self.client = APIClient()
         self.user = create_user()
@@ -84,6 +85,17 @@ class PrivateBlogTagAPIsTest(TestCase):
         self.assertEqual(res.data[0].get("name"), payload["name"])
         self.assertEqual(res.data[0].get("slug"), tag.slug)
 
+    def test_tag_list_query_budget(self):
+        """태그 수와 상관없이 태그 리스트 쿼리 수가 일정해야함"""
+
+        def grow():
+            for i in range(5):
+                create_tag(self.user, name=f"tag{i}")
+
+        grow()
+        # tag + user, user groups, user permissions
+        self.assertQueryBudget(3, lambda: self.client.get(TAG_URL), grow)
+
     def test_failed_when_an_authenticated_user_modifies_another_user_tag(self):
         """인증유져가 다른유져의 태그 수정시 실패"""
         pass
@@ -1,6 +1,7 @@
 from rest_framework.routers import DefaultRouter
 from blog import views
 from django.urls import include, path
+from core.async_views import AsyncReadView
 
 router = DefaultRouter()
 router.register("tag", views.BlogTagApiView)
@@ -9,5 +10,16 @@ router.register("", views.BlogAPIView)
 
 app_name = "blog"
 urlpatterns = [
+    # router의 상세 경로(<pk>/)보다 먼저 매칭되어야 함
+    path(
+        "async/",
+        AsyncReadView.as_view(viewset=views.BlogAPIView),
+        name="blog-async-list",
+    ),
+    path(
+        "async/<int:pk>/",
+        AsyncReadView.as_view(viewset=views.BlogAPIView),
+        name="blog-async-detail",
+    ),
     path("", include(router.urls)),
 ]
@@ -1,7 +1,25 @@
 from rest_framework.authentication import TokenAuthentication
+from user.authentication import SignedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated
-from blog.serializers import BlogOutSerializer, TagOutSerializer, TagInSerializer
+from blog.serializers import (
+    BlogOutSerializer,
+    BlogSummarySerializer,
+    TagOutSerializer,
+    TagInSerializer,
+)
+from core.bulk import BulkModelMixin
+from core.cache import CachedResponseMixin, ConditionalResponseMixin
+from core.compiled import CompiledListMixin
+from core.db.sharding import select_user
+from core.export import ExportMixin
+from core.importer import ImportMixin
 from core.models import Blog, BlogTag
+from django.db.models import Prefetch, prefetch_related_objects
+from core.pagination import KeysetPagination
+from core.search import SearchMixin
+from core.sparse import SparseFieldsMixin
+from core.profiling import ProfileMixin
+from core.timing import ServerTimingMixin
 from rest_framework.generics import (
     ListAPIView,
     RetrieveAPIView,
@@ -13,6 +31,16 @@ from rest_framework.viewsets import GenericViewSet
 
 
 class BlogAPIView(
+    ProfileMixin,
+    ServerTimingMixin,
+    ConditionalResponseMixin,
+    CachedResponseMixin,
+    CompiledListMixin,
+    SparseFieldsMixin,
+    BulkModelMixin,
+    SearchMixin,
+    ExportMixin,
+    ImportMixin,
     DestroyAPIView,
     RetrieveUpdateAPIView,
     RetrieveAPIView,
@@ -22,22 +50,60 @@ class BlogAPIView(
 ):
     serializer_class = BlogOutSerializer
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [SignedTokenAuthentication, TokenAuthentication]
     queryset = Blog.objects.all()
+    pagination_class = KeysetPagination
+    cache_scope = "blog"
+
+    @property
+    def bulk_prefetch(self):
+        return [
+            Prefetch("tags", queryset=select_user(BlogTag.objects.all())),
+            "tags__user__groups",
+            "tags__user__user_permissions",
+        ]
+
+    @property
+    def summary(self):
+        """?view=summary 목록은 content를 읽지 않고 excerpt, word_count만"""
+        return (
+            self.action == "list" and self.request.query_params.get("view") == "summary"
+        )
+
+    def get_serializer_class(self):
+        if self.summary:
+            return BlogSummarySerializer
+        return self.serializer_class
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user)
+        queryset = self.queryset.filter(user=self.request.user).prefetch_related(
+            *self.bulk_prefetch
+        )
+        if self.summary:
+            queryset = queryset.defer("content")
+        return queryset
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
-        return super().perform_create(serializer)
+        instance = serializer.save(user=self.request.user)
+        # 응답 직렬화에서 태그 수만큼 쿼리가 나가지 않도록
+        prefetch_related_objects([instance], *self.bulk_prefetch)
 
 
-class BlogTagApiView(RetrieveUpdateAPIView, ListAPIView, GenericViewSet):
+class BlogTagApiView(
+    ProfileMixin,
+    ServerTimingMixin,
+    CachedResponseMixin,
+    CompiledListMixin,
+    SparseFieldsMixin,
+    RetrieveUpdateAPIView,
+    ListAPIView,
+    GenericViewSet,
+):
     serializer_class = TagInSerializer
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [SignedTokenAuthentication, TokenAuthentication]
     queryset = BlogTag.objects.all()
+    cache_scope = "blogtag"
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -45,4 +111,5 @@ class BlogTagApiView(RetrieveUpdateAPIView, ListAPIView, GenericViewSet):
         return self.serializer_class
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user)
+        queryset = select_user(self.queryset.filter(user=self.request.user))
+        return queryset.prefetch_related("user__groups", "user__user_permissions")
@@ -2,5 +2,8 @@ from django.apps import AppConfig
 
 
 class CampingConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'camping'
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "camping"
+
+    def ready(self):
+        from camping import signals  # noqa
@@ -4,6 +4,9 @@ from rest_framework import serializers
 
 from user.serializers import UserOutSerializer
 
+from core.bulk import BulkListSerializer
+from core.serializers import WritableTagsMixin
+
 
 class TagInSerializer(serializers.ModelSerializer):
     class Meta:
@@ -18,15 +21,27 @@ class TagOutSerializer(TagInSerializer):
         read_only_fields = TagInSerializer.Meta.read_only_fields + ["slug"]
 
 
-class CampingInSerializer(serializers.ModelSerializer):
+class CampingInSerializer(WritableTagsMixin, serializers.ModelSerializer):
     user = UserOutSerializer(read_only=True)
     tags = TagOutSerializer(required=False, many=True)
 
     class Meta:
         model = Camping
-        fields = "__all__"
+        exclude = ["excerpt", "word_count"]
         read_only_fields = ["id", "updated_at", "created_at"]
+        list_serializer_class = BulkListSerializer
 
 
 class CampingOutSerializer(CampingInSerializer):
     pass
+
+
+class CampingSummarySerializer(CampingOutSerializer):
+    """?view=summary 목록. review 대신 저장해둔 앞부분, 단어 수"""
+
+    class Meta(CampingOutSerializer.Meta):
+        exclude = ["review"]
+        read_only_fields = CampingOutSerializer.Meta.read_only_fields + [
+            "excerpt",
+            "word_count",
+        ]
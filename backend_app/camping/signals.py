@@ -0,0 +1,12 @@
+from django.contrib.auth import get_user_model
+
+from core.cache import invalidate_on_change
+from core import search
+from core.models import Camping, CampingTag, CampingTerm
+
+invalidate_on_change(Camping, ["camping"])
+invalidate_on_change(CampingTag, ["camping"])
+# 캠핑 응답에 user가 nested로 들어감
+invalidate_on_change(get_user_model(), ["camping"], user_attr="pk", m2m=False)
+
+search.register(Camping, CampingTerm, {"title": 3, "review": 1})
@@ -2,6 +2,10 @@
 Test Camping API
 """
 
+import json
+
+from asgiref.sync import sync_to_async
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 from rest_framework import status
 
@@ -9,8 +13,11 @@ from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from core.models import Camping
+from core.models import Camping, CampingTag
+from core.tests.utils import QueryBudgetTestMixin
 
 from camping.serializers import CampingOutSerializer
 
@@ -55,6 +62,7 @@ def create_camping(user, **kwargs):
 
 
 CAMPING_URL = reverse("camping:camping-list")
+BULK_URL = reverse("camping:camping-bulk")
 
 
 def detail_url(camping_id):
@@ -71,7 +79,7 @@ class PublicCampingTest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateCampingTest(TestCase):
+class PrivateCampingTest(QueryBudgetTestMixin, TestCase):
     def setUp(self) -> None:
         self.user = create_user()
         self.client = APIClient()
@@ -220,3 +228,118 @@ class PrivateCampingTest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
         self.assertTrue(Camping.objects.filter(id=camping.id).exists())
+
+    def test_camping_list_paginated_by_created_at_and_id(self):
+        """(created_at, id) 커서로 최신순 페이지 조회"""
+        for i in range(3):
+            create_camping(user=self.user, title=f"title {i}")
+        expected = list(
+            Camping.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+        res = self.client.get(f"{CAMPING_URL}?page_size=2")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [camping["id"] for camping in res.data["results"]]
+
+        res = self.client.get(res.data["next"])
+        ids += [camping["id"] for camping in res.data["results"]]
+
+        self.assertEqual(ids, expected)
+        self.assertIsNone(res.data["next"])
+
+    def test_camping_list_query_budget(self):
+        """row 수와 상관없이 캠핑 리스트 쿼리 수가 일정해야함"""
+
+        def grow():
+            for i in range(5):
+                camping = create_camping(user=self.user)
+                camping.tags.add(
+                    CampingTag.objects.create(user=self.user, name=f"tag{i}"),
+                    CampingTag.objects.create(user=self.user, name=f"other{i}"),
+                )
+
+        grow()
+        # ETag probe, camping + user, tags, user groups, user permissions
+        self.assertQueryBudget(5, lambda: self.client.get(CAMPING_URL), grow)
+
+    def test_bulk_create_and_update_camping(self):
+        """여러 캠핑을 한번에 생성, 수정"""
+        payload = [dict(title=f"title {i}", review="review") for i in range(50)]
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.post(BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertLess(len(ctx), 10)
+        self.assertEqual(res.data[0]["user"]["email"], self.user.email)
+
+        payload = [dict(id=item["id"], review="new review") for item in res.data]
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.patch(BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertLess(len(ctx), 10)
+        self.assertEqual(
+            Camping.objects.filter(user=self.user, review="new review").count(), 50
+        )
+
+    def test_bulk_create_camping_with_tags(self):
+        """bulk 생성시 태그를 한번에 resolve해서 연결"""
+        CampingTag.objects.create(user=self.user, name="바다")
+        payload = [
+            dict(
+                title=f"title {i}",
+                review="review",
+                tags=[dict(name="바다"), dict(name=f"t{i}")],
+            )
+            for i in range(20)
+        ]
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.post(BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertLess(len(ctx), 15)
+
+        self.assertEqual(CampingTag.objects.filter(user=self.user).count(), 21)
+        self.assertEqual(len(res.data[0]["tags"]), 2)
+        camping = Camping.objects.get(id=res.data[0]["id"])
+        self.assertEqual(
+            sorted(camping.tags.values_list("name", flat=True)), ["t0", "바다"]
+        )
+
+    def test_search_camping(self):
+        """review 검색"""
+        camping = create_camping(self.user, review="계곡 옆 사이트")
+        create_camping(self.user, review="바다 옆 사이트")
+
+        res = self.client.get(CAMPING_URL + "search/", {"q": "계곡"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in res.data["results"]], [camping.id])
+
+    def test_export_camping(self):
+        """jsonl로 user의 캠핑 전체를 내보냄"""
+        for i in range(3):
+            create_camping(self.user, title=f"title {i}")
+
+        res = self.client.get(reverse("camping:camping-export"))
+        lines = b"".join(res.streaming_content).decode().splitlines()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [json.loads(line)["title"] for line in lines],
+            [f"title {i}" for i in range(3)],
+        )
+
+    async def test_async_camping_list(self):
+        """async 리스트는 user, 태그까지 prefetch된 결과"""
+        token = await sync_to_async(Token.objects.create)(user=self.user)
+        camping = await sync_to_async(create_camping)(self.user)
+        tag = await CampingTag.objects.acreate(user=self.user, name="tag")
+        await camping.tags.aadd(tag)
+
+        res = await self.async_client.get(
+            reverse("camping:camping-async-list"),
+            headers={"authorization": f"Token {token.key}"},
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        item = res.json()["results"][0]
+        self.assertEqual(item["user"]["email"], self.user.email)
+        self.assertEqual(item["tags"][0]["name"], "tag")
@@ -1,6 +1,7 @@
 from django.urls import path, include
 from camping import views
 from rest_framework.routers import DefaultRouter
+from core.async_views import AsyncReadView
 
 router = DefaultRouter()
 router.register(r"", views.CampingViewSet)
@@ -8,5 +9,16 @@ app_name = "camping"
 
 
 urlpatterns = [
+    # router의 상세 경로(<pk>/)보다 먼저 매칭되어야 함
+    path(
+        "async/",
+        AsyncReadView.as_view(viewset=views.CampingViewSet),
+        name="camping-async-list",
+    ),
+    path(
+        "async/<int:pk>/",
+        AsyncReadView.as_view(viewset=views.CampingViewSet),
+        name="camping-async-detail",
+    ),
     path("", include(router.urls)),
 ]
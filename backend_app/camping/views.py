@@ -1,28 +1,77 @@
 from rest_framework.viewsets import ModelViewSet
-from camping.serializers import CampingInSerializer, CampingOutSerializer
+from camping.serializers import (
+    CampingInSerializer,
+    CampingOutSerializer,
+    CampingSummarySerializer,
+)
+from core.bulk import BulkModelMixin
+from core.cache import CachedResponseMixin, ConditionalResponseMixin
+from core.compiled import CompiledListMixin
+from core.db.sharding import select_user
+from core.export import ExportMixin
+from core.importer import ImportMixin
 from core.models import Camping
+from django.db.models import prefetch_related_objects
+from core.pagination import CreatedAtKeysetPagination
+from core.search import SearchMixin
+from core.sparse import SparseFieldsMixin
+from core.profiling import ProfileMixin
+from core.timing import ServerTimingMixin
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.authentication import TokenAuthentication
-from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
+from user.authentication import SignedTokenAuthentication
+from rest_framework.parsers import FormParser, MultiPartParser
+from core.parsers import ORJSONParser
 from rest_framework.generics import GenericAPIView
 
 
-class CampingViewSet(ModelViewSet, GenericAPIView):
+class CampingViewSet(
+    ProfileMixin,
+    ServerTimingMixin,
+    ConditionalResponseMixin,
+    CachedResponseMixin,
+    CompiledListMixin,
+    SparseFieldsMixin,
+    BulkModelMixin,
+    SearchMixin,
+    ExportMixin,
+    ImportMixin,
+    ModelViewSet,
+    GenericAPIView,
+):
     serializer_class = CampingInSerializer
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [SignedTokenAuthentication, TokenAuthentication]
     queryset = Camping.objects.all()
-    parser_classes = [JSONParser, FormParser, MultiPartParser]
+    pagination_class = CreatedAtKeysetPagination
+    cache_scope = "camping"
+    bulk_prefetch = ["tags", "user__groups", "user__user_permissions"]
+    parser_classes = [ORJSONParser, FormParser, MultiPartParser]
+
+    @property
+    def summary(self):
+        """?view=summary 목록은 review를 읽지 않고 excerpt, word_count만"""
+        return (
+            self.action == "list" and self.request.query_params.get("view") == "summary"
+        )
 
     def get_serializer_class(self):
+        if self.summary:
+            return CampingSummarySerializer
         if self.action == "list":
             return CampingOutSerializer
 
         return self.serializer_class
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
-        return super().perform_create(serializer)
+        instance = serializer.save(user=self.request.user)
+        # 응답 직렬화에서 태그 수만큼 쿼리가 나가지 않도록
+        prefetch_related_objects([instance], *self.bulk_prefetch)
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user)
+        queryset = select_user(self.queryset.filter(user=self.request.user))
+        if self.summary:
+            queryset = queryset.defer("review")
+        return queryset.prefetch_related(
+            "tags", "user__groups", "user__user_permissions"
+        )
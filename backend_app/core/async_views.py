@@ -0,0 +1,103 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+
+from core.cache import aresponse_cache_key, get_cache
+from core.metrics import observe_cache
+from core.renderers import ORJSONRenderer
+from core.timing import phase
+from user.authentication import aauthenticate
+
+
+class AsyncReadView(View):
+    """
+    viewset의 list, retrieve를 async ORM으로 처리하는 읽기 전용 view
+
+        path("async/", AsyncReadView.as_view(viewset=BlogAPIView))
+
+    queryset, serializer, pagination, cache_scope는 viewset 것을 그대로 쓰고
+    인증, DB 조회, 캐시는 await 해서 ASGI worker에서 느린 쿼리를 기다리는 동안
+    이벤트 루프를 막지 않는다. 직렬화는 prefetch가 끝난 객체만 다루므로 동기로 해도
+    DB를 건드리지 않음 (건드리면 SynchronousOnlyOperation)
+    """
+
+    viewset = None
+    renderer = ORJSONRenderer()
+    http_method_names = ["get", "head", "options"]
+
+    async def get(self, request, pk=None):
+        try:
+            with phase("auth"):
+                user = await aauthenticate(request)
+            if user is None:
+                raise exceptions.NotAuthenticated()
+            request.user = user
+
+            view = self.get_viewset(request, "list" if pk is None else "retrieve", pk)
+            cache = get_cache()
+            key = await aresponse_cache_key(view.cache_scope, request, "data")
+            data = await cache.aget(key)
+            observe_cache(view.cache_scope, data is not None)
+            if data is None:
+                data = await (
+                    self.list(view) if pk is None else self.retrieve(view, pk)
+                )
+                timeout = view.cache_timeout or settings.API_CACHE_TIMEOUT
+                await cache.aset(key, data, timeout)
+        except exceptions.APIException as e:
+            return self.error_response(e)
+        return self.render(data)
+
+    def get_viewset(self, request, action, pk=None):
+        view = self.viewset(
+            action=action,
+            args=(),
+            kwargs={} if pk is None else {"pk": pk},
+            format_kwarg=None,
+        )
+        # 파서, 인증 없이 query_params, user만 쓰는 DRF Request
+        view.request = Request(request)
+        view.request.user = request.user
+        return view
+
+    async def list(self, view):
+        paginator = view.paginator
+        plan = getattr(view, "get_compiled_serializer", lambda: None)()
+        if plan is not None:
+            # nested 값은 build가 따로 조회하므로 thread에서
+            queryset = view.compiled_queryset(plan)
+            page = await paginator.apaginate_queryset(queryset, view.request)
+            with phase("serialize"):
+                data = await sync_to_async(plan.build)(page)
+            return paginator.get_paginated_data(data)
+
+        queryset = view.filter_queryset(view.get_queryset())
+        page = await paginator.apaginate_queryset(queryset, view.request)
+        serializer = view.get_serializer(page, many=True)
+        with phase("serialize"):
+            return paginator.get_paginated_data(serializer.data)
+
+    async def retrieve(self, view, pk):
+        try:
+            obj = await view.get_queryset().aget(pk=pk)
+        except (ObjectDoesNotExist, ValidationError, ValueError):
+            raise exceptions.NotFound()
+        with phase("serialize"):
+            return view.get_serializer(obj).data
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(
+            self.renderer.render(data),
+            status=status_code,
+            content_type="application/json",
+        )
+
+    def error_response(self, exc):
+        response = self.render({"detail": exc.detail}, exc.status_code)
+        if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+            response["WWW-Authenticate"] = "Bearer"
+        return response
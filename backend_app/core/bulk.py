@@ -0,0 +1,164 @@
+from django.db import router, transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from core.cache import invalidate
+from core.search import reindex
+from core.serializers import attach_tags
+
+
+def concrete_attrs(model, attrs):
+    m2m = {field.name for field in model._meta.many_to_many}
+    return {key: value for key, value in attrs.items() if key not in m2m}
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """many=True 저장을 bulk_create 한번으로 처리"""
+
+    batch_size = 500
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        objs = [model(**concrete_attrs(model, attrs)) for attrs in validated_data]
+        # bulk_create는 save()를 부르지 않아서 excerpt, word_count를 직접 채움
+        for obj in objs:
+            if hasattr(obj, "update_summary"):
+                obj.update_summary()
+        objs = model.objects.bulk_create(objs, batch_size=self.batch_size)
+        attach_tags(objs, [attrs.get("tags") for attrs in validated_data])
+        reindex(objs, created=True)
+        return objs
+
+
+class BulkModelMixin:
+    """
+    POST, PATCH, DELETE {prefix}/bulk/ 로 여러개를 한번에 생성, 수정, 삭제
+
+    생성, 수정은 하나라도 잘못되면 아무것도 저장하지 않고 항목별 에러를 돌려줌
+    bulk_create, bulk_update는 signal이 없어서 cache_scope 무효화, 검색 색인을 직접 함
+    """
+
+    max_bulk_size = 1000
+    bulk_batch_size = 500
+    bulk_prefetch = []
+
+    def get_bulk_data(self, request):
+        data = request.data
+        if not isinstance(data, list):
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: ["list 형태로 요청해야함"]}
+            )
+        if len(data) > self.max_bulk_size:
+            raise ValidationError(
+                {
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        f"한번에 {self.max_bulk_size}개까지 가능"
+                    ]
+                }
+            )
+        return data
+
+    @action(detail=False, methods=["post", "patch", "delete"], url_path="bulk")
+    def bulk(self, request, *args, **kwargs):
+        if request.method == "POST":
+            return self.bulk_create(request)
+        if request.method == "PATCH":
+            return self.bulk_update(request)
+        return self.bulk_destroy(request)
+
+    def bulk_create(self, request):
+        data = self.get_bulk_data(request)
+        serializer = self.get_serializer(data=data, many=True)
+        if not serializer.is_valid():
+            # DRF 버전에 따라 list 또는 {index: error}라서 항목 순서대로 맞춤
+            errors = serializer.errors
+            if isinstance(errors, dict):
+                errors = [errors.get(index, {}) for index in range(len(data))]
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: errors})
+        model = self.get_queryset().model
+        # shard를 쓰면 default가 아니라 글이 저장될 DB의 transaction이어야함
+        with transaction.atomic(using=router.db_for_write(model)):
+            objs = serializer.save(user=request.user)
+        invalidate([self.cache_scope], request.user.pk)
+
+        prefetch_related_objects(objs, *self.bulk_prefetch)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, request):
+        data = self.get_bulk_data(request)
+        instances = self.get_queryset().in_bulk(
+            [
+                item["id"]
+                for item in data
+                if isinstance(item, dict) and isinstance(item.get("id"), int)
+            ]
+        )
+
+        model = self.get_queryset().model
+        updated, errors, fields = [], [], {"updated_at"}
+        for item in data:
+            instance = instances.get(item.get("id")) if isinstance(item, dict) else None
+            if instance is None:
+                errors.append({"id": ["존재하지 않는 id"]})
+                continue
+            serializer = self.get_serializer(instance, data=item, partial=True)
+            errors.append({} if serializer.is_valid() else serializer.errors)
+            updated.append(serializer)
+        if any(errors):
+            # many=True 검증 에러와 같은 형태
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: errors})
+
+        now = timezone.now()
+        objs = []
+        for serializer in updated:
+            for key, value in concrete_attrs(model, serializer.validated_data).items():
+                setattr(serializer.instance, key, value)
+                fields.add(key)
+            serializer.instance.updated_at = now
+            objs.append(serializer.instance)
+
+        summary_field = getattr(model, "summary_field", None)
+        if summary_field in fields:
+            for obj in objs:
+                obj.update_summary()
+            fields |= {"excerpt", "word_count"}
+
+        with transaction.atomic(using=router.db_for_write(model)):
+            model.objects.bulk_update(objs, fields, batch_size=self.bulk_batch_size)
+            attach_tags(
+                objs,
+                [serializer.validated_data.get("tags") for serializer in updated],
+                replace=True,
+            )
+            reindex(objs)
+        invalidate([self.cache_scope], request.user.pk)
+
+        prefetch_related_objects(objs, *self.bulk_prefetch)
+        return Response([serializer.data for serializer in updated])
+
+    def bulk_destroy(self, request):
+        ids = serializers.ListField(child=serializers.IntegerField()).run_validation(
+            self.get_bulk_data(request)
+        )
+        queryset = self.get_queryset().filter(id__in=ids)
+        with transaction.atomic(using=router.db_for_write(queryset.model)):
+            found = set(queryset.values_list("id", flat=True))
+            queryset.delete()
+
+        results = [
+            {
+                "id": id,
+                "status": (
+                    status.HTTP_204_NO_CONTENT
+                    if id in found
+                    else status.HTTP_404_NOT_FOUND
+                ),
+            }
+            for id in ids
+        ]
+        return Response(results)
@@ -0,0 +1,234 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.metrics import observe_cache
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def version_key(scope, user_id):
+    return f"{scope}:{user_id}:version"
+
+
+def get_version(scope, user_id):
+    # 버전 키가 LRU로 밀려나도 예전 엔트리를 다시 쓰지 않도록 시간값으로 시작
+    cache = get_cache()
+    key = version_key(scope, user_id)
+    version = cache.get(key)
+    if version is None:
+        # add가 실패하면 다른 요청이 먼저 넣은 값을 씀
+        version = time.time_ns()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+async def aget_version(scope, user_id):
+    cache = get_cache()
+    key = version_key(scope, user_id)
+    version = await cache.aget(key)
+    if version is None:
+        version = time.time_ns()
+        if not await cache.aadd(key, version, None):
+            version = await cache.aget(key, version)
+    return version
+
+
+def invalidate(scopes, user_id):
+    """user의 scope 캐시를 통째로 무효화 (버전만 올리고 엔트리는 TTL로 사라짐)"""
+
+    def bump():
+        get_cache().set_many(
+            {version_key(scope, user_id): time.time_ns() for scope in scopes}, None
+        )
+
+    # commit 전에 다른 요청이 옛날 데이터를 새 버전으로 캐시하는 걸 막기 위해
+    # commit 후에도 한번 더 올림
+    bump()
+    transaction.on_commit(bump)
+
+
+def invalidate_on_change(model, scopes, user_attr="user_id", m2m=True):
+    """
+    model이 저장/삭제되거나 M2M이 바뀌면 소유자의 scopes 캐시 무효화
+
+    M2M 반대편(tag.blog.add(...))도 같은 user 소유라서 instance의 user_attr를 그대로 씀
+    queryset.update(), bulk_create()는 signal이 없으므로 직접 invalidate()를 불러야함
+    """
+
+    def handler(sender, instance, **kwargs):
+        if kwargs.get("action", "post_").startswith("post_"):
+            invalidate(scopes, getattr(instance, user_attr))
+
+    post_save.connect(handler, sender=model, weak=False)
+    post_delete.connect(handler, sender=model, weak=False)
+    if m2m:
+        for field in model._meta.many_to_many:
+            m2m_changed.connect(handler, sender=field.remote_field.through, weak=False)
+
+
+def request_url_hash(request):
+    # 페이지 next, previous 링크가 절대 URL이라 scheme, host도 같아야 같은 응답
+    return hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+
+
+def response_cache_key(scope, request, suffix):
+    path = request_url_hash(request)
+    version = get_version(scope, request.user.pk)
+    return f"{scope}:{request.user.pk}:{version}:{path}:{suffix}"
+
+
+async def aresponse_cache_key(scope, request, suffix):
+    path = request_url_hash(request)
+    version = await aget_version(scope, request.user.pk)
+    return f"{scope}:{request.user.pk}:{version}:{path}:{suffix}"
+
+
+class CachedResponseMixin:
+    """list, retrieve 응답을 user, URL 별로 캐시"""
+
+    cache_scope = None
+    cache_timeout = None
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, func, request, *args, **kwargs):
+        if getattr(self, "profiler", None) is not None:
+            # 캐시된 응답을 프로파일해봐야 의미가 없음 (core/profiling.py)
+            return func(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = response_cache_key(self.cache_scope, request, "data")
+
+        data = cache.get(key)
+        observe_cache(self.cache_scope, data is not None)
+        if data is not None:
+            return Response(data)
+
+        response = func(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            timeout = self.cache_timeout or settings.API_CACHE_TIMEOUT
+            cache.set(key, response.data, timeout)
+        return response
+
+
+class ConditionalResponseMixin:
+    """
+    list, retrieve에 ETag, Last-Modified를 붙이고 If-None-Match, If-Modified-Since가
+    맞으면 직렬화 없이 304
+
+    list는 MAX(updated_at), COUNT, detail은 그 row의 updated_at만 조회하고 결과는
+    응답 캐시와 같은 버전 키로 캐시한다. 태그 이름 변경, M2M 변경은 updated_at이
+    안 바뀌기 때문에 cache_scope 버전을 ETag, Last-Modified에 같이 섞음
+
+    같은 URL이라도 renderer(Accept), 고른 필드(core.sparse)가 다르면 다른 표현이라
+    ETag도 다르게 만들고 Vary: Accept를 붙임
+    """
+
+    cache_scope = None
+    cache_timeout = None
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.probe_list, super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.probe_detail, super().retrieve, request, *args, **kwargs
+        )
+
+    def probe_list(self):
+        probe = (
+            self.filter_queryset(self.get_queryset())
+            .order_by()
+            .aggregate(last=Max("updated_at"), count=Count("pk"))
+        )
+        return probe["last"], probe["count"]
+
+    def probe_detail(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        updated_at = (
+            self.get_queryset()
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is None:
+            return None
+        return updated_at, None
+
+    def get_validators(self, request, probe):
+        cache = get_cache()
+        key = response_cache_key(
+            self.cache_scope, request, f"validators:{request.accepted_media_type}"
+        )
+
+        validators = cache.get(key)
+        if validators is None:
+            result = probe()
+            if result is None:
+                return None
+            validators = self.make_validators(request, *result)
+            timeout = self.cache_timeout or settings.API_CACHE_TIMEOUT
+            cache.set(key, validators, timeout)
+        return validators
+
+    def make_validators(self, request, updated_at, count):
+        version = get_version(self.cache_scope, request.user.pk)
+        last_modified = version / 1e9
+        if updated_at is not None:
+            if timezone.is_naive(updated_at):
+                updated_at = timezone.make_aware(updated_at)
+            last_modified = max(last_modified, updated_at.timestamp())
+
+        representation = (
+            request.accepted_media_type,
+            getattr(self, "sparse_fields", None),
+        )
+        raw = (
+            f"{request.user.pk}:{request.build_absolute_uri()}:{representation}:"
+            f"{updated_at}:{count}:{version}"
+        )
+        etag = 'W/"%s"' % hashlib.md5(raw.encode()).hexdigest()
+        return etag, math.ceil(last_modified)
+
+    def conditional_response(self, probe, func, request, *args, **kwargs):
+        validators = self.get_validators(request, probe)
+        if validators is None:
+            return func(request, *args, **kwargs)
+
+        etag, last_modified = validators
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = func(request, *args, **kwargs)
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ["Accept", "Authorization"])
+        return response
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, register
+
+from core.cache import get_cache
+
+
+def is_process_local(cache):
+    """process마다 따로인 캐시. 여기 쓴 값(버전, deny-list 등)은 다른 process에 안 보임"""
+    return isinstance(cache, LocMemCache)
+
+
+@register()
+def check_shared_api_cache(app_configs, **kwargs):
+    """
+    토큰 폐기(user.authentication), 응답 캐시 무효화, user shard는 API 캐시의 버전으로
+    process끼리 알림. worker가 여러개인데 캐시가 process마다 따로면 다른 worker에서는
+    폐기한 토큰이 그대로 통과하므로 띄우지 않음 (run.sh가 manage.py check를 먼저 돌림)
+    """
+    if settings.WEB_CONCURRENCY > 1 and is_process_local(get_cache()):
+        return [
+            Error(
+                f"WEB_CONCURRENCY={settings.WEB_CONCURRENCY}인데 API 캐시가 "
+                "process마다 따로인 LocMemCache임",
+                hint="API_CACHE_BACKEND를 memcached, redis 같은 공유 캐시로 바꾸거나 "
+                "WEB_CONCURRENCY=1로",
+                id="core.E001",
+            )
+        ]
+    return []
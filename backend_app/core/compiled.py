@@ -0,0 +1,263 @@
+"""
+읽기 전용 출력 serializer를 한번 분석해서 평평한 plan으로 만든 빠른 직렬화
+
+    plan = compile_serializer(BlogOutSerializer)
+    rows = plan.values(queryset)[:20]
+    data = plan.build(rows)
+
+model instance, DRF field 객체를 거치지 않고 values()로 필요한 컬럼만 dict로 읽고
+태그(M2M nested), user(FK nested), groups(M2M pk 목록)는 따로 읽어서 id로 붙인다.
+결과는 serializer(queryset, many=True).data와 같음
+
+plan으로 옮길 수 없는 field(SerializerMethodField, source="a.b" 등)가 있으면
+compile_serializer가 None을 돌려주고 기존 serializer를 씀
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from core.pagination import ordering_columns
+from core.timing import phase
+
+# DB에서 읽은 값이 to_representation 결과와 같은 field (str, int, bool)
+IDENTITY_FIELDS = {
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.SlugField,
+    serializers.URLField,
+    serializers.IntegerField,
+    serializers.BigIntegerField,
+}
+
+_plans = {}
+
+
+class NotCompilable(Exception):
+    pass
+
+
+def compile_serializer(serializer_class, fields=None):
+    """
+    serializer class (와 고른 필드) 마다 한번만 만들어서 재사용. 만들 수 없으면 None
+
+    fields는 core.sparse로 고른 최상위 필드 이름 tuple
+    """
+    key = (serializer_class, fields)
+    if key not in _plans:
+        try:
+            _plans[key] = CompiledSerializer(serializer_class(), fields)
+        except NotCompilable:
+            _plans[key] = None
+    return _plans[key]
+
+
+def identity(value):
+    return value
+
+
+def converter(field):
+    if type(field) in IDENTITY_FIELDS:
+        return identity
+
+    def convert(value):
+        return None if value is None else field.to_representation(value)
+
+    return convert
+
+
+class CompiledSerializer:
+    """
+    serializer 하나의 plan
+
+    columns: values()로 읽을 컬럼. FK nested는 JOIN해서 "user__email"처럼 같이 읽음
+    (sharding 중이면 user가 default에만 있어서 user_id로 따로 읽음)
+    """
+
+    def __init__(self, serializer, fields=None):
+        self.model = serializer.Meta.model
+        self.pk = self.model._meta.pk.attname
+        self.columns = [self.pk]
+        # (key, kind, ...) serializer field 순서대로
+        self.fields = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            if "." in field.source or field.source == "*":
+                raise NotCompilable(name)
+            try:
+                model_field = self.model._meta.get_field(field.source)
+            except Exception:
+                raise NotCompilable(name)
+            self.fields.append((name, *self.compile_field(field, model_field)))
+
+    def compile_field(self, field, model_field):
+        if isinstance(field, serializers.ListSerializer) and model_field.many_to_many:
+            child = CompiledSerializer(field.child)
+            return "nested_many", model_field, child
+        if isinstance(field, serializers.BaseSerializer) and model_field.many_to_one:
+            child = CompiledSerializer(field)
+            self.add_column(model_field.attname)
+            return "nested", model_field, child
+        if (
+            isinstance(field, serializers.ManyRelatedField)
+            and type(field.child_relation) is serializers.PrimaryKeyRelatedField
+            and field.child_relation.pk_field is None
+            and model_field.many_to_many
+        ):
+            return "pks", model_field
+        if (
+            type(field) is serializers.PrimaryKeyRelatedField
+            and field.pk_field is None
+            and model_field.many_to_one
+        ):
+            self.add_column(model_field.attname)
+            return "column", model_field.attname, identity
+        if model_field.is_relation or not model_field.concrete:
+            raise NotCompilable(field.field_name)
+        self.add_column(model_field.attname)
+        return "column", model_field.attname, converter(field)
+
+    def add_column(self, column):
+        if column not in self.columns:
+            self.columns.append(column)
+
+    def query_columns(self, join=None):
+        """FK nested를 JOIN할지에 따라 values()에 넘길 컬럼"""
+        if join is None:
+            join = not settings.SHARD_DATABASES
+        columns = list(self.columns)
+        if join:
+            for _, kind, model_field, *rest in self.fields:
+                if kind == "nested":
+                    columns += [
+                        f"{model_field.name}__{column}"
+                        for column in rest[0].query_columns(join)
+                    ]
+        return columns
+
+    def values(self, queryset, *extra):
+        """queryset을 plan이 읽을 컬럼만 가진 values() queryset으로"""
+        columns = self.query_columns()
+        columns += [column for column in extra if column not in columns]
+        return queryset.prefetch_related(None).values(*columns)
+
+    def build(self, rows, join=None):
+        """values() row 목록을 serializer 출력과 같은 dict 목록으로"""
+        if join is None:
+            join = not settings.SHARD_DATABASES
+        rows = list(rows)
+        if not rows:
+            return []
+
+        related = {}
+        for key, kind, model_field, *rest in self.fields:
+            if kind == "nested_many":
+                related[key] = self.fetch_many(rows, model_field, rest[0], join)
+            elif kind == "nested":
+                related[key] = self.fetch_one(rows, model_field, rest[0], join)
+            elif kind == "pks":
+                related[key] = self.fetch_pks(rows, model_field)
+
+        data = []
+        for row in rows:
+            item = {}
+            for key, kind, *rest in self.fields:
+                if kind == "column":
+                    value = row[rest[0]]
+                    item[key] = rest[1](value)
+                elif kind == "nested":
+                    item[key] = related[key].get(row[rest[0].attname])
+                else:
+                    item[key] = related[key].get(row[self.pk], [])
+            data.append(item)
+        return data
+
+    def fetch_many(self, rows, model_field, child, join):
+        """blog.tags 처럼 nested M2M. through를 JOIN해서 한번에 읽음"""
+        query_name = model_field.related_query_name()
+        queryset = child.model._default_manager.filter(
+            **{f"{query_name}__in": [row[self.pk] for row in rows]}
+        )
+        child_rows = list(child.values(queryset, query_name))
+        built = child.build(child_rows, join)
+
+        result = defaultdict(list)
+        for child_row, item in zip(child_rows, built):
+            result[child_row[query_name]].append(item)
+        return result
+
+    def fetch_one(self, rows, model_field, child, join):
+        """tag.user 처럼 nested FK. 같은 user는 한번만 만듦"""
+        attname = model_field.attname
+        if join:
+            prefix = f"{model_field.name}__"
+            child_rows = {}
+            for row in rows:
+                if row[attname] is not None and row[attname] not in child_rows:
+                    child_rows[row[attname]] = {
+                        column[len(prefix) :]: value
+                        for column, value in row.items()
+                        if column.startswith(prefix)
+                    }
+            child_rows = list(child_rows.values())
+        else:
+            ids = {row[attname] for row in rows if row[attname] is not None}
+            queryset = child.model._default_manager.filter(pk__in=ids)
+            child_rows = list(child.values(queryset)) if ids else []
+        built = child.build(child_rows, join)
+        return {row[child.pk]: item for row, item in zip(child_rows, built)}
+
+    def fetch_pks(self, rows, model_field):
+        """user.groups 처럼 pk 목록만 내보내는 M2M. through 테이블만 읽음"""
+        through = model_field.remote_field.through
+        source = f"{model_field.m2m_field_name()}_id"
+        target = f"{model_field.m2m_reverse_field_name()}_id"
+        links = through._default_manager.filter(
+            **{f"{source}__in": [row[self.pk] for row in rows]}
+        ).values_list(source, target)
+
+        result = defaultdict(list)
+        for source_id, target_id in links:
+            result[source_id].append(target_id)
+        return result
+
+
+class CompiledListMixin:
+    """
+    list를 compile된 serializer로 직렬화. 출력은 같고 instance, field 객체를
+    만들지 않음
+
+    ConditionalResponseMixin, CachedResponseMixin 보다 뒤, ListAPIView 보다 앞에 둠
+    """
+
+    compiled_list = True
+
+    def get_compiled_serializer(self):
+        if not self.compiled_list:
+            return None
+        return compile_serializer(
+            self.get_serializer_class(), getattr(self, "sparse_fields", None)
+        )
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_compiled_serializer()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.compiled_queryset(plan)
+        page = self.paginate_queryset(queryset)
+        with phase("serialize"):
+            data = plan.build(queryset if page is None else page)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def compiled_queryset(self, plan):
+        # 페이지 커서에 쓸 ordering 컬럼도 같이 읽음
+        queryset = self.filter_queryset(self.get_queryset())
+        return plan.values(queryset, *ordering_columns(self.paginator))
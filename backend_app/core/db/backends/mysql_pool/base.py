@@ -0,0 +1,101 @@
+"""
+연결을 프로세스 단위 pool에서 꺼내 쓰는 MySQL backend
+
+    DATABASES = {"default": {"ENGINE": "core.db.backends.mysql_pool", "POOL": {...}}}
+
+CONN_MAX_AGE=0 그대로 두면 요청이 끝날 때 close()가 연결을 닫는 대신 pool에 반납하고
+다음 요청은 TCP 연결, 인증, 세션 설정 없이 바로 쓴다. ASGI에서는 요청마다 thread가
+달라서 thread 별로 연결을 들고 있는 CONN_MAX_AGE로는 재사용이 안됨
+"""
+
+import os
+from functools import partial
+
+from django.db.backends.mysql import base as mysql
+
+from core.db.pool import ConnectionPool, PoolExhausted, pools, pools_lock
+
+Database = mysql.Database
+
+POOL_DEFAULTS = {
+    "MAX_SIZE": 10,
+    "MAX_LIFETIME": 1800,
+    "TIMEOUT": 10,
+    "CHECK_AFTER": 1,
+}
+
+
+def connect(conn_params):
+    # mysql.DatabaseWrapper.get_new_connection과 같음
+    connection = Database.connect(**conn_params)
+    if connection.encoders.get(bytes) is bytes:
+        connection.encoders.pop(bytes)
+    return connection
+
+
+def get_pool(wrapper, conn_params):
+    # 테스트 DB처럼 같은 alias로 다른 DB에 붙는 경우, fork된 worker를 구분
+    settings = wrapper.settings_dict
+    key = (
+        os.getpid(),
+        wrapper.alias,
+        settings["NAME"],
+        settings["HOST"],
+        settings["PORT"],
+        settings["USER"],
+    )
+    with pools_lock:
+        if key not in pools:
+            options = {**POOL_DEFAULTS, **settings.get("POOL", {})}
+            pools[key] = ConnectionPool(
+                connect=partial(connect, conn_params),
+                check=lambda connection: connection.ping(False),
+                max_size=options["MAX_SIZE"],
+                max_lifetime=options["MAX_LIFETIME"],
+                timeout=options["TIMEOUT"],
+                check_after=options["CHECK_AFTER"],
+            )
+        return pools[key]
+
+
+class DatabaseWrapper(mysql.DatabaseWrapper):
+    pooled = None
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(self, conn_params)
+        try:
+            self.pooled = self.pool.acquire()
+        except PoolExhausted as e:
+            raise Database.OperationalError(str(e))
+        return self.pooled.connection
+
+    def init_connection_state(self):
+        # 재사용한 연결은 세션 설정이 이미 되어있음
+        if self.pooled is not None and self.pooled.initialized:
+            return
+        super().init_connection_state()
+        if self.pooled is not None:
+            self.pooled.initialized = True
+
+    def _set_autocommit(self, autocommit):
+        # 이미 같은 값이면 SET autocommit 왕복을 생략
+        if self.connection.get_autocommit() == autocommit:
+            return
+        super()._set_autocommit(autocommit)
+
+    def _close(self):
+        pooled, self.pooled = self.pooled, None
+        if pooled is None:
+            return super()._close()
+
+        # atomic 안에서 닫히면 Django가 self.connection을 계속 들고 있으므로 돌려주지 않음
+        discard = self.in_atomic_block
+        if not discard:
+            try:
+                if not self.connection.get_autocommit():
+                    self.connection.rollback()
+            except Database.Error:
+                discard = True
+        if self.errors_occurred:
+            self.pool.mark_suspect(pooled)
+        self.pool.release(pooled, discard=discard)
@@ -0,0 +1,51 @@
+"""
+migration operation helper
+"""
+
+
+class KeepIndexNamesMixin:
+    """
+    SQLite는 AlterField, AddField 등에서 테이블을 다시 만들면서 인덱스 이름을 새로
+    짓는다. 0004 롤백은 Flat* 때 지은 이름을 기대하므로 원래 이름으로 되돌림
+
+        class AlterUserForeignKey(KeepIndexNamesMixin, migrations.AlterField): ...
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        names = self.index_names(schema_editor, model)
+        super().database_forwards(app_label, schema_editor, from_state, to_state)
+        self.rename_indexes(schema_editor, model, names)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        names = self.index_names(schema_editor, model)
+        super().database_backwards(app_label, schema_editor, from_state, to_state)
+        self.rename_indexes(schema_editor, model, names)
+
+    def index_names(self, schema_editor, model):
+        """{columns: 이름} (unique 아닌 인덱스만)"""
+        if schema_editor.connection.vendor != "sqlite":
+            return {}
+        with schema_editor.connection.cursor() as cursor:
+            constraints = schema_editor.connection.introspection.get_constraints(
+                cursor, model._meta.db_table
+            )
+        return {
+            tuple(info["columns"]): name
+            for name, info in constraints.items()
+            if info["index"] and not info["unique"]
+        }
+
+    def rename_indexes(self, schema_editor, model, names):
+        table = model._meta.db_table
+        for columns, name in self.index_names(schema_editor, model).items():
+            old_name = names.get(columns)
+            if old_name is None or old_name == name:
+                continue
+            schema_editor.execute(f"DROP INDEX {schema_editor.quote_name(name)}")
+            schema_editor.execute(
+                f"CREATE INDEX {schema_editor.quote_name(old_name)} "
+                f"ON {schema_editor.quote_name(table)} "
+                f"({', '.join(map(schema_editor.quote_name, columns))})"
+            )
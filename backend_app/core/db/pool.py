@@ -0,0 +1,189 @@
+"""
+프로세스 안에서 DB 연결을 돌려쓰는 pool
+
+DB 드라이버와 상관없이 connect, check, close 함수만 받아서 동작하고
+Django backend(core.db.backends.mysql_pool)가 이걸 감싸서 쓴다.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+
+logger = logging.getLogger(__name__)
+
+
+# backend가 만든 pool. key는 (pid, alias, ...) (core.db.backends.mysql_pool)
+pools = {}
+pools_lock = threading.Lock()
+
+
+class PoolExhausted(Exception):
+    pass
+
+
+def pool_stats():
+    """이 프로세스의 {alias: pool 통계}. /metrics/ 가 요청마다 기록함 (core.metrics)"""
+    pid = os.getpid()
+    with pools_lock:
+        current = [(key[1], pool) for key, pool in pools.items() if key[0] == pid]
+    stats = {}
+    for alias, pool in current:
+        for name, value in pool.stats().items():
+            stats.setdefault(alias, {}).setdefault(name, 0)
+            stats[alias][name] += value
+    return stats
+
+
+class PooledConnection:
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.checked_at = self.created_at
+        # Django의 세션 설정(init_connection_state)을 이미 했는지
+        self.initialized = False
+
+
+class ConnectionPool:
+    """
+    최대 max_size개까지 연결을 열고 다 쓰고 있으면 timeout초 동안 반납을 기다림
+
+    - 가장 최근에 반납된 연결부터 재사용 (오래 놀던 연결은 자연스럽게 만료됨)
+    - max_lifetime초가 지난 연결은 꺼낼 때, 반납할 때 닫고 새로 만듦
+    - check_after초 이상 놀던 연결은 꺼낼 때 check()로 살아있는지 확인
+    """
+
+    def __init__(
+        self,
+        connect,
+        check=None,
+        close=None,
+        max_size=10,
+        max_lifetime=1800,
+        timeout=10,
+        check_after=1,
+    ):
+        self.connect = connect
+        self.check = check
+        self.close = close or (lambda connection: connection.close())
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.check_after = check_after
+
+        self._idle = deque()
+        self._size = 0
+        self._cond = threading.Condition()
+        self._counters = Counter()
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            entry = self._checkout(deadline)
+            if entry is None:
+                return self._create()
+            if self._healthy(entry):
+                self._count("reused")
+                return entry
+            self._count("failed_checks")
+            self._discard(entry)
+
+    def release(self, entry, discard=False):
+        if discard or self._expired(entry):
+            self._count("discarded" if discard else "recycled")
+            self._discard(entry)
+            return
+        with self._cond:
+            entry.checked_at = time.monotonic()
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def mark_suspect(self, entry):
+        """다음에 꺼낼 때 놀던 시간과 상관없이 check()를 하도록"""
+        entry.checked_at = 0
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": self.max_size,
+                **self._counters,
+            }
+
+    def _checkout(self, deadline):
+        """놀고 있는 연결 하나, 새로 만들 자리가 있으면 None"""
+        expired = []
+        try:
+            with self._cond:
+                waited = False
+                while True:
+                    while self._idle:
+                        entry = self._idle.pop()
+                        if not self._expired(entry):
+                            return entry
+                        self._size -= 1
+                        self._counters["recycled"] += 1
+                        expired.append(entry)
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return None
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters["timeouts"] += 1
+                        raise PoolExhausted(
+                            f"{self.timeout}초 동안 사용 가능한 DB 연결이 없음 "
+                            f"(max_size={self.max_size})"
+                        )
+                    if not waited:
+                        self._counters["waits"] += 1
+                        waited = True
+                    self._cond.wait(remaining)
+        finally:
+            for entry in expired:
+                self._close_quietly(entry)
+
+    def _create(self):
+        try:
+            entry = PooledConnection(self.connect())
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        self._count("created")
+        return entry
+
+    def _healthy(self, entry):
+        if self.check is None:
+            return True
+        if time.monotonic() - entry.checked_at < self.check_after:
+            return True
+        try:
+            self.check(entry.connection)
+        except Exception:
+            logger.warning("DB 연결 health check 실패, 새로 연결함", exc_info=True)
+            return False
+        return True
+
+    def _expired(self, entry):
+        return time.monotonic() - entry.created_at >= self.max_lifetime
+
+    def _discard(self, entry):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+        self._close_quietly(entry)
+
+    def _close_quietly(self, entry):
+        try:
+            self.close(entry.connection)
+        except Exception:
+            pass
+
+    def _count(self, name):
+        with self._cond:
+            self._counters[name] += 1
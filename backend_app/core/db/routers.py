@@ -0,0 +1,278 @@
+"""
+DB router
+
+    DATABASE_ROUTERS = ["core.db.routers.ShardRouter", "core.db.routers.ReplicaRouter"]
+"""
+
+import random
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from core.cache import get_cache
+
+# 요청 하나 동안의 라우팅 상태. core.middleware.ReplicaRoutingMiddleware가 넣어줌
+_routing = ContextVar("replica_routing", default=None)
+
+# 요청 밖(command 등)에서 sharded model을 다룰 user id. use_shard()로 지정
+_shard_user = ContextVar("shard_user", default=None)
+
+# user 소유 데이터 (label_lower). M2M through 테이블 포함
+# replica에서 읽어도 되고, user_id로 shard를 나눔
+REPLICA_MODELS = SHARDED_MODELS = {
+    "core.blog",
+    "core.blog_tags",
+    "core.blogtag",
+    "core.blogterm",
+    "core.camping",
+    "core.camping_tags",
+    "core.campingtag",
+    "core.campingterm",
+}
+
+
+def pin_key(user_id):
+    return f"replica-pin:{user_id}"
+
+
+def shard_key(user_id):
+    return f"shard:{user_id}"
+
+
+def lock_key(user_id):
+    return f"shard-lock:{user_id}"
+
+
+class ShardLocked(APIException):
+    """user를 다른 shard로 옮기는 중이라 그 user의 글, 태그를 쓸 수 없음"""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "데이터를 옮기는 중입니다. 잠시 후 다시 시도해주세요."
+    default_code = "shard_locked"
+
+
+class RoutingState:
+    """
+    safe method 요청이고 아직 쓰기가 없고 최근에 쓴 적 없는 user면 replica에서 읽음
+
+    replica는 요청마다 하나만 골라서 한 요청 안의 조회(페이지, prefetch)는 같은 시점을 봄
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.safe = request.method in ("GET", "HEAD", "OPTIONS")
+        self.wrote = False
+        self.replica = None
+        self.shards = {}
+        self._pinned = None
+
+    def user_id(self):
+        # user는 DRF 인증이 끝나야 알 수 있어서 필요할 때 확인
+        user = getattr(self.request, "user", None)
+        if user is None or not user.is_authenticated:
+            return None
+        return user.pk
+
+    def pinned(self):
+        if self._pinned is None:
+            user_id = self.user_id()
+            if user_id is None:
+                return False
+            self._pinned = bool(get_cache().get(pin_key(user_id)))
+        return self._pinned
+
+    def read_db(self):
+        if not settings.REPLICA_DATABASES or not self.safe or self.wrote:
+            return DEFAULT_DB_ALIAS
+        if self.pinned():
+            return DEFAULT_DB_ALIAS
+        if self.replica is None:
+            self.replica = random.choice(settings.REPLICA_DATABASES)
+        return self.replica
+
+
+def start_routing(request):
+    return _routing.set(RoutingState(request))
+
+
+def stop_routing(token):
+    state = _routing.get()
+    _routing.reset(token)
+    return state
+
+
+def pin_to_primary(user_id):
+    """user가 방금 쓴 데이터를 replica 지연 없이 보도록 잠시 primary에서 읽게 함"""
+    get_cache().set(pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+@contextmanager
+def use_shard(user):
+    """요청 밖에서 user의 글, 태그를 다룰 때 그 user의 shard로 보내도록"""
+    token = _shard_user.set(getattr(user, "pk", user))
+    try:
+        yield
+    finally:
+        _shard_user.reset(token)
+
+
+def current_user_id():
+    user_id = _shard_user.get()
+    if user_id is None:
+        state = _routing.get()
+        if state is not None:
+            user_id = state.user_id()
+    return user_id
+
+
+def home_shard(user_id):
+    """user_id hash로 정한 shard. 가입할 때 User.shard로 저장됨"""
+    shards = settings.SHARD_DATABASES
+    return shards[zlib.crc32(str(user_id).encode()) % len(shards)]
+
+
+def shard_for(user_id):
+    """
+    user의 글이 있는 DB. User.shard가 비어있으면 sharding 전에 가입한 user라 default
+
+    global DB 조회를 줄이려고 요청 안에서는 state에, 요청 사이에는 API 캐시에 들고 있음
+    """
+    state = _routing.get()
+    if state is not None and user_id in state.shards:
+        return state.shards[user_id]
+
+    cache = get_cache()
+    alias = cache.get(shard_key(user_id))
+    if alias is None:
+        alias = (
+            get_user_model()
+            .objects.using(DEFAULT_DB_ALIAS)
+            .filter(pk=user_id)
+            .values_list("shard", flat=True)
+            .first()
+        ) or DEFAULT_DB_ALIAS
+        cache.set(shard_key(user_id), alias, settings.SHARD_CACHE_TIMEOUT)
+    if state is not None:
+        state.shards[user_id] = alias
+    return alias
+
+
+def lock_shard(user_id, timeout):
+    """
+    user의 sharded model 쓰기를 막음 (ShardLocked). core.db.sharding.move_user가
+    옮기는 동안 걸고, 오래 걸리면 timeout 전에 다시 부름
+    """
+    get_cache().set(lock_key(user_id), True, timeout)
+
+
+def unlock_shard(user_id):
+    get_cache().delete(lock_key(user_id))
+
+
+def check_unlocked(user_id):
+    # 요청 안에서도 쓸 때마다 확인 (옮기기 시작한 뒤의 쓰기를 막아야해서)
+    if get_cache().get(lock_key(user_id)):
+        raise ShardLocked()
+
+
+class ShardRouter:
+    """
+    SHARD_DATABASES가 있으면 SHARDED_MODELS를 소유 user의 shard로, 나머지는 다음 router로
+
+    user는 queryset이면 요청 user(또는 use_shard), instance면 instance의 DB나 user_id로
+    정함. user를 모르면(요청 밖에서 use_shard 없이) default
+
+    옮기는 중인 user(lock_shard)의 쓰기는 ShardLocked (503)
+    """
+
+    def db_for_read(self, model, **hints):
+        route = self.route(model, hints)
+        if route is None:
+            return None
+        user_id, alias = route
+        return alias or shard_for(user_id)
+
+    def db_for_write(self, model, **hints):
+        route = self.route(model, hints)
+        if route is None:
+            return None
+        user_id, alias = route
+        if user_id is not None:
+            check_unlocked(user_id)
+        return alias or shard_for(user_id)
+
+    def route(self, model, hints):
+        """(user id, 이미 정해진 DB) 둘 중 아는 것. sharding 대상이 아니면 None"""
+        if not settings.SHARD_DATABASES:
+            return None
+        if model._meta.label_lower not in SHARDED_MODELS:
+            return None
+
+        user_id = None
+        instance = hints.get("instance")
+        if isinstance(instance, get_user_model()):
+            # user.blog.all()
+            user_id = instance.pk
+        elif instance is not None and instance._meta.label_lower in SHARDED_MODELS:
+            # blog.tags.all(), blog.save() 처럼 이미 shard가 정해진 instance
+            user_id = getattr(instance, "user_id", None)
+            if instance._state.db is not None:
+                return user_id, instance._state.db
+        if user_id is None:
+            user_id = current_user_id()
+        if user_id is None:
+            return None
+        return user_id, None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # user(default)와 그 user의 글(shard)은 DB가 달라도 FK로 이어짐
+        databases = {DEFAULT_DB_ALIAS, *settings.SHARD_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # shard도 스키마는 default와 같게 만들고 데이터 migration(RunPython)은
+        # default에서만. 새 shard는 비어있고 historical model은 router를 타서
+        # shard에서 돌려도 default를 건드림
+        if db != DEFAULT_DB_ALIAS and model_name is None and not hints:
+            return False
+        return None
+
+
+class ReplicaRouter:
+    """
+    요청 중 REPLICA_MODELS 읽기는 replica로, 나머지와 모든 쓰기는 default로
+
+    요청 밖(manage.py, shell 등)의 읽기는 항상 default. replica는 default를 복제하므로
+    migrate는 default에만 함
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or model._meta.label_lower not in REPLICA_MODELS:
+            return DEFAULT_DB_ALIAS
+        return state.read_db()
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
@@ -0,0 +1,144 @@
+"""
+user 단위로 shard를 옮기거나 지우는 작업과 shard를 고려한 queryset helper
+
+어느 DB로 보낼지는 core.db.routers.ShardRouter가 정함
+"""
+
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from core.cache import get_cache, invalidate
+from core.db.routers import lock_shard, shard_for, shard_key, unlock_shard
+
+# 옮긴 뒤 무효화할 응답 캐시 scope
+CACHE_SCOPES = ["blog", "blogtag", "camping"]
+
+
+def families():
+    """(글, 태그, 검색 term) model. 태그, term은 글과 같은 shard에 있어야함"""
+    from core.models import Blog, BlogTag, BlogTerm, Camping, CampingTag, CampingTerm
+
+    return [(Blog, BlogTag, BlogTerm), (Camping, CampingTag, CampingTerm)]
+
+
+def select_user(queryset):
+    """
+    글과 같이 user를 읽음. sharding 중이면 user는 default에만 있어서 JOIN 대신
+    prefetch로 따로 읽음
+    """
+    if settings.SHARD_DATABASES:
+        return queryset.prefetch_related("user")
+    return queryset.select_related("user")
+
+
+def copy_rows(model, objs, using, batch_size):
+    """objs를 같은 pk로 using DB에 넣음. shard끼리 id가 겹치지 않아서 그대로 씀"""
+    for obj in objs:
+        obj._state.adding = True
+    model.objects.using(using).bulk_create(objs, batch_size=batch_size)
+
+
+def copy_family(
+    user_id,
+    source,
+    target,
+    post_model,
+    tag_model,
+    term_model,
+    batch_size,
+    on_batch=None,
+):
+    counts = Counter()
+    tags = list(tag_model.objects.using(source).filter(user_id=user_id).order_by("pk"))
+    copy_rows(tag_model, tags, target, batch_size)
+    counts[tag_model._meta.label] = len(tags)
+
+    field = post_model._meta.get_field("tags")
+    through = field.remote_field.through
+    post_attr = f"{field.m2m_field_name()}_id"
+
+    last_pk = 0
+    while True:
+        posts = list(
+            post_model.objects.using(source)
+            .filter(user_id=user_id, pk__gt=last_pk)
+            .order_by("pk")[:batch_size]
+        )
+        if not posts:
+            break
+        last_pk = posts[-1].pk
+        post_ids = [post.pk for post in posts]
+
+        # bulk_create는 auto_now 필드를 지금 시간으로 덮어쓰므로 원래 값으로 되돌림
+        stamps = [(post.created_at, post.updated_at) for post in posts]
+        copy_rows(post_model, posts, target, batch_size)
+        for post, (created_at, updated_at) in zip(posts, stamps):
+            post.created_at, post.updated_at = created_at, updated_at
+        post_model.objects.using(target).bulk_update(
+            posts, ["created_at", "updated_at"], batch_size=batch_size
+        )
+
+        links = list(
+            through.objects.using(source).filter(**{f"{post_attr}__in": post_ids})
+        )
+        copy_rows(through, links, target, batch_size)
+        terms = list(term_model.objects.using(source).filter(document_id__in=post_ids))
+        copy_rows(term_model, terms, target, batch_size)
+
+        counts[post_model._meta.label] += len(posts)
+        counts[through._meta.label] += len(links)
+        counts[term_model._meta.label] += len(terms)
+        if on_batch is not None:
+            on_batch()
+    return counts
+
+
+def delete_user_rows(user_id, using):
+    """using DB에 있는 user의 글, 태그 (M2M, term은 cascade)"""
+    with transaction.atomic(using=using):
+        for post_model, tag_model, _ in families():
+            post_model.objects.using(using).filter(user_id=user_id).delete()
+            tag_model.objects.using(using).filter(user_id=user_id).delete()
+
+
+def move_user(user, target, batch_size=500):
+    """
+    user의 글, 태그, M2M, 검색 term을 target으로 같은 id 그대로 복사하고 User.shard를
+    바꾼 뒤 원래 shard에서 지움. 옮긴 model별 row 수를 돌려줌
+
+    옮기는 동안은 그 user의 쓰기를 막고(ShardLocked, 503), 막기 전에 shard를 읽은
+    요청이 끝나도록 SHARD_MOVE_GRACE초 기다린 뒤 복사함. lock과 shard는 API 캐시에
+    있으므로 서버와 같은 공유 캐시로 돌려야함 (rebalance_shards)
+    """
+    source = shard_for(user.pk)
+    if source == target:
+        return Counter()
+
+    def keep_locked():
+        lock_shard(user.pk, settings.SHARD_MOVE_LOCK_TIMEOUT)
+
+    counts = Counter()
+    keep_locked()
+    try:
+        time.sleep(settings.SHARD_MOVE_GRACE)
+        with transaction.atomic(using=target):
+            for family in families():
+                counts += copy_family(
+                    user.pk, source, target, *family, batch_size, keep_locked
+                )
+
+        get_user_model().objects.using(DEFAULT_DB_ALIAS).filter(pk=user.pk).update(
+            shard=target
+        )
+        user.shard = target
+        get_cache().set(shard_key(user.pk), target, settings.SHARD_CACHE_TIMEOUT)
+
+        delete_user_rows(user.pk, source)
+    finally:
+        unlock_shard(user.pk)
+    invalidate(CACHE_SCOPES, user.pk)
+    return counts
@@ -0,0 +1,185 @@
+import csv
+import json
+import os
+
+from django.db import router, transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from core.cache import invalidate
+from core.db.routers import use_shard
+
+IMPORT_TYPES = ("jsonl", "csv")
+MAX_REPORTED_ERRORS = 100
+
+
+def guess_type(name, default="jsonl"):
+    extension = os.path.splitext(name or "")[1].lstrip(".").lower()
+    return extension if extension in IMPORT_TYPES else default
+
+
+class DecodedLines:
+    """
+    binary file을 한줄씩 UTF-8로 decode. decode 못하는 줄은 빈 줄로 넘기고
+    errors에 남겨서 read_*가 그 자리에 row 에러로 돌려줌
+    """
+
+    def __init__(self, file):
+        self.file = iter(file)
+        # 첫 줄만 BOM을 뗌
+        self.encoding = "utf-8-sig"
+        self.errors = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = next(self.file)
+        encoding, self.encoding = self.encoding, "utf-8"
+        try:
+            return line.decode(encoding)
+        except UnicodeDecodeError as e:
+            self.errors.append(ValueError(f"UTF-8이 아님: {e}"))
+            return "\n"
+
+    def pop_errors(self):
+        errors, self.errors = self.errors, []
+        return errors
+
+
+def read_jsonl(lines):
+    for line in lines:
+        yield from lines.pop_errors()
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"JSON 형식 오류: {e}")
+
+
+def read_csv(lines):
+    # export의 csv와 같은 형태. 태그는 "a|b"
+    reader = csv.DictReader(lines)
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            break
+        except csv.Error as e:
+            # 잘못된 줄은 reader가 이미 읽었으므로 다음 줄부터 계속
+            yield from lines.pop_errors()
+            yield ValueError(f"CSV 형식 오류: {e}")
+            continue
+        yield from lines.pop_errors()
+        if row.get("tags") is not None:
+            row["tags"] = [{"name": name} for name in row["tags"].split("|") if name]
+        yield row
+    yield from lines.pop_errors()
+
+
+def read_rows(file, import_type):
+    """binary file을 한줄씩 decode 해서 row를 하나씩 돌려줌 (파일 전체를 올리지 않음)"""
+    lines = DecodedLines(file)
+    if import_type == "csv":
+        return read_csv(lines)
+    return read_jsonl(lines)
+
+
+class Importer:
+    """
+    row를 batch_size 만큼 모아서 serializer로 하나씩 검증하고, 통과한 row만
+    ListSerializer.create(bulk_create, 태그 bulk resolve)로 batch 마다 한 transaction에 저장
+
+    잘못된 row는 건너뛰고 (몇번째 row인지, 에러)를 남김
+    """
+
+    def __init__(self, serializer_class, user, cache_scope, batch_size=1000):
+        self.serializer_class = serializer_class
+        self.user = user
+        self.cache_scope = cache_scope
+        self.batch_size = batch_size
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, rows, progress=None):
+        batch = []
+        # command에서 부를 때도 user의 shard에 저장하도록
+        with use_shard(self.user):
+            for number, row in enumerate(rows, start=1):
+                batch.append((number, row))
+                if len(batch) >= self.batch_size:
+                    self.save_batch(batch, progress)
+                    batch = []
+            if batch:
+                self.save_batch(batch, progress)
+        if self.created:
+            invalidate([self.cache_scope], self.user.pk)
+        return self.result()
+
+    def save_batch(self, batch, progress=None):
+        # ListSerializer처럼 child 하나로 검증해서 field 구성을 row마다 다시 하지 않음
+        child = self.serializer_class()
+        validated = []
+        for number, row in batch:
+            if isinstance(row, Exception):
+                self.add_error(number, {"non_field_errors": [str(row)]})
+                continue
+            if not isinstance(row, dict):
+                self.add_error(number, {"non_field_errors": ["object 형태여야함"]})
+                continue
+            try:
+                attrs = child.run_validation(row)
+            except ValidationError as e:
+                self.add_error(number, e.detail)
+            else:
+                validated.append({**attrs, "user": self.user})
+
+        if validated:
+            model = self.serializer_class.Meta.model
+            with transaction.atomic(using=router.db_for_write(model)):
+                self.serializer_class(many=True).create(validated)
+            self.created += len(validated)
+        if progress is not None:
+            progress(self)
+
+    def add_error(self, number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": number, "errors": errors})
+
+    def result(self):
+        return {"created": self.created, "failed": self.failed, "errors": self.errors}
+
+
+class ImportMixin:
+    """
+    POST {prefix}/import/ 에 file(jsonl, csv)을 multipart로 올리면 batch로 저장
+
+    type을 안주면 파일 확장자로 판단. 결과로 저장한 수, 실패한 수, 실패한 row를 돌려줌
+    """
+
+    import_batch_size = 1000
+
+    @action(detail=False, methods=["post"], url_path="import", url_name="import")
+    def import_rows(self, request, *args, **kwargs):
+        file = request.FILES.get("file")
+        if file is None:
+            raise ValidationError({"file": ["파일을 올려야함"]})
+
+        import_type = request.query_params.get("type") or guess_type(file.name)
+        if import_type not in IMPORT_TYPES:
+            raise ValidationError({"type": [f"{', '.join(IMPORT_TYPES)} 중 하나"]})
+
+        importer = Importer(
+            self.get_serializer_class(),
+            request.user,
+            self.cache_scope,
+            batch_size=self.import_batch_size,
+        )
+        result = importer.run(read_rows(file, import_type))
+        return Response(result, status=status.HTTP_201_CREATED)
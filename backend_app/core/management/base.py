@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache import get_cache
+from core.checks import is_process_local
+
+
+class SharedCacheCommand(BaseCommand):
+    """
+    API 캐시의 버전(응답 캐시 무효화, user shard)을 바꾸는 command
+
+    manage.py로 따로 띄운 process에서 LocMemCache를 바꾸면 서버 process에는 안
+    보임. 응답 캐시는 API_CACHE_TIMEOUT 뒤에 맞춰지므로 경고만 하고,
+    requires_shared_cache인 command(서버가 꼭 봐야하는 lock, shard)는 실행하지 않음.
+    call_command는 부른 process의 캐시를 바꾸므로 그대로 둠
+    """
+
+    requires_shared_cache = False
+    standalone = False
+
+    def run_from_argv(self, argv):
+        self.standalone = True
+        return super().run_from_argv(argv)
+
+    def execute(self, *args, **options):
+        if self.standalone and is_process_local(get_cache()):
+            if self.requires_shared_cache:
+                raise CommandError(
+                    "API 캐시가 process마다 따로인 LocMemCache라서 서버에 변경이 안 "
+                    "보임. API_CACHE_BACKEND를 서버와 같은 공유 캐시로 설정해서 실행"
+                )
+            self.stderr.write(
+                self.style.WARNING(
+                    "API 캐시가 LocMemCache라서 서버의 캐시된 응답은 "
+                    "API_CACHE_TIMEOUT 뒤에 바뀜"
+                )
+            )
+        return super().execute(*args, **options)
@@ -0,0 +1,111 @@
+import multiprocessing
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.synthetic import Generator, email_for, plan
+
+# fork한 worker process가 물려받아서 씀
+_generator = None
+
+
+def run_task(task):
+    return _generator.run(*task)
+
+
+def make_tasks(counts, chunk):
+    """user 구간 (start, counts). 구간마다 글이 chunk개 정도가 되도록"""
+    tasks, start, posts = [], 0, 0
+    for i, (blogs, campings) in enumerate(counts):
+        posts += blogs + campings + 1
+        if posts >= chunk:
+            tasks.append((start, counts[start : i + 1]))
+            start, posts = i + 1, 0
+    if start < len(counts):
+        tasks.append((start, counts[start:]))
+    return tasks
+
+
+class Command(BaseCommand):
+    help = (
+        "user, blog, camping, 태그 가짜 데이터를 bulk insert로 만듦 (core/synthetic.py). "
+        "같은 --seed면 --workers와 상관없이 같은 데이터"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--blogs", type=int, default=100000)
+        parser.add_argument("--campings", type=int, default=100000)
+        parser.add_argument("--tags", type=int, default=8, help="user별 평균 태그 종류")
+        parser.add_argument(
+            "--skew", type=float, default=1.2, help="작을수록 소수 user에게 글이 몰림"
+        )
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--chunk", type=int, default=20000, help="worker 작업 하나의 글 수"
+        )
+        parser.add_argument("--index", action="store_true", help="검색 색인도 만듦")
+
+    def handle(self, *args, **options):
+        global _generator
+
+        seed = options["seed"]
+        if get_user_model().objects.filter(email=email_for(seed, 0)).exists():
+            raise CommandError(f"--seed {seed}로 만든 user가 이미 있음")
+
+        counts = plan(
+            seed,
+            options["users"],
+            options["blogs"],
+            options["campings"],
+            options["skew"],
+        )
+        tasks = make_tasks(counts, options["chunk"])
+        _generator = Generator(
+            seed,
+            days=options["days"],
+            tags=options["tags"],
+            batch_size=options["batch_size"],
+            index=options["index"],
+        )
+        started = time.perf_counter()
+        rows = Counter()
+        users = 0
+
+        if options["workers"] > 1:
+            # worker는 fork한 뒤 DB 연결을 새로 열어야함
+            connections.close_all()
+            pool = multiprocessing.get_context("fork").Pool(options["workers"])
+            results = pool.imap_unordered(run_task, tasks)
+        else:
+            pool = None
+            results = map(run_task, tasks)
+
+        try:
+            for result in results:
+                rows += result
+                users = rows[get_user_model()._meta.label]
+                elapsed = time.perf_counter() - started
+                total = sum(rows.values())
+                self.stdout.write(
+                    f"users {users}/{len(counts)} rows {total} "
+                    f"({elapsed:.1f}s, {total / elapsed:.0f} rows/s)"
+                )
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        for label, count in sorted(rows.items()):
+            self.stdout.write(f"{label} {count}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{sum(rows.values())}개 row 생성 ({time.perf_counter() - started:.1f}s)"
+            )
+        )
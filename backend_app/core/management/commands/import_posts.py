@@ -0,0 +1,60 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+from django.utils.module_loading import import_string
+
+from core.importer import IMPORT_TYPES, Importer, guess_type, read_rows
+from core.management.base import SharedCacheCommand
+
+# 대상 -> 같은 serializer, cache_scope를 쓰는 view
+TARGETS = {
+    "blog": "blog.views.BlogAPIView",
+    "camping": "camping.views.CampingViewSet",
+}
+
+
+class Command(SharedCacheCommand):
+    help = "jsonl, csv 파일을 user의 blog 또는 camping으로 가져옴"
+
+    def add_arguments(self, parser):
+        parser.add_argument("target", choices=TARGETS)
+        parser.add_argument("email")
+        parser.add_argument("path")
+        parser.add_argument("--type", choices=IMPORT_TYPES)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(email=options["email"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"{options['email']} 유저가 없음")
+
+        view = import_string(TARGETS[options["target"]])
+        importer = Importer(
+            view.serializer_class,
+            user,
+            view.cache_scope,
+            batch_size=options["batch_size"],
+        )
+        import_type = options["type"] or guess_type(options["path"])
+        started = time.perf_counter()
+
+        def progress(importer):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"created {importer.created} failed {importer.failed} "
+                f"({elapsed:.1f}s)"
+            )
+
+        with open(options["path"], "rb") as file:
+            result = importer.run(read_rows(file, import_type), progress=progress)
+
+        for error in result["errors"]:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result['created']}개 저장, {result['failed']}개 실패 "
+                f"({time.perf_counter() - started:.1f}s)"
+            )
+        )
@@ -0,0 +1,71 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+
+from core.db.routers import home_shard, shard_for
+from core.db.sharding import move_user
+from core.management.base import SharedCacheCommand
+
+# 옮기는 동안 쓰기를 막는 것은 core.db.sharding.move_user의 lock이 모든 worker에
+# 보여야만 맞음. 그래서
+# - 서버의 모든 worker와 이 command가 같은 공유 API 캐시를 써야함 (WEB_CONCURRENCY=1
+#   이어도 command는 다른 process). LocMemCache면 실행하지 않음
+# - SHARD_MOVE_GRACE는 가장 긴 쓰기 transaction보다 길어야함. lock 직전에 검사를
+#   통과한 쓰기가 그 안에 commit 되어야 복사에 포함됨. lock 뒤의 쓰기는 503
+
+
+class Command(SharedCacheCommand):
+    help = (
+        "user의 글, 태그를 다른 shard로 옮김. --to가 없으면 user_id hash로 정한 shard로 "
+        "(--all이면 그 shard에 있지 않은 모든 user). 옮기는 동안 그 user는 쓰기가 "
+        "막힘(503). 서버와 같은 공유 캐시로 실행해야함"
+    )
+    # 서버가 쓰기 lock과 바뀐 shard를 봐야함
+    requires_shared_cache = True
+
+    def add_arguments(self, parser):
+        parser.add_argument("emails", nargs="*")
+        parser.add_argument("--to", dest="target")
+        parser.add_argument("--all", action="store_true")
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if not settings.SHARD_DATABASES:
+            raise CommandError("SHARD_DATABASES가 설정되지 않음")
+        target = options["target"]
+        if target is not None and target not in settings.SHARD_DATABASES:
+            raise CommandError(f"{target}은 SHARD_DATABASES에 없음")
+        if bool(options["emails"]) == options["all"]:
+            raise CommandError("email 또는 --all 중 하나만")
+
+        users = get_user_model().objects.order_by("pk")
+        if options["emails"]:
+            users = users.filter(email__in=options["emails"])
+            missing = set(options["emails"]) - set(
+                users.values_list("email", flat=True)
+            )
+            if missing:
+                raise CommandError(f"{', '.join(sorted(missing))} 유저가 없음")
+
+        moved = 0
+        for user in list(users):
+            source, destination = shard_for(user.pk), target or home_shard(user.pk)
+            if source == destination:
+                continue
+            if options["dry_run"]:
+                self.stdout.write(f"{user.email}: {source} -> {destination}")
+                continue
+
+            started = time.perf_counter()
+            counts = move_user(user, destination, batch_size=options["batch_size"])
+            rows = ", ".join(f"{label} {count}" for label, count in counts.items())
+            self.stdout.write(
+                f"{user.email}: {source} -> {destination} ({rows or '0 rows'}, "
+                f"{time.perf_counter() - started:.1f}s)"
+            )
+            moved += 1
+
+        self.stdout.write(self.style.SUCCESS(f"{moved}명 옮김"))
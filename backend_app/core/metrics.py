@@ -0,0 +1,409 @@
+"""
+route별 latency, 응답 크기, status, SQL 수 histogram/counter와 API 캐시 hit/miss
+
+worker process마다 METRICS_DIR/<pid>.db mmap 파일에 값을 더하고 GET /metrics/ 가
+디렉토리의 모든 파일을 합쳐서 Prometheus text format으로 내보냄 (prometheus_client
+multiprocess 모드와 같은 방식). METRICS_DIR이 없으면 process 메모리에만 쌓음
+
+배포할 때 METRICS_DIR은 worker를 띄우기 전에 비워야함. 죽은 worker 파일도 합치므로
+counter는 재시작해도 줄어들지 않음. gauge는 살아있는 worker 값만 합침
+
+DB 연결 pool(core.db.pool) 상태는 요청이 끝날 때마다 process 값을 그대로 써둠
+"""
+
+import hmac
+import mmap
+import os
+import struct
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+import orjson
+from django.conf import settings
+from django.http import HttpResponse
+from django.views import View
+
+from core.db.pool import pool_stats
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class ValueFile:
+    """
+    process 하나만 쓰는 key -> float64 mmap 파일
+
+    [사용한 bytes uint32, padding] 뒤에 [key 길이 uint32, key(8 bytes 정렬), float64]
+    를 이어 붙임. 새 key는 항목을 다 쓴 뒤 header를 바꿔서 읽는 쪽은 완성된 항목만 봄
+    """
+
+    initial_size = 1 << 16
+
+    def __init__(self, path):
+        self.path = path
+        self.offsets = {}
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, "r+b" if exists else "w+b")
+        if not exists:
+            self.file.truncate(self.initial_size)
+        self.mmap = mmap.mmap(self.file.fileno(), 0)
+        self.used = struct.unpack_from("I", self.mmap, 0)[0] or 8
+        for key, value, offset in self._entries(self.mmap, self.used):
+            self.offsets[key] = offset
+
+    @staticmethod
+    def _entries(data, used):
+        position = 8
+        while position < used:
+            length = struct.unpack_from("I", data, position)[0]
+            key_end = position + 4 + length
+            value_offset = key_end + (-key_end % 8)
+            yield bytes(data[position + 4 : key_end]), struct.unpack_from(
+                "d", data, value_offset
+            )[0], value_offset
+            position = value_offset + 8
+
+    @classmethod
+    def read(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < 8:
+            return {}
+        used = struct.unpack_from("I", data, 0)[0]
+        return {key: value for key, value, _ in cls._entries(data, used)}
+
+    def inc(self, key, amount):
+        offset = self.offsets.get(key)
+        if offset is None:
+            offset = self._append(key)
+        value = struct.unpack_from("d", self.mmap, offset)[0]
+        struct.pack_into("d", self.mmap, offset, value + amount)
+
+    def set(self, key, value):
+        offset = self.offsets.get(key)
+        if offset is None:
+            offset = self._append(key)
+        struct.pack_into("d", self.mmap, offset, value)
+
+    def _append(self, key):
+        key_end = self.used + 4 + len(key)
+        offset = key_end + (-key_end % 8)
+        if offset + 8 > len(self.mmap):
+            size = len(self.mmap)
+            while offset + 8 > size:
+                size *= 2
+            self.mmap.close()
+            self.file.truncate(size)
+            self.mmap = mmap.mmap(self.file.fileno(), 0)
+        struct.pack_into(f"I{len(key)}s", self.mmap, self.used, len(key), key)
+        struct.pack_into("d", self.mmap, offset, 0.0)
+        self.used = offset + 8
+        struct.pack_into("I", self.mmap, 0, self.used)
+        self.offsets[key] = offset
+        return offset
+
+
+class Store:
+    """process별 값. fork 뒤에 처음 쓰면 새 pid 파일을 엶"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.path = None
+        self.file = None
+        self.values = defaultdict(float)
+
+    def directory(self):
+        return settings.METRICS_DIR
+
+    def inc(self, key, amount=1.0):
+        with self.lock:
+            file = self.open()
+            if file is None:
+                self.values[key] += amount
+            else:
+                file.inc(key, amount)
+
+    def set(self, key, value):
+        """이 process의 값을 바꿈 (gauge, 다른 곳에서 세는 누적값)"""
+        with self.lock:
+            file = self.open()
+            if file is None:
+                self.values[key] = value
+            else:
+                file.set(key, value)
+
+    def open(self):
+        directory = self.directory()
+        if not directory:
+            return None
+        path = str(Path(directory) / f"{os.getpid()}.db")
+        if self.path != path:
+            self.path, self.file = path, ValueFile(path)
+        return self.file
+
+    def read(self):
+        """worker별 [(pid, {key: value})]"""
+        directory = self.directory()
+        if not directory:
+            with self.lock:
+                return [(os.getpid(), dict(self.values))]
+        return [
+            (int(path.stem), ValueFile.read(path))
+            for path in sorted(Path(directory).glob("*.db"))
+            if path.stem.isdigit()
+        ]
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
+            self.path = self.file = None
+            directory = self.directory()
+            if directory:
+                for path in Path(directory).glob("*.db"):
+                    path.unlink()
+
+
+store = Store()
+registry = []
+
+
+def sample_key(name, suffix, labels):
+    return orjson.dumps([name, suffix, sorted(labels.items())])
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        registry.append(self)
+
+    def check(self, labels):
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} label은 {', '.join(self.labels)}")
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1.0, **labels):
+        self.check(labels)
+        store.inc(sample_key(self.name, "", labels), amount)
+
+    def set_total(self, value, **labels):
+        """다른 곳(pool 등)이 이 process에서 센 누적값을 그대로 씀"""
+        self.check(labels)
+        store.set(sample_key(self.name, "", labels), value)
+
+
+class Gauge(Metric):
+    """process마다의 현재 값. 살아있는 worker 값만 합쳐서 내보냄"""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        self.check(labels)
+        store.set(sample_key(self.name, "", labels), value)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels, buckets):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        """bucket은 누적하지 않고 들어간 칸 하나만 더함 (내보낼 때 누적)"""
+        self.check(labels)
+        for bound in self.buckets:
+            if value <= bound:
+                le = format_value(bound)
+                break
+        else:
+            le = "+Inf"
+        store.inc(sample_key(self.name, "_bucket", {**labels, "le": le}))
+        store.inc(sample_key(self.name, "_sum", labels), value)
+        store.inc(sample_key(self.name, "_count", labels))
+
+
+def format_value(value):
+    if value == int(value):
+        return f"{int(value)}.0"
+    return repr(value)
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels) + "}"
+
+
+def is_alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def exposition():
+    """Prometheus text format"""
+    gauges = {metric.name for metric in registry if metric.kind == "gauge"}
+    samples = defaultdict(lambda: defaultdict(float))
+    for pid, values in store.read():
+        alive = None
+        for key, value in values.items():
+            name, suffix, labels = orjson.loads(key)
+            if name in gauges:
+                if alive is None:
+                    alive = is_alive(pid)
+                if not alive:
+                    continue
+            samples[name][(suffix, tuple(map(tuple, labels)))] += value
+
+    lines = []
+    for metric in registry:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        values = samples.get(metric.name, {})
+        if metric.kind in ("counter", "gauge"):
+            for (suffix, labels), value in sorted(values.items()):
+                lines.append(
+                    f"{metric.name}{suffix}{format_labels(labels)} {format_value(value)}"
+                )
+            continue
+
+        series = sorted(
+            {labels for suffix, labels in values if suffix in ("_sum", "_count")}
+        )
+        for labels in series:
+            cumulative = 0.0
+            for bound in [*map(format_value, metric.buckets), "+Inf"]:
+                bucket_labels = [*labels, ("le", bound)]
+                cumulative += values.get(("_bucket", tuple(sorted(bucket_labels))), 0.0)
+                lines.append(
+                    f"{metric.name}_bucket{format_labels(bucket_labels)} "
+                    f"{format_value(cumulative)}"
+                )
+            for suffix in ["_sum", "_count"]:
+                lines.append(
+                    f"{metric.name}{suffix}{format_labels(labels)} "
+                    f"{format_value(values.get((suffix, labels), 0.0))}"
+                )
+    return "\n".join(lines) + "\n"
+
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "route, method, status별 요청 수",
+    ["route", "method", "status"],
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "route별 응답 시간(초)",
+    ["route", "method"],
+    [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "route별 응답 body 크기 (스트리밍 응답 제외)",
+    ["route", "method"],
+    [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304],
+)
+QUERIES = Histogram(
+    "http_request_db_queries",
+    "route별 요청 하나의 SQL 수",
+    ["route", "method"],
+    [0, 1, 2, 3, 5, 10, 20, 50, 100],
+)
+CACHE = Counter(
+    "api_cache_requests_total",
+    "cache_scope별 응답 캐시 hit/miss",
+    ["scope", "result"],
+)
+POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "DB alias별 pool 연결 수 (state=in_use, idle)",
+    ["alias", "state"],
+)
+POOL_MAX_SIZE = Gauge(
+    "db_pool_max_size",
+    "DB alias별 pool 최대 연결 수 (worker 합)",
+    ["alias"],
+)
+POOL_EVENTS = Counter(
+    "db_pool_events_total",
+    "DB alias별 pool 이벤트 (created, reused, waits, timeouts, recycled, ...)",
+    ["alias", "event"],
+)
+POOL_GAUGES = {"size", "idle", "in_use", "max_size"}
+
+
+def route_of(request):
+    """
+    URL 이름 ("blog:blog-detail"). 값마다 label이 늘어나지 않도록 실제 path는 쓰지
+    않고, METRICS_APPS namespace가 아니면 None
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None or not set(match.app_names) & set(settings.METRICS_APPS):
+        return None
+    return match.view_name
+
+
+def observe_request(request, response, duration, queries=None):
+    route = route_of(request)
+    if route is None:
+        return
+    labels = {"route": route, "method": request.method}
+    REQUESTS.inc(status=str(response.status_code), **labels)
+    LATENCY.observe(duration, **labels)
+    if not response.streaming:
+        RESPONSE_SIZE.observe(len(response.content), **labels)
+    if queries is not None:
+        QUERIES.observe(queries, **labels)
+
+
+def observe_cache(scope, hit):
+    CACHE.inc(scope=scope or "", result="hit" if hit else "miss")
+
+
+def observe_pools():
+    """이 process의 pool 통계를 그대로 씀. 요청이 끝나서 연결을 반납한 뒤에 부름"""
+    for alias, stats in pool_stats().items():
+        POOL_CONNECTIONS.set(stats["in_use"], alias=alias, state="in_use")
+        POOL_CONNECTIONS.set(stats["idle"], alias=alias, state="idle")
+        POOL_MAX_SIZE.set(stats["max_size"], alias=alias)
+        for event, value in stats.items():
+            if event not in POOL_GAUGES:
+                POOL_EVENTS.set_total(value, alias=alias, event=event)
+
+
+class MetricsView(View):
+    """
+    GET /metrics/ Prometheus text format
+
+    Authorization: Bearer <METRICS_TOKEN> 이어야함. METRICS_TOKEN이 없으면 막음
+    """
+
+    http_method_names = ["get"]
+
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        if not token:
+            return HttpResponse(status=403)
+        header = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(header.encode(), f"Bearer {token}".encode()):
+            return HttpResponse(status=401)
+        observe_pools()
+        return HttpResponse(exposition(), content_type=CONTENT_TYPE)
@@ -0,0 +1,135 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from django.conf import settings
+
+from core.db.routers import pin_to_primary, start_routing, stop_routing
+from core.metrics import observe_request
+from core.timing import current_timing, log_slow, start_timing, stop_timing
+
+
+class ReplicaRoutingMiddleware:
+    """
+    요청 동안 ReplicaRouter가 쓸 상태를 잡아주고, 쓰기가 있었던 요청이 끝나면
+    그 user의 읽기를 REPLICA_PIN_SECONDS 동안 primary로 고정
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = start_routing(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            state = stop_routing(token)
+        if state.wrote or not state.safe:
+            self.pin(request)
+        return response
+
+    async def __acall__(self, request):
+        token = start_routing(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            state = stop_routing(token)
+        if state.wrote or not state.safe:
+            # request.user가 아직 lazy면 session을 DB에서 읽으므로 thread에서
+            await sync_to_async(self.pin)(request)
+        return response
+
+    def pin(self, request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user.pk)
+
+
+class QueryTimingMiddleware:
+    """
+    요청마다 SQL 수, 시간과 단계별 시간을 Server-Timing 헤더로 붙이고 느린 요청,
+    SQL은 core.timing logger로 (core/timing.py)
+
+    MIDDLEWARE 맨 앞에 둬서 다른 middleware 시간까지 total에 들어감
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.SERVER_TIMING:
+            return self.get_response(request)
+        token = start_timing()
+        try:
+            response = self.get_response(request)
+        finally:
+            timing = stop_timing(token)
+        return self.finish(request, response, timing)
+
+    async def __acall__(self, request):
+        if not settings.SERVER_TIMING:
+            return await self.get_response(request)
+        token = start_timing()
+        try:
+            response = await self.get_response(request)
+        finally:
+            timing = stop_timing(token)
+        return self.finish(request, response, timing)
+
+    def finish(self, request, response, timing):
+        response["Server-Timing"] = timing.header()
+        log_slow(request, response, timing)
+        return response
+
+
+class MetricsMiddleware:
+    """
+    METRICS_APPS 요청의 latency, 응답 크기, status, SQL 수를 core.metrics에 기록
+
+    SQL 수는 QueryTimingMiddleware가 재는 값이라 그 뒤에 둠
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.observe(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.observe(request, response, started)
+        return response
+
+    def observe(self, request, response, started):
+        timing = current_timing()
+        observe_request(
+            request,
+            response,
+            time.perf_counter() - started,
+            None if timing is None else timing.queries,
+        )
@@ -0,0 +1,137 @@
+# 기존 multi-table 테이블의 데이터를 Flat* 테이블로 복사
+#
+# pk 순서대로 BATCH_SIZE 단위로 잘라서 bulk_create/bulk_update 하기 때문에
+# 운영 중에 돌려도 테이블을 오래 잡고 있지 않는다. 같은 id를 그대로 쓰므로 API의 URL과
+# M2M 관계는 바뀌지 않는다. 여러 번 돌려도 결과가 같아서 0004에서 한 번 더 호출해
+# 1단계 이후에 생기거나 바뀐 row를 따라잡는다.
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+TAG_FIELDS = ["name", "slug", "user_id"]
+BLOG_FIELDS = ["updated_at", "created_at", "title", "content", "user_id"]
+CAMPING_FIELDS = ["updated_at", "created_at", "title", "review", "user_id"]
+
+PAIRS = [
+    # (old tag, flat tag, old post, flat post, post fields)
+    ("BlogTag", "FlatBlogTag", "Blog", "FlatBlog", BLOG_FIELDS),
+    ("CampingTag", "FlatCampingTag", "Camping", "FlatCamping", CAMPING_FIELDS),
+]
+
+
+def disable_auto_now(model):
+    # 복사할 때는 원래 시간을 그대로 써야 함 (historical model이라 다른 곳에 영향 없음)
+    for field in model._meta.concrete_fields:
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+            field.auto_now = field.auto_now_add = False
+
+
+def iter_batches(model, fields):
+    last_pk = 0
+    while True:
+        rows = list(
+            model.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values("pk", *fields)[:BATCH_SIZE]
+        )
+        if not rows:
+            return
+        last_pk = rows[-1]["pk"]
+        yield rows
+
+
+def copy_rows(old_model, flat_model, fields):
+    update_fields = [field.removesuffix("_id") for field in fields]
+    for rows in iter_batches(old_model, fields):
+        existing = {
+            row.pop("id"): row
+            for row in flat_model.objects.filter(
+                id__in=[row["pk"] for row in rows]
+            ).values("id", *fields)
+        }
+        to_create, to_update = [], []
+        for row in rows:
+            pk = row.pop("pk")
+            if pk not in existing:
+                to_create.append(flat_model(id=pk, **row))
+            elif existing[pk] != row:
+                to_update.append(flat_model(id=pk, **row))
+        flat_model.objects.bulk_create(to_create)
+        flat_model.objects.bulk_update(to_update, update_fields)
+
+    flat_model.objects.exclude(id__in=old_model.objects.values("pk")).delete()
+
+
+def copy_m2m(old_model, flat_model):
+    old_field = old_model._meta.get_field("tags")
+    flat_field = flat_model._meta.get_field("tags")
+    old_through = old_field.remote_field.through
+    flat_through = flat_field.remote_field.through
+    old_src, old_dst = old_field.m2m_column_name(), old_field.m2m_reverse_name()
+    flat_src, flat_dst = flat_field.m2m_column_name(), flat_field.m2m_reverse_name()
+
+    for rows in iter_batches(old_model, []):
+        ids = [row["pk"] for row in rows]
+        old_pairs = set(
+            old_through.objects.filter(**{f"{old_src}__in": ids}).values_list(
+                old_src, old_dst
+            )
+        )
+        flat_pairs = set(
+            flat_through.objects.filter(**{f"{flat_src}__in": ids}).values_list(
+                flat_src, flat_dst
+            )
+        )
+        flat_through.objects.bulk_create(
+            flat_through(**{flat_src: src, flat_dst: dst})
+            for src, dst in old_pairs - flat_pairs
+        )
+        for src, dst in flat_pairs - old_pairs:
+            flat_through.objects.filter(**{flat_src: src, flat_dst: dst}).delete()
+
+
+def flatten(apps, schema_editor):
+    for old_tag, flat_tag, old_post, flat_post, post_fields in PAIRS:
+        old_tag = apps.get_model("core", old_tag)
+        flat_tag = apps.get_model("core", flat_tag)
+        old_post = apps.get_model("core", old_post)
+        flat_post = apps.get_model("core", flat_post)
+        disable_auto_now(flat_post)
+
+        copy_rows(old_tag, flat_tag, TAG_FIELDS)
+        copy_rows(old_post, flat_post, post_fields)
+        copy_m2m(old_post, flat_post)
+
+
+def unflatten(apps, schema_editor):
+    # 롤백용. multi-table 모델은 bulk_create가 안 돼서 한 row씩 저장
+    disable_auto_now(apps.get_model("core", "TimeStampedModel"))
+    for old_tag, flat_tag, old_post, flat_post, post_fields in PAIRS:
+        old_tag = apps.get_model("core", old_tag)
+        flat_tag = apps.get_model("core", flat_tag)
+        old_post = apps.get_model("core", old_post)
+        flat_post = apps.get_model("core", flat_post)
+
+        for row in flat_tag.objects.order_by("id").values("id", *TAG_FIELDS):
+            old_tag(**row).save()
+        for post in flat_post.objects.order_by("id").prefetch_related("tags"):
+            row = {field: getattr(post, field) for field in post_fields}
+            old = old_post(id=post.id, **row)
+            old.save()
+            old.tags.set([tag.id for tag in post.tags.all()])
+
+        flat_post.objects.all().delete()
+        flat_tag.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0002_flat_models"),
+    ]
+
+    operations = [
+        migrations.RunPython(flatten, unflatten),
+    ]
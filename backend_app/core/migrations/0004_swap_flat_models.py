@@ -0,0 +1,141 @@
+# 0003 이후에 쌓인 변경분을 한 번 더 복사하고 multi-table 테이블을 Flat* 테이블로 교체
+#
+# 마지막 복사부터 테이블 교체까지 옛 코드가 옛 테이블에 쓴 것은 복사되지 않고 사라지므로
+# 먼저 옛 테이블에 쓰기를 거부하는 trigger를 건다. 이 migration이 시작되고 새 코드로
+# 바뀔 때까지 옛 코드의 쓰기 요청은 에러(500)가 나고 읽기는 그대로 됨. 새 코드 배포
+# 직전에 돌릴 것
+#
+# MySQL은 binary log를 쓰면 trigger를 만드는 계정에 SUPER 권한이나
+# log_bin_trust_function_creators=1이 필요함. 옛 테이블을 지우면 trigger도 같이 지워짐
+
+from importlib import import_module
+
+from django.conf import settings
+from django.db import migrations, models
+
+copy_to_flat_models = import_module("core.migrations.0003_copy_to_flat_models")
+
+OLD_MODELS = [
+    "TimeStampedModel",
+    "TagModel",
+    "Blog",
+    "Camping",
+    "BlogTag",
+    "CampingTag",
+]
+EVENTS = ["INSERT", "UPDATE", "DELETE"]
+MESSAGE = "core 테이블 교체 중이라 쓸 수 없음 (0004_swap_flat_models)"
+
+
+def old_tables(apps):
+    tables = []
+    for name in OLD_MODELS:
+        model = apps.get_model("core", name)
+        tables.append(model._meta.db_table)
+        for field in model._meta.local_many_to_many:
+            tables.append(field.remote_field.through._meta.db_table)
+    return tables
+
+
+def trigger_name(table, event):
+    return f"{table}_block_{event.lower()}"
+
+
+def block_writes(apps, schema_editor):
+    # MySQL은 DDL이 transaction에 묶이지 않아서 중간에 실패했다가 다시 돌리면
+    # trigger가 남아있을 수 있음
+    unblock_writes(apps, schema_editor)
+    quote = schema_editor.quote_name
+    for table in old_tables(apps):
+        for event in EVENTS:
+            name = trigger_name(table, event)
+            if schema_editor.connection.vendor == "mysql":
+                action = f"SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = '{MESSAGE}'"
+            else:
+                action = f"BEGIN SELECT RAISE(ABORT, '{MESSAGE}'); END"
+            schema_editor.execute(
+                f"CREATE TRIGGER {quote(name)} BEFORE {event} ON {quote(table)} "
+                f"FOR EACH ROW {action}"
+            )
+
+
+def unblock_writes(apps, schema_editor):
+    for table in old_tables(apps):
+        for event in EVENTS:
+            schema_editor.execute(
+                f"DROP TRIGGER IF EXISTS "
+                f"{schema_editor.quote_name(trigger_name(table, event))}"
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("core", "0003_copy_to_flat_models"),
+    ]
+
+    operations = [
+        migrations.RunPython(block_writes, unblock_writes),
+        migrations.RunPython(copy_to_flat_models.flatten, migrations.RunPython.noop),
+        migrations.DeleteModel(name="Blog"),
+        migrations.DeleteModel(name="Camping"),
+        migrations.DeleteModel(name="BlogTag"),
+        migrations.DeleteModel(name="CampingTag"),
+        migrations.DeleteModel(name="TimeStampedModel"),
+        migrations.DeleteModel(name="TagModel"),
+        migrations.RenameModel(old_name="FlatBlogTag", new_name="BlogTag"),
+        migrations.RenameModel(old_name="FlatCampingTag", new_name="CampingTag"),
+        migrations.RenameModel(old_name="FlatBlog", new_name="Blog"),
+        migrations.RenameModel(old_name="FlatCamping", new_name="Camping"),
+        migrations.AlterModelOptions(
+            name="blog",
+            options={"ordering": ["-updated_at"]},
+        ),
+        migrations.AlterField(
+            model_name="blogtag",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=models.deletion.DO_NOTHING,
+                related_name="blogtag",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="campingtag",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=models.deletion.DO_NOTHING,
+                related_name="campingtag",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="blog",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=models.deletion.CASCADE,
+                related_name="blog",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="blog",
+            name="tags",
+            field=models.ManyToManyField(related_name="blog", to="core.blogtag"),
+        ),
+        migrations.AlterField(
+            model_name="camping",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=models.deletion.CASCADE,
+                related_name="camping",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="camping",
+            name="tags",
+            field=models.ManyToManyField(related_name="camping", to="core.campingtag"),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_swap_flat_models"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blog",
+            index=models.Index(
+                fields=["user", "updated_at"], name="blog_user_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="blogtag",
+            index=models.Index(fields=["user", "slug"], name="blogtag_user_slug_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="camping",
+            index=models.Index(
+                fields=["user", "created_at"], name="camping_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="campingtag",
+            index=models.Index(
+                fields=["user", "slug"], name="campingtag_user_slug_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,159 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:42
+
+import re
+import unicodedata
+from collections import Counter
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+# 이 migration을 만들 때의 core.search.tokenize. tokenizer가 바뀌어도 이 migration의
+# 결과는 같아야 해서 복사해둠 (바뀐 tokenizer로 다시 색인하려면 새 migration에서)
+MAX_TERM_LENGTH = 64
+WORD = re.compile(r"\w+")
+HANGUL = re.compile("[\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3]+")
+
+# (글, term, {field: weight}) blog/signals.py, camping/signals.py와 같은 값
+INDEXES = [
+    ("Blog", "BlogTerm", {"title": 3, "content": 1}),
+    ("Camping", "CampingTerm", {"title": 3, "review": 1}),
+]
+
+
+def tokenize(text):
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    for word in WORD.findall(text):
+        start = 0
+        for match in HANGUL.finditer(word):
+            if match.start() > start:
+                yield word[start : match.start()][:MAX_TERM_LENGTH]
+            run = match.group()
+            if len(run) == 1:
+                yield run
+            for i in range(len(run) - 1):
+                yield run[i : i + 2]
+            start = match.end()
+        if start < len(word):
+            yield word[start:][:MAX_TERM_LENGTH]
+
+
+def build_terms(term_model, objs, fields):
+    terms = []
+    for obj in objs:
+        weights = Counter()
+        for field, weight in fields.items():
+            for term in tokenize(getattr(obj, field)):
+                weights[term] += weight
+        terms += [
+            term_model(document_id=obj.pk, user_id=obj.user_id, term=term, weight=w)
+            for term, w in weights.items()
+        ]
+    return terms
+
+
+def build_index(apps, schema_editor):
+    # 기존 글 색인. pk 순서대로 잘라서 넣음
+    for model_name, term_model_name, fields in INDEXES:
+        model = apps.get_model("core", model_name)
+        term_model = apps.get_model("core", term_model_name)
+        last_pk = 0
+        while True:
+            objs = list(
+                model.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .only("pk", "user_id", *fields)[:BATCH_SIZE]
+            )
+            if not objs:
+                break
+            last_pk = objs[-1].pk
+            term_model.objects.bulk_create(build_terms(term_model, objs, fields))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_signed_tokens"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlogTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=64)),
+                ("weight", models.PositiveIntegerField()),
+                (
+                    "document",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="terms",
+                        to="core.blog",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["user", "term"], name="blogterm_user_term_idx")
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="CampingTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=64)),
+                ("weight", models.PositiveIntegerField()),
+                (
+                    "document",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="terms",
+                        to="core.camping",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["user", "term"], name="campingterm_user_term_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,127 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:13
+# 글, 태그는 shard DB에 있을 수 있어서 default에만 있는 user로의 FK 제약을 뺌
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class AlterUserForeignKey(migrations.AlterField):
+    """
+    SQLite는 FK 제약을 바꾸면 테이블을 다시 만들면서 인덱스 이름을 새로 짓는다.
+    0004 롤백은 Flat* 때 지은 이름을 기대하므로 원래 이름으로 되돌림
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        names = self.index_names(schema_editor, model)
+        super().database_forwards(app_label, schema_editor, from_state, to_state)
+        self.rename_indexes(schema_editor, model, names)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        names = self.index_names(schema_editor, model)
+        super().database_backwards(app_label, schema_editor, from_state, to_state)
+        self.rename_indexes(schema_editor, model, names)
+
+    def index_names(self, schema_editor, model):
+        """{columns: 이름} (unique 아닌 인덱스만)"""
+        if schema_editor.connection.vendor != "sqlite":
+            return {}
+        with schema_editor.connection.cursor() as cursor:
+            constraints = schema_editor.connection.introspection.get_constraints(
+                cursor, model._meta.db_table
+            )
+        return {
+            tuple(info["columns"]): name
+            for name, info in constraints.items()
+            if info["index"] and not info["unique"]
+        }
+
+    def rename_indexes(self, schema_editor, model, names):
+        table = model._meta.db_table
+        for columns, name in self.index_names(schema_editor, model).items():
+            old_name = names.get(columns)
+            if old_name is None or old_name == name:
+                continue
+            schema_editor.execute(f"DROP INDEX {schema_editor.quote_name(name)}")
+            schema_editor.execute(
+                f"CREATE INDEX {schema_editor.quote_name(old_name)} "
+                f"ON {schema_editor.quote_name(table)} "
+                f"({', '.join(map(schema_editor.quote_name, columns))})"
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_search_terms"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="shard",
+            field=models.CharField(blank=True, max_length=32),
+        ),
+        AlterUserForeignKey(
+            model_name="blog",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="blog",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        AlterUserForeignKey(
+            model_name="blogtag",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="blogtag",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        AlterUserForeignKey(
+            model_name="blogterm",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        AlterUserForeignKey(
+            model_name="camping",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="camping",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        AlterUserForeignKey(
+            model_name="campingtag",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="campingtag",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        AlterUserForeignKey(
+            model_name="campingterm",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
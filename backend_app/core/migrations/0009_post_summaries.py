@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:39
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, migrations, models
+
+from core.db.operations import KeepIndexNamesMixin
+
+BATCH_SIZE = 1000
+
+# 이 migration을 만들 때의 core.models.make_excerpt. 나중에 바뀌어도 이 migration의
+# 결과는 같아야 해서 복사해둠
+EXCERPT_LENGTH = 200
+
+# (글, 본문 필드) Blog.summary_field, Camping.summary_field와 같은 값
+SUMMARIES = [("Blog", "content"), ("Camping", "review")]
+
+
+def make_excerpt(text):
+    text = " ".join(text.split())
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    cut = text[: EXCERPT_LENGTH - 1]
+    if " " in cut[EXCERPT_LENGTH // 2 :]:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut + "…"
+
+
+def fill_summaries(apps, schema_editor):
+    # 기존 글의 excerpt, word_count. pk 순서대로 잘라서 채움
+    # RunPython은 default에서만 돌아가므로(ShardRouter.allow_migrate) shard도
+    # 여기서 채움. shard를 default보다 먼저 migrate 해야함
+    for alias in settings.SHARD_DATABASES or [DEFAULT_DB_ALIAS]:
+        for model_name, field in SUMMARIES:
+            fill_model(apps.get_model("core", model_name), field, alias)
+
+
+def fill_model(model, field, alias):
+    last_pk = 0
+    while True:
+        objs = list(
+            model.objects.using(alias)
+            .filter(pk__gt=last_pk)
+            .order_by("pk")
+            .only("pk", field)[:BATCH_SIZE]
+        )
+        if not objs:
+            break
+        last_pk = objs[-1].pk
+        for obj in objs:
+            text = getattr(obj, field)
+            obj.excerpt = make_excerpt(text)
+            obj.word_count = len(text.split())
+        model.objects.using(alias).bulk_update(objs, ["excerpt", "word_count"])
+
+
+class AddSummaryField(KeepIndexNamesMixin, migrations.AddField):
+    """SQLite는 default가 있는 컬럼을 추가할 때 테이블을 다시 만듦"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_user_shards"),
+    ]
+
+    operations = [
+        AddSummaryField(
+            model_name="blog",
+            name="excerpt",
+            field=models.CharField(blank=True, default="", max_length=200),
+        ),
+        AddSummaryField(
+            model_name="blog",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        AddSummaryField(
+            model_name="camping",
+            name="excerpt",
+            field=models.CharField(blank=True, default="", max_length=200),
+        ),
+        AddSummaryField(
+            model_name="camping",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
@@ -5,9 +5,10 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.conf import settings
+from django.db.models.signals import post_save
 from django.utils.text import slugify
 
-from typing import Iterable, Optional
+from typing import Dict, Iterable, Optional
 
 
 class UserManager(BaseUserManager):
@@ -35,6 +36,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     is_superuser = models.BooleanField(default=False)
+    # 글, 태그가 있는 DB alias (core.db.routers.ShardRouter). 비어있으면 default
+    shard = models.CharField(max_length=32, blank=True)
 
     objects = UserManager()
 
@@ -44,36 +47,127 @@ class User(AbstractBaseUser, PermissionsMixin):
         return self.email
 
 
+class ReadOnlyUserError(TypeError):
+    """StatelessUser를 저장, 삭제하려고 함"""
+
+
+class StatelessUser(User):
+    """서명된 토큰의 claim으로만 만든 유저. DB에서 읽지 않았으므로 저장하면 안됨"""
+
+    class Meta:
+        proxy = True
+
+    def save(self, *args, **kwargs):
+        raise ReadOnlyUserError("StatelessUser는 저장할 수 없음")
+
+    def delete(self, *args, **kwargs):
+        raise ReadOnlyUserError("StatelessUser는 삭제할 수 없음")
+
+
+class RevokedToken(models.Model):
+    jti = models.CharField(max_length=32, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.jti
+
+
 class TimeStampedModel(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        abstract = False
+        abstract = True
+
+
+EXCERPT_LENGTH = 200
+
+
+def make_excerpt(text: str, length: int = EXCERPT_LENGTH) -> str:
+    """공백을 한칸으로 줄이고 length 글자 안에서 단어 단위로 자름"""
+    text = " ".join(text.split())
+    if len(text) <= length:
+        return text
+    cut = text[: length - 1]
+    if " " in cut[length // 2 :]:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut + "…"
+
+
+class SummaryModel(models.Model):
+    """
+    본문(summary_field)의 앞부분과 단어 수를 저장해두고 목록에서는 본문 대신 읽음
+
+    save()에서 계산하고 bulk_create, bulk_update 하는 곳은 update_summary()를 직접 부름
+    """
+
+    summary_field = None
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, default="")
+    word_count = models.PositiveIntegerField(default=0)
+
+    def update_summary(self) -> None:
+        text = getattr(self, self.summary_field) or ""
+        self.excerpt = make_excerpt(text)
+        self.word_count = len(text.split())
+
+    def save(self, *args, **kwargs) -> None:
+        self.update_summary()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and self.summary_field in update_fields:
+            kwargs["update_fields"] = {*update_fields, "excerpt", "word_count"}
+        return super().save(*args, **kwargs)
+
+    class Meta:
+        abstract = True
+
+
+# 아래 user 소유 model들은 shard DB에 있을 수 있고 user는 default에만 있으므로
+# user FK에 DB 제약을 걸지 않음 (core.db.routers.ShardRouter)
 
 
-class Camping(TimeStampedModel):
+class Camping(SummaryModel, TimeStampedModel):
     user = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="camping"
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="camping",
+        db_constraint=False,
     )
     title = models.CharField(max_length=255)
     review = models.TextField()
     tags = models.ManyToManyField("CampingTag", related_name="camping")
 
+    summary_field = "review"
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "created_at"], name="camping_user_created_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
 
-class Blog(TimeStampedModel):
+class Blog(SummaryModel, TimeStampedModel):
     user = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="blog"
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="blog",
+        db_constraint=False,
     )
     title = models.CharField(max_length=255)
     content = models.TextField()
     tags = models.ManyToManyField("BlogTag", related_name="blog")
 
+    summary_field = "content"
+
     class Meta:
         ordering = ["-updated_at"]
+        indexes = [
+            models.Index(fields=["user", "updated_at"], name="blog_user_updated_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -90,11 +184,52 @@ class TagModel(models.Model):
         using: Optional[str] = None,
         update_fields: Optional[Iterable[str]] = None,
     ) -> None:
-        self.slug = slugify(self.name, allow_unicode=True)
+        self.slug = self.make_slug(self.name)
         return super().save(force_insert, force_update, using, update_fields)
 
+    @staticmethod
+    def make_slug(name: str) -> str:
+        return slugify(name, allow_unicode=True)
+
+    @classmethod
+    def resolve(cls, user, names: Iterable[str]) -> Dict[str, "TagModel"]:
+        """
+        이름 목록을 {slug: tag}로 반환. (user, slug)로 한번에 조회하고
+        없는 태그는 bulk_create 한번으로 생성
+
+        bulk_create는 signal이 없어서 새 태그에 post_save를 직접 보냄
+        """
+        names_by_slug = {}
+        for name in names:
+            names_by_slug.setdefault(cls.make_slug(name), name)
+        if not names_by_slug:
+            return {}
+
+        user_id = getattr(user, "pk", user)
+        tags = {}
+        queryset = cls.objects.filter(user_id=user_id, slug__in=names_by_slug)
+        for tag in queryset.order_by("id"):
+            tags.setdefault(tag.slug, tag)
+
+        missing = [
+            cls(user_id=user_id, name=name, slug=slug)
+            for slug, name in names_by_slug.items()
+            if slug not in tags
+        ]
+        for tag in cls.objects.bulk_create(missing):
+            tags[tag.slug] = tag
+            post_save.send(
+                sender=cls,
+                instance=tag,
+                created=True,
+                update_fields=None,
+                raw=False,
+                using=tag._state.db,
+            )
+        return tags
+
     class Meta:
-        abstract = False
+        abstract = True
 
     def __str__(self):
         return self.name
@@ -102,11 +237,70 @@ class TagModel(models.Model):
 
 class BlogTag(TagModel):
     user = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, related_name="blogtag"
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        related_name="blogtag",
+        db_constraint=False,
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "slug"], name="blogtag_user_slug_idx"),
+        ]
+
 
 class CampingTag(TagModel):
     user = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, related_name="campingtag"
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        related_name="campingtag",
+        db_constraint=False,
     )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "slug"], name="campingtag_user_slug_idx"),
+        ]
+
+
+class SearchTermModel(models.Model):
+    """
+    검색용 역색인. 글 하나의 term 별로 한 row (core.search에서 관리)
+
+    user를 같이 들고 있어서 (user, term) 인덱스 하나로 검색함
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        db_constraint=False,
+    )
+    term = models.CharField(max_length=64)
+    weight = models.PositiveIntegerField()
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return self.term
+
+
+class BlogTerm(SearchTermModel):
+    document = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="terms")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "term"], name="blogterm_user_term_idx"),
+        ]
+
+
+class CampingTerm(SearchTermModel):
+    document = models.ForeignKey(
+        Camping, on_delete=models.CASCADE, related_name="terms"
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "term"], name="campingterm_user_term_idx"),
+        ]
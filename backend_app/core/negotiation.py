@@ -0,0 +1,37 @@
+from django.conf import settings
+from rest_framework.exceptions import APIException
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.renderers import BrowsableAPIRenderer
+
+
+class BrowsableAPINegotiation(DefaultContentNegotiation):
+    """
+    BROWSABLE_API_STAFF_ONLY면 browsable API(HTML)는 DEBUG이거나 staff일 때만 주고
+    나머지는 첫번째 JSON renderer로. 브라우저 요청이 form 생성 등 HTML 렌더링 비용을
+    쓰지 않도록
+
+    HTML이 골라졌을 때만 user를 확인하므로 JSON 요청은 인증 순서가 그대로임.
+    content negotiation은 view의 인증보다 먼저라서 여기서 인증이 실패하면 결과를
+    지워두고 view의 perform_authentication에서 다시 인증해서 에러를 냄
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        renderer, media_type = super().select_renderer(
+            request, renderers, format_suffix
+        )
+        if isinstance(renderer, BrowsableAPIRenderer) and not self.allowed(request):
+            others = [r for r in renderers if not isinstance(r, BrowsableAPIRenderer)]
+            if others:
+                return others[0], others[0].media_type
+        return renderer, media_type
+
+    def allowed(self, request):
+        if settings.DEBUG or not settings.BROWSABLE_API_STAFF_ONLY:
+            return True
+        try:
+            return request.user.is_staff
+        except APIException:
+            # DRF는 인증이 실패하면 AnonymousUser를 넣고 raise해서 그대로 두면 view에서는
+            # 익명 요청이 됨. 지워서 다시 인증하게 하고 에러 응답은 JSON으로
+            del request._user, request._auth
+            return False
@@ -0,0 +1,161 @@
+from base64 import b64decode
+from urllib import parse
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+
+
+def ordering_columns(paginator):
+    """페이지 커서를 만들 때 instance에서 읽는 컬럼"""
+    ordering = getattr(paginator, "ordering", None) or ()
+    if isinstance(ordering, str):
+        ordering = (ordering,)
+    return [o.lstrip("-") for o in ordering]
+
+
+class KeysetPagination(CursorPagination):
+    """
+    ordering에 있는 모든 필드 값을 커서에 담는 keyset pagination
+
+    DRF CursorPagination은 첫번째 ordering 필드만 커서에 담고 같은 값이 겹치면
+    OFFSET으로 넘기는데, 여기서는 (updated_at, id)처럼 유일한 조합을 그대로 커서로 써서
+    몇번째 페이지든 인덱스 range 검색 한번으로 끝난다.
+    """
+
+    ordering = ("-updated_at", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request):
+        queryset = self.get_page_queryset(queryset, request)
+        if queryset is None:
+            return None
+        return self.set_page([obj async for obj in queryset])
+
+    def get_paginated_data(self, data):
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+    def get_page_queryset(self, queryset, request):
+        """커서 위치부터 page_size + 1개를 읽는 queryset (아직 실행하지 않음)"""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        self.fields = [
+            queryset.model._meta.get_field(o.lstrip("-")) for o in self.ordering
+        ]
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        if reverse:
+            queryset = queryset.order_by(*[self._invert(o) for o in self.ordering])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.cursor is not None:
+            queryset = queryset.filter(self._seek(self.cursor.position, reverse))
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        reverse = self.cursor is not None and self.cursor.reverse
+        self.page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            reverse = bool(int(tokens.get("r", ["0"])[0]))
+            position = tokens["p"]
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def _get_position_from_instance(self, instance, ordering):
+        if isinstance(instance, dict):
+            # core.compiled의 values() row
+            instance = self.fields[0].model(
+                **{field.attname: instance[field.attname] for field in self.fields}
+            )
+        return [field.value_to_string(instance) for field in self.fields]
+
+    def _seek(self, position, reverse):
+        try:
+            values = [
+                field.to_python(value) for field, value in zip(self.fields, position)
+            ]
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+
+        # (a, b) < (x, y) => a <= x AND (a < x OR (a = x AND b < y))
+        # 앞쪽 조건으로 첫번째 컬럼 range 검색이 가능해짐
+        seek = Q()
+        equal = Q()
+        for field, order, value in zip(self.fields, self.ordering, values):
+            lookup = "lt" if order.startswith("-") != reverse else "gt"
+            seek |= equal & Q(**{f"{field.name}__{lookup}": value})
+            equal &= Q(**{field.name: value})
+
+        lookup = "lte" if self.ordering[0].startswith("-") != reverse else "gte"
+        return Q(**{f"{self.fields[0].name}__{lookup}": values[0]}) & seek
+
+    @staticmethod
+    def _invert(order):
+        return order[1:] if order.startswith("-") else "-" + order
+
+
+class CreatedAtKeysetPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class SearchPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
@@ -0,0 +1,278 @@
+"""
+staff 요청 하나만 프로파일
+
+?profile= 또는 X-Profile 헤더가 있는 staff 요청은 인증 뒤부터 render까지를
+프로파일해서 PROFILE_DIR에 저장하고 응답에 X-Profile-Id를 붙임. 저장된 결과는
+GET /profiles/ (staff만)에서 보고 내려받음
+
+    ?profile=1, ?profile=sample   stack sampling -> collapsed stack (.folded)
+                                  flamegraph.pl, speedscope에 그대로 넣으면 됨
+    ?profile=cprofile             cProfile -> pstats 파일 (.prof)
+
+인증은 DRF view 안에서 하므로 middleware가 아니라 view mixin(ProfileMixin)
+"""
+
+import cProfile
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import orjson
+from django.conf import settings
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from user.authentication import SignedTokenAuthentication
+
+PROFILE_ID = re.compile(r"^\d{8}T\d{12}-[0-9a-f]{8}$")
+
+# sys.path 앞부분을 떼서 frame 이름을 짧게 (긴 것부터)
+_path_prefixes = sorted(
+    {os.path.join(path, "") for path in sys.path if path}, key=len, reverse=True
+)
+
+
+def short_path(filename):
+    for prefix in _path_prefixes:
+        if filename.startswith(prefix):
+            return filename[len(prefix) :]
+    return filename
+
+
+def frame_name(code):
+    return f"{code.co_name} ({short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+class Sampler:
+    """
+    요청 thread의 stack을 PROFILE_SAMPLE_MS마다 읽어서 같은 stack끼리 셈
+
+    다른 thread에서 sys._current_frames()로 읽기만 하므로 요청 쪽 비용은 거의 없음.
+    ProfileMixin.dispatch 위의 frame(handler, middleware)은 버림
+    """
+
+    mode = "sample"
+    suffix = ".folded"
+    content_type = "text/plain; charset=utf-8"
+
+    def __init__(self):
+        self.thread_id = threading.get_ident()
+        self.interval = settings.PROFILE_SAMPLE_MS / 1000
+        self.counts = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(
+            target=self.run, name="profile-sampler", daemon=True
+        )
+
+    @property
+    def samples(self):
+        return sum(self.counts.values())
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.counts[self.collapse(frame)] += 1
+
+    @staticmethod
+    def collapse(frame):
+        """바깥 frame부터 ;로 이은 한줄"""
+        names = []
+        while frame is not None:
+            names.append(frame_name(frame.f_code))
+            if frame.f_code is _root_code:
+                break
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class CProfiler:
+    """요청 thread에서만 도는 cProfile. 호출 수, 함수별 누적 시간이 필요할 때"""
+
+    mode = "cprofile"
+    suffix = ".prof"
+    content_type = "application/octet-stream"
+    samples = None
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def write(self, path):
+        self.profile.dump_stats(path)
+
+
+PROFILERS = {profiler.mode: profiler for profiler in [Sampler, CProfiler]}
+
+
+def requested_mode(request):
+    """?profile= 또는 X-Profile 값. 없으면 None"""
+    value = request.query_params.get("profile", request.headers.get("X-Profile"))
+    if value is None:
+        return None
+    if value in ["", "1", "true"]:
+        return Sampler.mode
+    if value not in PROFILERS:
+        raise ValidationError(
+            {"profile": [f"profile은 {', '.join(PROFILERS)} 중 하나여야 합니다."]}
+        )
+    return value
+
+
+def profile_dir():
+    return Path(settings.PROFILE_DIR)
+
+
+def save(profiler, request, response, duration):
+    """결과와 메타데이터(.json)를 저장하고 id를 돌려줌. PROFILE_KEEP개만 남김"""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    now = timezone.now()
+    profile_id = f"{now:%Y%m%dT%H%M%S%f}-{secrets.token_hex(4)}"
+    profiler.write(directory / f"{profile_id}{profiler.suffix}")
+    meta = {
+        "id": profile_id,
+        "mode": profiler.mode,
+        "method": request.method,
+        "path": request.get_full_path(),
+        "status": response.status_code,
+        "user": request.user.pk,
+        "ms": round(duration * 1000, 1),
+        "samples": profiler.samples,
+        "created_at": now,
+    }
+    (directory / f"{profile_id}.json").write_bytes(orjson.dumps(meta))
+
+    for path in sorted(directory.glob("*.json"))[: -settings.PROFILE_KEEP]:
+        for old in directory.glob(f"{path.stem}.*"):
+            old.unlink(missing_ok=True)
+    return profile_id
+
+
+def list_profiles():
+    """최근 것부터"""
+    profiles = []
+    for path in sorted(profile_dir().glob("*.json"), reverse=True):
+        try:
+            profiles.append(orjson.loads(path.read_bytes()))
+        except (OSError, orjson.JSONDecodeError):
+            # 지우는 중이거나 쓰는 중인 파일
+            continue
+    return profiles
+
+
+def profile_file(profile_id):
+    if not PROFILE_ID.match(profile_id):
+        return None
+    for profiler in PROFILERS.values():
+        path = profile_dir() / f"{profile_id}{profiler.suffix}"
+        if path.exists():
+            return path, profiler
+    return None
+
+
+class ProfileMixin:
+    """
+    staff가 ?profile= 이나 X-Profile 헤더를 붙인 요청을 프로파일
+
+    staff가 아니면 값이 있어도 무시. 프로파일하는 요청은 응답 캐시를 건너뛰고
+    (core.cache.CachedResponseMixin) render까지 view 안에서 끝냄
+    """
+
+    profiler = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.user.is_staff:
+            mode = requested_mode(request)
+            if mode is not None:
+                self.profiler = PROFILERS[mode]()
+                self.profiler_started = time.perf_counter()
+                self.profiler.start()
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+            if self.profiler is not None:
+                response.render()
+        finally:
+            if self.profiler is not None:
+                self.profiler.stop()
+
+        if self.profiler is not None:
+            duration = time.perf_counter() - self.profiler_started
+            response["X-Profile-Id"] = save(
+                self.profiler, self.request, response, duration
+            )
+        return response
+
+
+# Sampler가 stack을 여기서 자름
+_root_code = ProfileMixin.dispatch.__code__
+
+
+class ProfileListView(APIView):
+    """GET /profiles/ 저장된 프로파일 목록 (staff만)"""
+
+    permission_classes = [IsAdminUser]
+    authentication_classes = [SignedTokenAuthentication, TokenAuthentication]
+
+    def get(self, request):
+        return Response(
+            [
+                {
+                    **profile,
+                    "url": request.build_absolute_uri(
+                        reverse("profile-detail", args=[profile["id"]])
+                    ),
+                }
+                for profile in list_profiles()
+            ]
+        )
+
+
+class ProfileDetailView(APIView):
+    """GET /profiles/<id>/ 결과 파일 내려받기 (staff만)"""
+
+    permission_classes = [IsAdminUser]
+    authentication_classes = [SignedTokenAuthentication, TokenAuthentication]
+
+    def get(self, request, profile_id):
+        found = profile_file(profile_id)
+        if found is None:
+            raise Http404
+        path, profiler = found
+        return FileResponse(
+            open(path, "rb"),
+            as_attachment=True,
+            filename=path.name,
+            content_type=profiler.content_type,
+        )
@@ -0,0 +1,43 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.timing import phase
+
+# JSONRenderer 기본값(COMPACT_JSON, UNICODE_JSON)과 같은 출력. dict key가 숫자인
+# 에러 응답도 있어서 NON_STR_KEYS, aware datetime은 DRF처럼 "Z"로
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+_encoder = JSONEncoder()
+
+
+def default(obj):
+    """orjson이 모르는 타입(Decimal, lazy 문자열, QuerySet 등)은 DRF encoder와 같게"""
+    return _encoder.default(obj)
+
+
+def dumps(data, option=0):
+    return orjson.dumps(data, default=default, option=OPTIONS | option)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer를 orjson으로. datetime, date, time, UUID는 orjson이 C에서 바로
+    처리하고 나머지는 DRF encoder로 넘김
+
+    indent를 요청하면(browsable API, Accept의 indent=) 2칸 indent만 지원
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        option = 0
+        if self.get_indent(accepted_media_type or "", renderer_context or {}):
+            option = orjson.OPT_INDENT_2
+        with phase("render"):
+            ret = dumps(data, option)
+        # JSONRenderer처럼 javascript에 그대로 넣어도 안전하도록
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
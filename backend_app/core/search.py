@@ -0,0 +1,170 @@
+"""
+글 검색용 역색인
+
+MySQL FULLTEXT(ngram parser)는 서버 설정에 따라 동작이 달라지고 sqlite에서는 쓸 수
+없어서 term 테이블을 직접 관리한다. 한글은 형태소 분석 없이 2-gram, 나머지는
+단어 단위로 자른다.
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import router, transaction
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+from django.db.models.signals import post_save
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+
+from core.pagination import SearchPagination
+
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 32
+WORD = re.compile(r"\w+")
+HANGUL = re.compile("[\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3]+")
+
+# model -> (term model, {field: weight})
+_registry = {}
+
+
+def tokenize(text):
+    """'캠핑장 후기 Tent' -> 캠핑, 핑장, 후기, tent"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    for word in WORD.findall(text):
+        start = 0
+        for match in HANGUL.finditer(word):
+            if match.start() > start:
+                yield word[start : match.start()][:MAX_TERM_LENGTH]
+            run = match.group()
+            if len(run) == 1:
+                yield run
+            for i in range(len(run) - 1):
+                yield run[i : i + 2]
+            start = match.end()
+        if start < len(word):
+            yield word[start:][:MAX_TERM_LENGTH]
+
+
+def document_terms(obj, fields):
+    """{term: 가중치 합}. 제목처럼 weight가 큰 필드에 나온 term이 더 높은 점수"""
+    terms = Counter()
+    for field, weight in fields.items():
+        for term in tokenize(getattr(obj, field)):
+            terms[term] += weight
+    return terms
+
+
+def build_terms(term_model, objs, fields):
+    return [
+        term_model(document_id=obj.pk, user_id=obj.user_id, term=term, weight=weight)
+        for obj in objs
+        for term, weight in document_terms(obj, fields).items()
+    ]
+
+
+def reindex(objs, created=False, batch_size=1000):
+    """
+    objs의 term을 지우고 다시 넣음. 등록되지 않은 model이면 아무것도 안함
+
+    created=True면 지울 term이 없으므로 insert만 함
+    """
+    objs = list(objs)
+    if not objs or type(objs[0]) not in _registry:
+        return
+    term_model, fields = _registry[type(objs[0])]
+    terms = build_terms(term_model, objs, fields)
+    # term은 글과 같은 DB(shard)에
+    manager = term_model.objects.db_manager(
+        router.db_for_write(term_model, instance=objs[0])
+    )
+
+    if created:
+        manager.bulk_create(terms, batch_size=batch_size)
+        return
+    with transaction.atomic(using=manager.db, savepoint=False):
+        manager.filter(document_id__in=[obj.pk for obj in objs]).delete()
+        manager.bulk_create(terms, batch_size=batch_size)
+
+
+def register(model, term_model, fields):
+    """
+    model 저장시 fields를 색인
+
+    삭제는 term의 FK cascade로 지워지고, bulk_create, bulk_update는 signal이 없으므로
+    reindex()를 직접 불러야함
+    """
+    _registry[model] = (term_model, fields)
+
+    def handler(sender, instance, created, update_fields=None, **kwargs):
+        if update_fields is not None and not set(update_fields) & set(fields):
+            return
+        reindex([instance], created=created)
+
+    post_save.connect(handler, sender=model, weak=False)
+
+
+def rank(model, user_id, query):
+    """
+    query의 term이 모두 들어있는 user의 글을 점수 순으로
+
+    점수는 term 별 weight * idf 합. 결과는 document_id, score를 가진 values queryset
+    """
+    term_model, _ = _registry[model]
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    queryset = term_model.objects.filter(user_id=user_id, term__in=terms)
+    if not terms:
+        return queryset.none().values("document_id")
+
+    frequencies = dict(
+        queryset.order_by().values_list("term").annotate(count=Count("id"))
+    )
+    if len(frequencies) < len(terms):
+        # 어떤 글에도 없는 term이 있으면 결과 없음
+        return queryset.none().values("document_id")
+
+    total = model.objects.filter(user_id=user_id).count()
+    score = Sum(
+        Case(
+            *[
+                When(term=term, then=F("weight") * Value(math.log(1 + total / count)))
+                for term, count in frequencies.items()
+            ],
+            output_field=FloatField(),
+        )
+    )
+    return (
+        queryset.values("document_id")
+        .annotate(score=score, matched=Count("id"))
+        .filter(matched=len(terms))
+        .order_by("-score", "-document_id")
+    )
+
+
+class SearchMixin:
+    """
+    GET {prefix}/search/?q=... 로 user의 글을 관련도 순으로 검색
+
+    pagination은 점수가 실수라서 keyset 대신 page 번호를 씀
+    """
+
+    search_pagination_class = SearchPagination
+
+    @action(detail=False, methods=["get"])
+    def search(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": ["검색어를 입력해야함"]})
+
+        queryset = self.get_queryset()
+        ranked = rank(queryset.model, request.user.pk, query)
+
+        paginator = self.search_pagination_class()
+        page = paginator.paginate_queryset(ranked, request, view=self)
+        objs = queryset.in_bulk([row["document_id"] for row in page])
+        results = [
+            objs[row["document_id"]] for row in page if row["document_id"] in objs
+        ]
+
+        serializer = self.get_serializer(results, many=True)
+        return paginator.get_paginated_response(serializer.data)
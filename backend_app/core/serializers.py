@@ -0,0 +1,73 @@
+from django.db import router
+
+
+def tag_names(tags):
+    return [tag["name"] for tag in tags]
+
+
+def attach_tags(objs, tag_lists, replace=False):
+    """
+    여러 글의 태그를 한번에 연결
+
+    태그는 user 별로 한번씩 resolve 하고 through 테이블은 bulk_create 한번으로 넣음
+    replace=True면 기존 연결을 먼저 지움. m2m_changed가 없으므로 캐시는 호출한 쪽에서 무효화
+    """
+    pairs = [(obj, tags) for obj, tags in zip(objs, tag_lists) if tags is not None]
+    if not pairs:
+        return
+
+    field = pairs[0][0]._meta.get_field("tags")
+    through = field.remote_field.through
+    src = f"{field.m2m_field_name()}_id"
+    dst = f"{field.m2m_reverse_field_name()}_id"
+
+    names_by_user = {}
+    for obj, tags in pairs:
+        names_by_user.setdefault(obj.user_id, []).extend(tag_names(tags))
+    resolved = {
+        user_id: field.related_model.resolve(user_id, names)
+        for user_id, names in names_by_user.items()
+    }
+
+    rows = {}
+    for obj, tags in pairs:
+        for name in tag_names(tags):
+            tag = resolved[obj.user_id][field.related_model.make_slug(name)]
+            rows[(obj.pk, tag.pk)] = through(**{src: obj.pk, dst: tag.pk})
+
+    # 글과 같은 DB(shard)에
+    manager = through.objects.db_manager(
+        router.db_for_write(through, instance=pairs[0][0])
+    )
+    if replace:
+        manager.filter(**{f"{src}__in": [obj.pk for obj, _ in pairs]}).delete()
+    manager.bulk_create(rows.values(), ignore_conflicts=True)
+    for obj, _ in pairs:
+        getattr(obj, "_prefetched_objects_cache", {}).pop("tags", None)
+
+
+class WritableTagsMixin:
+    """
+    nested tags를 [{"name": ...}] 형태로 받아서 저장
+
+    태그 수와 상관없이 (user, slug) 조회 한번, 새 태그 bulk insert 한번,
+    through 테이블 insert 한번으로 처리
+    """
+
+    def create(self, validated_data):
+        tags = validated_data.pop("tags", None)
+        instance = super().create(validated_data)
+        if tags is not None:
+            instance.tags.add(*self.resolve_tags(instance, tags))
+        return instance
+
+    def update(self, instance, validated_data):
+        tags = validated_data.pop("tags", None)
+        instance = super().update(instance, validated_data)
+        if tags is not None:
+            instance.tags.set(self.resolve_tags(instance, tags))
+        return instance
+
+    def resolve_tags(self, instance, tags):
+        model = instance._meta.get_field("tags").related_model
+        return list(model.resolve(instance.user_id, tag_names(tags)).values())
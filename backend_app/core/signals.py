@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.signals import request_finished
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.db.models import Max
+from django.db.models.signals import post_migrate, post_save, pre_delete
+from django.dispatch import receiver
+
+from core.cache import get_cache
+from core.db.routers import SHARDED_MODELS, home_shard, shard_for, shard_key
+from core.db.sharding import delete_user_rows
+from core.metrics import observe_pools
+from core.timing import install
+
+
+@receiver(post_save, sender=get_user_model())
+def assign_shard(sender, instance, created, raw=False, **kwargs):
+    """sharding 중에 가입한 user는 user_id hash로 shard를 정해서 저장"""
+    if not created or raw or instance.shard or not settings.SHARD_DATABASES:
+        return
+    instance.shard = home_shard(instance.pk)
+    sender.objects.filter(pk=instance.pk).update(shard=instance.shard)
+
+
+@receiver(pre_delete, sender=get_user_model())
+def delete_sharded_rows(sender, instance, using, **kwargs):
+    """user를 지울 때 FK cascade는 user와 같은 DB만 지우므로 shard의 글은 따로"""
+    if not settings.SHARD_DATABASES:
+        return
+    shard = shard_for(instance.pk)
+    if shard != using:
+        delete_user_rows(instance.pk, shard)
+    get_cache().delete(shard_key(instance.pk))
+
+
+@receiver(post_migrate)
+def raise_shard_auto_increment(sender, using, **kwargs):
+    """
+    shard의 auto increment를 default의 최대 id 위로 올림 (MySQL)
+
+    shard DB마다 offset이 달라서(settings.SHARD_ID_STEP) 새 id는 안 겹치지만,
+    sharding 전에 default에 쌓인 id는 offset과 상관없이 1부터라서 새 shard가 1부터
+    세면 나중에 옮겨올 글과 겹침. 이미 더 크면 그대로 둠
+    """
+    if sender.name != "core" or using == DEFAULT_DB_ALIAS:
+        return
+    connection = connections[using]
+    if using not in settings.SHARD_DATABASES or connection.vendor != "mysql":
+        return
+
+    for model in sender.get_models(include_auto_created=True):
+        if model._meta.label_lower not in SHARDED_MODELS:
+            continue
+        table = model._meta.db_table
+        last = model._default_manager.using(DEFAULT_DB_ALIAS).aggregate(last=Max("pk"))[
+            "last"
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT AUTO_INCREMENT FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [table],
+            )
+            current = (cursor.fetchone() or [None])[0] or 1
+            if last is not None and current <= last:
+                cursor.execute(
+                    f"ALTER TABLE {connection.ops.quote_name(table)} "
+                    f"AUTO_INCREMENT = {last + 1}"
+                )
+
+
+@receiver(connection_created)
+def install_query_timing(sender, connection, **kwargs):
+    """요청 중 SQL 수, 시간을 재도록 (core.timing)"""
+    install(connection)
+
+
+@receiver(request_finished)
+def record_pool_stats(sender, **kwargs):
+    """요청 연결을 pool에 돌려준 뒤(close_old_connections 다음)의 pool 상태"""
+    observe_pools()
@@ -0,0 +1,117 @@
+"""
+?fields=, ?exclude= 로 응답 필드 고르기
+
+    GET /blog/?fields=id,title,updated_at
+    GET /camping/?exclude=review,tags
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.utils.functional import cached_property
+from rest_framework.exceptions import ValidationError
+
+from core.pagination import ordering_columns
+
+
+def parse_fields(params, names):
+    """query parameter로 고른 필드 (names 순서). 둘 다 없으면 None"""
+    if "fields" not in params and "exclude" not in params:
+        return None
+
+    selected = list(names)
+    for param in ["fields", "exclude"]:
+        if param not in params:
+            continue
+        values = {value.strip() for value in params[param].split(",") if value.strip()}
+        unknown = values - set(names)
+        if unknown:
+            raise ValidationError({param: [f"없는 필드: {', '.join(sorted(unknown))}"]})
+        keep = param == "fields"
+        selected = [name for name in selected if (name in values) == keep]
+    return tuple(selected)
+
+
+def prefetch_root(lookup):
+    if isinstance(lookup, Prefetch):
+        lookup = lookup.prefetch_through
+    return lookup.split("__")[0]
+
+
+def sparse_queryset(queryset, fields, extra=()):
+    """
+    고른 필드의 컬럼만 only()로 읽고, 고르지 않은 관계는 prefetch,
+    select_related를 뺌. model 필드가 아닌 출력 필드가 있으면 only()는 하지 않음
+    """
+    opts = queryset.model._meta
+    columns = {opts.pk.name, *extra}
+    relations = set()
+    exact = True
+    for name in fields:
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            exact = False
+            continue
+        if field.many_to_many or field.one_to_many:
+            relations.add(name)
+        elif field.concrete:
+            columns.add(name)
+            if field.is_relation:
+                relations.add(name)
+
+    lookups = [
+        lookup
+        for lookup in queryset._prefetch_related_lookups
+        if prefetch_root(lookup) in relations
+    ]
+    queryset = queryset.prefetch_related(None).prefetch_related(*lookups)
+
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        keep = [name for name in select_related if name in relations]
+        queryset = queryset.select_related(None)
+        if keep:
+            queryset = queryset.select_related(*keep)
+
+    if exact:
+        queryset = queryset.only(*columns)
+    return queryset
+
+
+class SparseFieldsMixin:
+    """
+    list, retrieve에서 ?fields=a,b 나 ?exclude=c 로 고른 필드만 직렬화
+
+    queryset도 그 컬럼만 읽고(only) 고르지 않은 태그, user는 prefetch 하지 않음.
+    core.compiled plan도 고른 필드로 만듦
+    """
+
+    sparse_actions = ("list", "retrieve")
+
+    @cached_property
+    def sparse_fields(self):
+        if self.action not in self.sparse_actions:
+            return None
+        names = [
+            name
+            for name, field in self.get_serializer_class()().fields.items()
+            if not field.write_only
+        ]
+        return parse_fields(self.request.query_params, names)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.sparse_fields is not None:
+            fields = getattr(serializer, "child", serializer).fields
+            for name in list(fields):
+                if name not in self.sparse_fields:
+                    del fields[name]
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.sparse_fields is None:
+            return queryset
+        return sparse_queryset(
+            queryset, self.sparse_fields, ordering_columns(self.paginator)
+        )
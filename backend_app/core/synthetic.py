@@ -0,0 +1,309 @@
+"""
+페이지네이션, 인덱스, 캐시를 실제에 가까운 양으로 시험하기 위한 가짜 데이터
+(manage.py generate_data)
+
+- user마다 활동량을 Pareto 분포로 뽑아서 소수 user가 글 대부분을 씀
+- 태그는 전체 인기 순위(Zipf)에서 user마다 몇개를 골라두고, 글마다 그 중에서
+  자주 쓰는 것을 다시 씀
+- 본문은 Zipf 빈도의 한글 단어 문장. created_at은 최근 days일 안에 퍼짐
+
+user i의 데이터는 (seed, i)로만 정해져서 worker 수와 상관없이 같음. 모든 insert는
+bulk_create라서 signal이 없음. 캐시는 새 user뿐이라 무효화할 게 없고 검색 색인은
+index=True일 때만 reindex()로 넣음
+"""
+
+import math
+import random
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+
+from core.db.routers import home_shard
+from core.db.sharding import families
+from core.search import reindex
+
+PASSWORD = "test123!@#"
+
+WORDS = (
+    "캠핑 캠핑장 텐트 타프 화로대 장작 불멍 바베큐 오토캠핑 글램핑 차박 계곡 바다 "
+    "숲속 별 사이트 전기 개수대 샤워장 매너타임 주차장 예약 입실 퇴실 가족 아이들 "
+    "강아지 날씨 비 바람 새벽 아침 저녁 커피 라면 고기 삼겹살 조용한 깨끗한 넓은 "
+    "추천 주말 여행 준비물 장비 의자 테이블 랜턴 침낭 매트 난로 전기장판 모기 "
+    "그늘 잔디 파쇄석 데크 관리동 편의점 마트 산책로 물놀이 수영장 놀이터 "
+    "사장님 친절 가격 가성비 뷰 노을 일출 은하수 캠프파이어 코펠 버너 가스 "
+    "아이스박스 얼음 맥주 와인 불꽃놀이 해먹 자전거 낚시 등산 드라이브 휴양림 "
+    "계절 봄 여름 가을 겨울 단풍 벚꽃 눈 추위 더위 습도 이슬 결로 바닥 경사 "
+    "화장실 온수 분리수거 소음 옆사이트 거리 입구 체크인 후기 재방문 처음 "
+    "오랜만에 드디어 역시 정말 너무 조금 많이 다시 꼭 같이 혼자 둘이서"
+).split()
+
+ENDINGS = [
+    "좋았어요.",
+    "추천합니다.",
+    "다시 가고 싶어요.",
+    "아쉬웠어요.",
+    "괜찮았습니다.",
+    "최고였어요!",
+    "만족합니다.",
+    "참고하세요.",
+    "기억에 남아요.",
+    "준비하면 좋아요.",
+]
+
+TITLE_ENDINGS = ["후기", "다녀왔어요", "기록", "추천", "솔직 후기", "1박 2일", ""]
+
+TAG_NAMES = (
+    "캠핑 오토캠핑 글램핑 차박 솔로캠핑 가족캠핑 애견동반 노지캠핑 백패킹 "
+    "동계캠핑 하계캠핑 계곡캠핑 바다캠핑 숲캠핑 캠핑요리 캠핑장비 텐트 타프 "
+    "불멍 바베큐 캠핑장추천 경기도 강원도 충청도 전라도 경상도 제주도 가평 "
+    "양평 포천 홍천 태안 서해 동해 남해 주말여행 당일치기 1박2일 2박3일 "
+    "아이와함께 커플 친구 혼캠 감성캠핑 미니멀캠핑 캠린이 초보 장박 휴양림 "
+    "국립공원 야영장 사이트추천 뷰맛집 별보기 은하수 일출 노을 단풍 벚꽃 "
+    "여름휴가 겨울캠핑 전기사용 화로대 랜턴 의자 테이블 침낭 난로 맛집 "
+    "카페 산책 낚시 등산 물놀이 수영장 키즈 반려견 리뷰 일기 기록"
+).split()
+
+
+def zipf_cum_weights(n, s=1.0):
+    """rank가 낮을수록 자주 나오는 누적 weight (random.choices의 cum_weights)"""
+    return list(accumulate(1 / (rank + 1) ** s for rank in range(n)))
+
+
+WORD_WEIGHTS = zipf_cum_weights(len(WORDS))
+TAG_WEIGHTS = zipf_cum_weights(len(TAG_NAMES))
+
+
+def user_random(seed, index):
+    return random.Random(f"{seed}:{index}")
+
+
+def email_for(seed, index):
+    return f"gen{seed}-{index}@example.com"
+
+
+def distribute(total, weights):
+    """total을 weights 비율로 나눈 정수 목록 (합이 정확히 total, largest remainder)"""
+    scale = sum(weights) or 1
+    shares = [total * weight / scale for weight in weights]
+    counts = [int(share) for share in shares]
+    remainders = sorted(range(len(shares)), key=lambda i: counts[i] - shares[i])
+    for i in remainders[: total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def plan(seed, users, blogs, campings, skew=1.2):
+    """
+    user별 (블로그 수, 캠핑 수). 활동량은 Pareto(skew)라서 skew가 작을수록
+    소수에게 몰림. 블로그, 캠핑 모두 같은 활동량을 따름
+    """
+    weights = [user_random(seed, i).paretovariate(skew) for i in range(users)]
+    return list(zip(distribute(blogs, weights), distribute(campings, weights)))
+
+
+def paragraph(rng, mean_sentences):
+    """
+    문장 수는 평균 mean_sentences인 lognormal, 문장마다 단어 3~10개와 끝맺음
+
+    글 수만큼 불리는 곳이라 단어를 한번에 뽑아서 자름
+    """
+    count = max(1, int(rng.lognormvariate(math.log(mean_sentences), 0.6)))
+    lengths = [3 + int(rng.random() * 8) for _ in range(count)]
+    words = rng.choices(WORDS, cum_weights=WORD_WEIGHTS, k=sum(lengths))
+    sentences, start = [], 0
+    for length, ending in zip(lengths, rng.choices(ENDINGS, k=count)):
+        sentences.append(" ".join([*words[start : start + length], ending]))
+        start += length
+    return " ".join(sentences)
+
+
+def title(rng):
+    words = rng.choices(WORDS, cum_weights=WORD_WEIGHTS, k=rng.randint(2, 5))
+    return " ".join([*words, rng.choice(TITLE_ENDINGS)]).strip()
+
+
+def vocabulary(rng, mean_tags):
+    """user가 쓰는 태그 이름. 인기 태그일수록 많은 user가 고름"""
+    size = max(1, min(len(TAG_NAMES) // 2, int(rng.expovariate(1 / mean_tags)) + 1))
+    names = []
+    while len(names) < size:
+        names += rng.choices(TAG_NAMES, cum_weights=TAG_WEIGHTS, k=size)
+        names = list(dict.fromkeys(names))
+    return names[:size]
+
+
+def pick_tags(rng, names, weights):
+    """글 하나의 태그. user 안에서도 앞쪽(자주 쓰는) 태그가 많이 나옴"""
+    count = min(len(names), rng.choice([0, 1, 1, 2, 2, 3, 4, 5]))
+    return set(rng.choices(names, cum_weights=weights, k=count))
+
+
+@contextmanager
+def keep_timestamps(*models):
+    """bulk_create가 auto_now, auto_now_add로 덮어쓰지 않고 넣은 값을 쓰도록"""
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def fill_pks(model, objs, using, **filters):
+    """
+    RETURNING이 안 되는 DB(MySQL)는 bulk_create 뒤에 pk가 비어있어서, 새 user 것만
+    다시 읽어서 넣은 순서대로 채움 (insert 하나 안의 auto increment는 순서대로 증가)
+    """
+    if not objs or objs[-1].pk is not None:
+        return
+    pks = (
+        model.objects.using(using)
+        .filter(**filters)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    for obj, pk in zip(objs, pks):
+        obj.pk = pk
+
+
+class Generator:
+    """
+    user 구간 하나를 만듦. worker process마다 하나씩 쓰고 결과는 모델별 row 수
+
+    options: seed, days, tags(user별 평균 태그 종류), batch_size, index
+    """
+
+    def __init__(self, seed, days=365, tags=8, batch_size=2000, index=False):
+        self.seed = seed
+        self.days = days
+        self.tags = tags
+        self.batch_size = batch_size
+        self.index = index
+        self.now = timezone.now()
+        self.password = make_password(PASSWORD)
+
+    def run(self, start, counts):
+        """user start부터 len(counts)명. counts는 plan()의 구간"""
+        User = get_user_model()
+        rows = Counter()
+        rngs = [user_random(self.seed, start + i) for i in range(len(counts))]
+
+        users = [
+            User(
+                email=email_for(self.seed, start + i),
+                name=f"user{start + i}",
+                password=self.password,
+            )
+            for i in range(len(counts))
+        ]
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            User.objects.bulk_create(users, batch_size=self.batch_size)
+        fill_pks(
+            User, users, DEFAULT_DB_ALIAS, email__in=[user.email for user in users]
+        )
+        rows[User._meta.label] += len(users)
+
+        shards = self.assign_shards(users)
+        for family_index, (post_model, tag_model, _) in enumerate(families()):
+            for alias, members in shards.items():
+                plans = [(users[i], rngs[i], counts[i][family_index]) for i in members]
+                with keep_timestamps(post_model), transaction.atomic(using=alias):
+                    rows += self.family(post_model, tag_model, alias, plans)
+        return rows
+
+    def assign_shards(self, users):
+        """{alias: [users index]}. sharding 중이면 signals.assign_shard처럼 hash로"""
+        if not settings.SHARD_DATABASES:
+            return {DEFAULT_DB_ALIAS: list(range(len(users)))}
+        shards = {}
+        for i, user in enumerate(users):
+            user.shard = home_shard(user.pk)
+            shards.setdefault(user.shard, []).append(i)
+        get_user_model().objects.bulk_update(
+            users, ["shard"], batch_size=self.batch_size
+        )
+        return shards
+
+    def family(self, post_model, tag_model, alias, plans):
+        rows = Counter()
+        text_field = post_model.summary_field
+        tags, posts, tag_lists = [], [], []
+        for user, rng, count in plans:
+            names = vocabulary(rng, self.tags) if count else []
+            weights = zipf_cum_weights(len(names), 1.2)
+            user_tags = {}
+            for name in names:
+                tag = tag_model(
+                    user_id=user.pk, name=name, slug=tag_model.make_slug(name)
+                )
+                user_tags[name] = tag
+                tags.append(tag)
+
+            for _ in range(count):
+                created_at = self.now - timedelta(
+                    seconds=rng.uniform(0, self.days * 86400)
+                )
+                updated_at = created_at
+                if rng.random() < 0.2:
+                    # 일부는 나중에 수정된 글
+                    updated_at = min(
+                        self.now, created_at + timedelta(days=rng.expovariate(1 / 7))
+                    )
+                post = post_model(
+                    user_id=user.pk,
+                    title=title(rng),
+                    created_at=created_at,
+                    updated_at=updated_at,
+                    **{
+                        text_field: paragraph(rng, 12 if text_field == "content" else 5)
+                    },
+                )
+                post.update_summary()
+                posts.append(post)
+                tag_lists.append(
+                    [user_tags[name] for name in pick_tags(rng, names, weights)]
+                )
+
+        user_ids = [user.pk for user, _, _ in plans]
+        tag_model.objects.using(alias).bulk_create(tags, batch_size=self.batch_size)
+        fill_pks(tag_model, tags, alias, user_id__in=user_ids)
+        post_model.objects.using(alias).bulk_create(posts, batch_size=self.batch_size)
+        fill_pks(post_model, posts, alias, user_id__in=user_ids)
+
+        field = post_model._meta.get_field("tags")
+        through = field.remote_field.through
+        src = f"{field.m2m_field_name()}_id"
+        dst = f"{field.m2m_reverse_field_name()}_id"
+        links = [
+            through(**{src: post.pk, dst: tag.pk})
+            for post, post_tags in zip(posts, tag_lists)
+            for tag in post_tags
+        ]
+        through.objects.using(alias).bulk_create(links, batch_size=self.batch_size)
+
+        rows[tag_model._meta.label] += len(tags)
+        rows[post_model._meta.label] += len(posts)
+        rows[through._meta.label] += len(links)
+        if self.index:
+            for start in range(0, len(posts), self.batch_size):
+                reindex(
+                    posts[start : start + self.batch_size],
+                    created=True,
+                    batch_size=self.batch_size,
+                )
+        return rows
@@ -0,0 +1,221 @@
+"""
+Test per-user response cache
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.checks import run_checks
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blog.views import BlogAPIView
+from core.models import Blog, BlogTag, Camping, CampingTag
+from core.tests.utils import shared_api_cache
+
+BLOG_URL = reverse("blog:blog-list")
+TAG_URL = reverse("blog:blogtag-list")
+CAMPING_URL = reverse("camping:camping-list")
+
+
+def create_user(**kwargs):
+    email = kwargs.pop("email", "user@example.com")
+    password = kwargs.pop("password", "test123!@#")
+    return get_user_model().objects.create_user(email, password, **kwargs)
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url):
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res
+
+    def test_second_request_served_from_cache(self):
+        """같은 요청은 DB 조회 없이 캐시에서 응답"""
+        blog = Blog.objects.create(user=self.user, title="t", content="c")
+        for url in [BLOG_URL, reverse("blog:blog-detail", args=[blog.id])]:
+            first = self.get(url)
+            with self.assertNumQueries(0):
+                second = self.get(url)
+            self.assertEqual(first.data, second.data)
+
+    def test_cache_keyed_by_query(self):
+        """쿼리스트링이 다르면 다른 캐시"""
+        Blog.objects.create(user=self.user, title="t1", content="c")
+        Blog.objects.create(user=self.user, title="t2", content="c")
+        self.get(BLOG_URL)
+
+        res = self.get(f"{BLOG_URL}?page_size=1")
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_cache_keyed_by_host_and_scheme(self):
+        """페이지 링크의 host, scheme은 요청마다 그 요청의 것"""
+        Blog.objects.create(user=self.user, title="t1", content="c")
+        Blog.objects.create(user=self.user, title="t2", content="c")
+        url = f"{BLOG_URL}?page_size=1"
+        self.client.get(url, HTTP_HOST="internal:8000")
+
+        res = self.client.get(url, HTTP_HOST="api.example.com", secure=True)
+        self.assertTrue(res.data["next"].startswith("https://api.example.com/"))
+
+    def test_cache_keyed_by_user(self):
+        """다른 유저에게 캐시된 응답이 보이면 안됨"""
+        Blog.objects.create(user=self.user, title="t", content="c")
+        self.get(BLOG_URL)
+
+        other_user = create_user(email="other@example.com")
+        self.client.force_authenticate(other_user)
+        res = self.get(BLOG_URL)
+        self.assertEqual(res.data["results"], [])
+
+    def test_save_and_delete_invalidate(self):
+        """저장, 삭제시 캐시 무효화"""
+        blog = Blog.objects.create(user=self.user, title="t", content="c")
+        self.get(BLOG_URL)
+
+        blog.title = "new title"
+        blog.save()
+        res = self.get(BLOG_URL)
+        self.assertEqual(res.data["results"][0]["title"], "new title")
+
+        blog.delete()
+        res = self.get(BLOG_URL)
+        self.assertEqual(res.data["results"], [])
+
+    def test_api_update_invalidates(self):
+        """API로 수정하면 바로 다음 조회에 반영"""
+        camping = Camping.objects.create(user=self.user, title="t", review="r")
+        url = reverse("camping:camping-detail", args=[camping.id])
+        self.get(url)
+
+        self.client.patch(url, dict(review="new review"))
+        self.assertEqual(self.get(url).data["review"], "new review")
+
+    def test_m2m_and_tag_changes_invalidate(self):
+        """태그 추가, 태그 이름 변경시 캐시 무효화"""
+        camping = Camping.objects.create(user=self.user, title="t", review="r")
+        self.get(CAMPING_URL)
+
+        tag = CampingTag.objects.create(user=self.user, name="tag")
+        camping.tags.add(tag)
+        res = self.get(CAMPING_URL)
+        self.assertEqual(res.data["results"][0]["tags"][0]["name"], "tag")
+
+        tag.name = "new tag"
+        tag.save()
+        res = self.get(CAMPING_URL)
+        self.assertEqual(res.data["results"][0]["tags"][0]["name"], "new tag")
+
+        tag.camping.remove(camping)
+        res = self.get(CAMPING_URL)
+        self.assertEqual(res.data["results"][0]["tags"], [])
+
+    def test_tag_list_invalidates(self):
+        """블로그 태그 생성시 태그 리스트 캐시 무효화"""
+        self.get(TAG_URL)
+        BlogTag.objects.create(user=self.user, name="tag")
+        self.assertEqual(len(self.get(TAG_URL).data), 1)
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.blog = Blog.objects.create(user=self.user, title="t", content="c")
+        self.camping = Camping.objects.create(user=self.user, title="t", review="r")
+
+    def test_etag_returns_not_modified(self):
+        """ETag가 같으면 DB 조회, 직렬화 없이 304"""
+        urls = [
+            BLOG_URL,
+            reverse("blog:blog-detail", args=[self.blog.id]),
+            CAMPING_URL,
+            reverse("camping:camping-detail", args=[self.camping.id]),
+        ]
+        for url in urls:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertIn("Last-Modified", res)
+
+            with self.assertNumQueries(0):
+                res = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+            self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_changes_after_write(self):
+        """수정, 태그 변경 후에는 새 ETag로 200"""
+        url = reverse("camping:camping-detail", args=[self.camping.id])
+        etag = self.client.get(url)["ETag"]
+
+        self.camping.tags.add(CampingTag.objects.create(user=self.user, name="tag"))
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+        etag = res["ETag"]
+        Blog.objects.create(user=self.user, title="t2", content="c")
+        res = self.client.get(BLOG_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_if_modified_since(self):
+        """Last-Modified 이후 변경이 없으면 304, 이전 시간이면 200"""
+        res = self.client.get(BLOG_URL)
+
+        res = self.client.get(BLOG_URL, HTTP_IF_MODIFIED_SINCE=res["Last-Modified"])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        res = self.client.get(
+            BLOG_URL, HTTP_IF_MODIFIED_SINCE="Mon, 01 Jan 2001 00:00:00 GMT"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_etag_per_user(self):
+        """다른 유저는 같은 ETag를 보내도 200"""
+        etag = self.client.get(BLOG_URL)["ETag"]
+
+        self.client.force_authenticate(create_user(email="other@example.com"))
+        res = self.client.get(BLOG_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @override_settings(DEBUG=False, BROWSABLE_API_STAFF_ONLY=True)
+    def test_etag_per_representation(self):
+        """같은 URL이라도 HTML, JSON은 다른 ETag. 고른 필드도 ETag에 들어감"""
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.get(BLOG_URL)
+        self.assertIn("Accept", res["Vary"])
+        etag = res["ETag"]
+
+        res = self.client.get(
+            BLOG_URL, HTTP_ACCEPT="text/html", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["Content-Type"].startswith("text/html"))
+        self.assertNotEqual(res["ETag"], etag)
+
+        request = res.renderer_context["request"]
+        etags = {
+            BlogAPIView(sparse_fields=fields).make_validators(request, None, 1)[0]
+            for fields in [None, ("id",), ("id", "title")]
+        }
+        self.assertEqual(len(etags), 3)
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    def errors(self):
+        return [error.id for error in run_checks() if error.id.startswith("core.")]
+
+    @override_settings(WEB_CONCURRENCY=2)
+    def test_many_workers_need_shared_cache(self):
+        """worker가 여러개면 process마다 따로인 캐시로는 check가 실패함"""
+        self.assertEqual(self.errors(), ["core.E001"])
+        with shared_api_cache():
+            self.assertEqual(self.errors(), [])
+
+    def test_single_worker(self):
+        self.assertEqual(self.errors(), [])
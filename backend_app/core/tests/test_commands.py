@@ -0,0 +1,223 @@
+"""
+Test management commands
+"""
+
+import json
+import os
+import tempfile
+from contextlib import redirect_stderr
+from io import StringIO
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command, load_command_class
+from django.db import connection, connections
+from django.db.models import Count
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from core.models import Blog, BlogTag, Camping, CampingTag
+from core.search import rank
+from core.synthetic import plan
+from core.tests.utils import shared_api_cache
+
+
+def create_user(**kwargs):
+    email = kwargs.pop("email", "user@example.com")
+    password = kwargs.pop("password", "test123!@#")
+    return get_user_model().objects.create_user(email, password, **kwargs)
+
+
+class ImportPostsCommandTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+
+    def write_file(self, lines, suffix=".jsonl"):
+        file = tempfile.NamedTemporaryFile("w", suffix=suffix, delete=False)
+        with file:
+            file.write("\n".join(lines))
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    def run_from_argv(self, name, argv):
+        """manage.py 처럼 실행. 끝나고 DB 연결을 닫으면 test transaction이 깨지므로 둠"""
+        command = load_command_class("core", name)
+        command.stdout = StringIO()
+        with patch.object(connections, "close_all"):
+            command.run_from_argv(argv)
+
+    def test_import_camping_in_batches(self):
+        """batch 마다 진행상황을 출력하고 전체를 저장"""
+        path = self.write_file(
+            json.dumps(dict(title=f"t{i}", review="r", tags=[dict(name=f"tag{i % 3}")]))
+            for i in range(250)
+        )
+        out = StringIO()
+
+        call_command(
+            "import_posts",
+            "camping",
+            self.user.email,
+            path,
+            "--batch-size=100",
+            stdout=out,
+        )
+
+        self.assertEqual(out.getvalue().count("created"), 3)
+        self.assertIn("250개 저장, 0개 실패", out.getvalue())
+        self.assertEqual(Camping.objects.filter(user=self.user).count(), 250)
+        self.assertEqual(CampingTag.objects.filter(user=self.user).count(), 3)
+
+    def test_import_unknown_user_raise_error(self):
+        path = self.write_file([])
+        with self.assertRaises(CommandError):
+            call_command("import_posts", "blog", "nobody@example.com", path)
+
+    def test_command_line_warns_without_shared_cache(self):
+        """manage.py로 따로 돌려도 LocMemCache면 경고만 하고 저장"""
+        path = self.write_file([json.dumps(dict(title="t", content="c"))])
+        argv = ["manage.py", "import_posts", "blog", self.user.email, path]
+
+        err = StringIO()
+        with redirect_stderr(err):
+            self.run_from_argv("import_posts", argv)
+        self.assertIn("LocMemCache", err.getvalue())
+        self.assertEqual(Blog.objects.filter(user=self.user).count(), 1)
+
+    def test_command_line_requires_shared_cache(self):
+        """서버가 꼭 봐야하는 command(rebalance_shards)는 LocMemCache면 거부"""
+        argv = ["manage.py", "rebalance_shards", self.user.email]
+
+        err = StringIO()
+        with redirect_stderr(err), self.assertRaises(SystemExit):
+            self.run_from_argv("rebalance_shards", argv)
+        self.assertIn("LocMemCache", err.getvalue())
+
+        with shared_api_cache(), redirect_stderr(err), self.assertRaises(SystemExit):
+            self.run_from_argv("rebalance_shards", argv)
+        self.assertIn("SHARD_DATABASES", err.getvalue())
+
+
+class GenerateDataCommandTest(TestCase):
+    def generate(self, *args):
+        out = StringIO()
+        call_command(
+            "generate_data",
+            "--users=40",
+            "--blogs=400",
+            "--campings=200",
+            "--chunk=100",
+            *args,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_generate(self):
+        """요청한 수만큼 만들고 글 수는 user마다 치우치고 태그는 여러 글이 같이 씀"""
+        out = self.generate("--seed=1")
+
+        self.assertIn("users 40/40", out)
+        self.assertEqual(get_user_model().objects.count(), 40)
+        self.assertEqual(Blog.objects.count(), 400)
+        self.assertEqual(Camping.objects.count(), 200)
+
+        counts = sorted(
+            Blog.objects.values("user")
+            .annotate(n=Count("id"))
+            .values_list("n", flat=True)
+        )
+        self.assertGreater(counts[-1], 400 / 40 * 3)
+        self.assertGreater(
+            BlogTag.blog.through.objects.count(), BlogTag.objects.count()
+        )
+
+        blog = Blog.objects.order_by("id").first()
+        self.assertRegex(blog.content, "[가-힣]")
+        self.assertEqual(blog.word_count, len(blog.content.split()))
+        self.assertGreater(Blog.objects.values("created_at").distinct().count(), 390)
+        user = get_user_model().objects.get(email="gen1-0@example.com")
+        self.assertTrue(user.check_password("test123!@#"))
+
+    def test_same_seed_same_data(self):
+        """같은 seed면 작업을 어떻게 나눠도 같은 데이터. 이미 만든 seed는 에러"""
+        self.generate("--seed=2", "--chunk=1")
+        first = list(Blog.objects.order_by("id").values_list("user__email", "title"))
+        with self.assertRaises(CommandError):
+            self.generate("--seed=2")
+
+        get_user_model().objects.all().delete()
+        self.generate("--seed=2", "--chunk=100000")
+        second = list(Blog.objects.order_by("id").values_list("user__email", "title"))
+        self.assertEqual(sorted(first), sorted(second))
+
+    def test_search_index(self):
+        """--index면 만든 글이 만든 user의 검색에 나옴"""
+        self.generate("--seed=3", "--index")
+
+        for model in (Blog, Camping):
+            post = model.objects.order_by("id").first()
+            word = post.title.split()[0]
+            found = [row["document_id"] for row in rank(model, post.user_id, word)]
+            self.assertIn(post.pk, found)
+
+    def test_without_returning(self):
+        """bulk_create가 pk를 못 돌려주는 DB(MySQL)도 fill_pks로 같은 데이터"""
+        self.generate("--seed=5")
+        first = self.snapshot()
+
+        get_user_model().objects.all().delete()
+        features = type(connection.features)
+        with patch.object(features, "can_return_rows_from_bulk_insert", False):
+            self.generate("--seed=5")
+        self.assertEqual(self.snapshot(), first)
+
+    def snapshot(self):
+        """(email, 제목, [(같은 user 태그인지, 태그 이름)]). id는 다시 만들면 바뀌므로 빼고"""
+        return sorted(
+            (
+                blog.user.email,
+                blog.title,
+                sorted(
+                    (tag.user_id == blog.user_id, tag.name) for tag in blog.tags.all()
+                ),
+            )
+            for blog in Blog.objects.select_related("user").prefetch_related("tags")
+        )
+
+
+@skipUnless("shard1" in settings.DATABASES, "shard DB가 설정되지 않음")
+@override_settings(SHARD_DATABASES=["default", "shard1"])
+class GenerateDataWorkersTest(TransactionTestCase):
+    # worker process는 DB 연결을 새로 여므로 transaction으로 감싸지 않음
+    databases = {"default", "shard1"}
+
+    def test_workers(self):
+        """--workers>1이면 fork한 worker들이 나눠서 user마다 그 user의 shard에 만듦"""
+        out = StringIO()
+        call_command(
+            "generate_data",
+            "--users=40",
+            "--blogs=400",
+            "--campings=200",
+            "--chunk=100",
+            "--seed=6",
+            "--workers=2",
+            stdout=out,
+        )
+        self.assertIn("users 40/40", out.getvalue())
+
+        counts = plan(6, 40, 400, 200)
+        users = get_user_model().objects.filter(email__startswith="gen6-")
+        self.assertEqual(users.count(), 40)
+        self.assertEqual({user.shard for user in users}, {"default", "shard1"})
+        for user in users:
+            index = int(user.email.split("-")[1].split("@")[0])
+            for model, expected in zip([Blog, Camping], counts[index]):
+                for alias in settings.SHARD_DATABASES:
+                    rows = model.objects.using(alias).filter(user_id=user.pk).count()
+                    self.assertEqual(rows, expected if alias == user.shard else 0)
+        self.assertEqual(
+            sum(Blog.objects.using(alias).count() for alias in ["default", "shard1"]),
+            400,
+        )
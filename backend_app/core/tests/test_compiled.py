@@ -0,0 +1,139 @@
+"""
+Test compiled read-only serializers
+
+plan으로 만든 출력이 기존 serializer 출력과 같은지 비교
+"""
+
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from blog.serializers import BlogOutSerializer, TagOutSerializer
+from blog.views import BlogAPIView, BlogTagApiView
+from camping.serializers import CampingOutSerializer
+from camping.views import CampingViewSet
+from core.compiled import compile_serializer
+from core.models import Blog, BlogTag, Camping, CampingTag
+from core.renderers import ORJSONRenderer
+
+
+def create_user(**kwargs):
+    email = kwargs.pop("email", "user@example.com")
+    password = kwargs.pop("password", "test123!@#")
+    return get_user_model().objects.create_user(email, password, **kwargs)
+
+
+class CompiledSerializerTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.user.groups.add(Group.objects.create(name="writer"))
+        other_user = create_user(email="other@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        for user in [self.user, other_user]:
+            blog_tags = [
+                BlogTag.objects.create(user=user, name=f"태그{i}") for i in range(3)
+            ]
+            camping_tags = [
+                CampingTag.objects.create(user=user, name=f"태그{i}") for i in range(2)
+            ]
+            for i in range(5):
+                blog = Blog.objects.create(user=user, title=f"t{i}", content="c")
+                blog.tags.set(blog_tags[: i % 4])
+                camping = Camping.objects.create(user=user, title=f"t{i}", review="r")
+                camping.tags.set(camping_tags[: i % 3])
+
+    def assertSameOutput(self, serializer_class, queryset, prefetch):
+        plan = compile_serializer(serializer_class)
+        expected = serializer_class(
+            queryset.prefetch_related(*prefetch), many=True
+        ).data
+        renderer = ORJSONRenderer()
+        for join in [True, False]:
+            with self.subTest(join=join):
+                data = plan.build(plan.values(queryset), join=join)
+                self.assertEqual(renderer.render(data), renderer.render(expected))
+
+    def test_blog_output(self):
+        """글 목록 (태그, 태그 user, user groups) 출력이 serializer와 같음"""
+        self.assertSameOutput(
+            BlogOutSerializer,
+            Blog.objects.order_by("pk"),
+            ["tags__user__groups", "tags__user__user_permissions"],
+        )
+
+    def test_camping_output(self):
+        """캠핑 목록 (user, 태그) 출력이 serializer와 같음"""
+        self.assertSameOutput(
+            CampingOutSerializer,
+            Camping.objects.order_by("pk"),
+            ["tags", "user__groups", "user__user_permissions"],
+        )
+
+    def test_tag_output(self):
+        """태그 목록 출력이 serializer와 같음"""
+        self.assertSameOutput(
+            TagOutSerializer,
+            BlogTag.objects.order_by("pk"),
+            ["user__groups", "user__user_permissions"],
+        )
+
+    def test_not_compilable(self):
+        """plan으로 옮길 수 없는 field가 있으면 None"""
+
+        class MethodSerializer(serializers.ModelSerializer):
+            length = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Blog
+                fields = ["id", "length"]
+
+            def get_length(self, obj):
+                return len(obj.title)
+
+        self.assertIsNone(compile_serializer(MethodSerializer))
+
+    def get(self, url):
+        caches[settings.API_CACHE_ALIAS].clear()
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return res
+
+    def assertSameResponses(self, view, url):
+        """compiled_list를 켜고 끈 응답이 다음 페이지까지 같음"""
+        while url:
+            res = self.get(url)
+            with patch.object(view, "compiled_list", False):
+                expected = self.get(url)
+            self.assertEqual(res.content, expected.content)
+            url = res.data.get("next") if isinstance(res.data, dict) else None
+
+    def test_list_endpoints(self):
+        """blog, camping, 태그 리스트 응답이 같음"""
+        self.assertSameResponses(
+            BlogAPIView, reverse("blog:blog-list") + "?page_size=2"
+        )
+        self.assertSameResponses(
+            CampingViewSet, reverse("camping:camping-list") + "?page_size=2"
+        )
+        self.assertSameResponses(BlogTagApiView, reverse("blog:blogtag-list"))
+
+    def test_export(self):
+        """export 출력이 같음"""
+        url = reverse("blog:blog-export")
+        res = self.client.get(url)
+        with patch.object(BlogAPIView, "export_chunk_size", 2):
+            chunked = self.client.get(url)
+        with patch.object(BlogAPIView, "compiled_export", False):
+            expected = self.client.get(url)
+        body = b"".join(expected.streaming_content)
+        self.assertEqual(b"".join(res.streaming_content), body)
+        self.assertEqual(b"".join(chunked.streaming_content), body)
@@ -0,0 +1,154 @@
+"""
+Test DB connection pool
+"""
+
+import threading
+from unittest import mock
+
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+from core.db.backends.mysql_pool.base import Database
+from core.db.pool import ConnectionPool, PoolExhausted
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.alive = True
+
+    def close(self):
+        self.closed = True
+
+    def ping(self, reconnect=True):
+        if not self.alive:
+            raise ConnectionError("gone")
+
+
+def create_pool(**kwargs):
+    connections = []
+
+    def connect():
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    kwargs.setdefault("check", lambda connection: connection.ping())
+    return ConnectionPool(connect, **kwargs), connections
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    def test_reuse_released_connection(self):
+        """반납한 연결을 다시 쓰고 새로 연결하지 않음"""
+        pool, connections = create_pool()
+        entry = pool.acquire()
+        pool.release(entry)
+
+        self.assertIs(pool.acquire(), entry)
+        self.assertEqual(len(connections), 1)
+        self.assertEqual(pool.stats()["created"], 1)
+        self.assertEqual(pool.stats()["reused"], 1)
+
+    def test_wait_and_timeout_when_exhausted(self):
+        """max_size를 넘으면 반납을 기다리고 timeout이 지나면 에러"""
+        pool, _ = create_pool(max_size=1, timeout=0.05)
+        entry = pool.acquire()
+        with self.assertRaises(PoolExhausted):
+            pool.acquire()
+
+        pool.timeout = 5
+        timer = threading.Timer(0.05, pool.release, [entry])
+        timer.start()
+        self.assertIs(pool.acquire(), entry)
+        timer.join()
+
+        stats = pool.stats()
+        self.assertEqual((stats["size"], stats["in_use"]), (1, 1))
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["waits"], 2)
+
+    def test_recycle_after_max_lifetime(self):
+        pool, connections = create_pool(max_lifetime=60)
+        entry = pool.acquire()
+        pool.release(entry)
+
+        entry.created_at -= 61
+        new_entry = pool.acquire()
+
+        self.assertIsNot(new_entry, entry)
+        self.assertTrue(connections[0].closed)
+        self.assertEqual(pool.stats()["recycled"], 1)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_health_check_on_checkout(self):
+        """오래 놀던 연결이 끊겼으면 버리고 새로 연결"""
+        pool, connections = create_pool(check_after=1)
+        entry = pool.acquire()
+        pool.release(entry)
+        connections[0].alive = False
+
+        # 방금 반납한 연결은 검사하지 않음
+        self.assertIs(pool.acquire(), entry)
+        pool.release(entry)
+
+        pool.mark_suspect(entry)
+        self.assertIsNot(pool.acquire(), entry)
+        self.assertTrue(connections[0].closed)
+        self.assertEqual(pool.stats()["failed_checks"], 1)
+
+    def test_failed_connect_frees_slot(self):
+        pool = ConnectionPool(mock.Mock(side_effect=ConnectionError), max_size=1)
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                pool.acquire()
+        self.assertEqual(pool.stats()["size"], 0)
+
+
+@mock.patch("django.db.backends.mysql.base.DatabaseWrapper.init_connection_state")
+@mock.patch("core.db.backends.mysql_pool.base.connect")
+class PooledBackendTest(SimpleTestCase):
+    def get_connection(self):
+        # 테스트마다 다른 pool을 쓰도록 NAME을 다르게
+        handler = ConnectionHandler(
+            {
+                "default": {
+                    "ENGINE": "core.db.backends.mysql_pool",
+                    "NAME": self.id(),
+                    "POOL": {"MAX_SIZE": 1, "TIMEOUT": 0.01},
+                }
+            }
+        )
+        return handler["default"]
+
+    def test_close_returns_connection_to_pool(self, connect, init_connection_state):
+        """close()는 연결을 닫지 않고 반납, 다음 연결은 세션 설정 없이 재사용"""
+        connect.return_value.get_autocommit.return_value = True
+        connection = self.get_connection()
+
+        connection.connect()
+        raw = connection.connection
+        connection.close()
+        connection.connect()
+
+        self.assertIs(connection.connection, raw)
+        connect.assert_called_once()
+        init_connection_state.assert_called_once()
+        raw.close.assert_not_called()
+        raw.autocommit.assert_not_called()
+
+        # 한 프로세스에서 같은 DB는 pool 하나를 같이 씀
+        other = self.get_connection()
+        with self.assertRaises(Database.OperationalError):
+            other.connect()
+        connection.close()
+
+    def test_rollback_open_transaction_before_release(
+        self, connect, init_connection_state
+    ):
+        connect.return_value.get_autocommit.return_value = True
+        connection = self.get_connection()
+        connection.connect()
+        connection.connection.get_autocommit.return_value = False
+
+        connection.close()
+
+        connect.return_value.rollback.assert_called_once()
@@ -0,0 +1,210 @@
+"""
+Test request metrics and /metrics/ exposition
+"""
+
+import multiprocessing
+import os
+import re
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.db.pool import ConnectionPool, pools, pools_lock
+from core.metrics import Counter, Gauge, ValueFile, exposition, registry, store
+
+BLOG_URL = reverse("blog:blog-list")
+METRICS_URL = reverse("metrics")
+
+
+def create_user(**kwargs):
+    email = kwargs.pop("email", "user@example.com")
+    password = kwargs.pop("password", "test123!@#")
+    return get_user_model().objects.create_user(email, password, **kwargs)
+
+
+def samples(text):
+    """{'name{labels}': value}"""
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    }
+
+
+def increment(counter, times):
+    for _ in range(times):
+        counter.inc(route="r")
+
+
+def set_gauge(gauge, value):
+    gauge.set(value, route="r")
+
+
+class ValueFileTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = f"{self.directory.name}/1.db"
+
+    def test_grow_and_reopen(self):
+        """처음 크기를 넘어도 늘려서 쓰고 다시 열어도 값이 남음"""
+        values = ValueFile(self.path)
+        keys = [f"key{i}".encode() * 20 for i in range(1000)]
+        for i, key in enumerate(keys):
+            values.inc(key, i)
+        values.inc(keys[0], 0.5)
+
+        expected = {key: float(i) for i, key in enumerate(keys)}
+        expected[keys[0]] = 0.5
+        self.assertEqual(ValueFile.read(self.path), expected)
+        self.assertEqual(ValueFile(self.path).offsets.keys(), expected.keys())
+
+    def test_workers_are_summed(self):
+        """fork한 worker들이 각자 파일에 쓴 값을 합쳐서 내보냄"""
+        counter = Counter("test_worker_total", "test", ["route"])
+        self.addCleanup(registry.remove, counter)
+        with override_settings(METRICS_DIR=self.directory.name):
+            self.addCleanup(store.clear)
+            context = multiprocessing.get_context("fork")
+            workers = [
+                context.Process(target=increment, args=(counter, 100)) for _ in range(3)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            increment(counter, 1)
+
+            self.assertEqual(
+                samples(exposition())['test_worker_total{route="r"}'], 301.0
+            )
+
+    def test_gauge_from_live_workers(self):
+        """gauge는 끝난 worker의 값을 빼고 합침"""
+        gauge = Gauge("test_worker_gauge", "test", ["route"])
+        self.addCleanup(registry.remove, gauge)
+        with override_settings(METRICS_DIR=self.directory.name):
+            self.addCleanup(store.clear)
+            worker = multiprocessing.get_context("fork").Process(
+                target=set_gauge, args=(gauge, 5)
+            )
+            worker.start()
+            worker.join()
+            set_gauge(gauge, 2)
+            set_gauge(gauge, 3)
+
+            self.assertEqual(samples(exposition())['test_worker_gauge{route="r"}'], 3.0)
+
+
+@override_settings(METRICS_TOKEN="secret")
+class MetricsTest(TestCase):
+    def setUp(self):
+        caches[settings.API_CACHE_ALIAS].clear()
+        store.clear()
+        self.addCleanup(store.clear)
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_metrics(self):
+        return self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer secret")
+
+    def test_request_metrics(self):
+        """route별 요청 수, latency, 응답 크기, SQL 수, 캐시 hit/miss"""
+        self.client.get(BLOG_URL)
+        self.client.get(BLOG_URL)
+        self.client.get(reverse("blog:blog-detail", args=[0]))
+
+        res = self.get_metrics()
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        metrics = samples(res.content.decode())
+
+        route = 'method="GET",route="blog:blog-list"'
+        self.assertEqual(metrics[f'http_requests_total{{{route},status="200"}}'], 2.0)
+        self.assertEqual(
+            metrics[
+                'http_requests_total{method="GET",route="blog:blog-detail",status="404"}'
+            ],
+            1.0,
+        )
+        self.assertEqual(
+            metrics[f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}'], 2.0
+        )
+        self.assertEqual(
+            metrics[f"http_request_duration_seconds_count{{{route}}}"], 2.0
+        )
+        self.assertGreater(metrics[f"http_response_size_bytes_sum{{{route}}}"], 0)
+        self.assertEqual(
+            metrics[f'http_request_db_queries_bucket{{{route},le="0.0"}}'], 1.0
+        )
+        self.assertEqual(
+            metrics['api_cache_requests_total{result="hit",scope="blog"}'], 1.0
+        )
+        self.assertEqual(
+            metrics['api_cache_requests_total{result="miss",scope="blog"}'], 2.0
+        )
+        # metrics 요청 자신은 기록하지 않음
+        self.assertNotIn("metrics", "".join(metrics))
+
+    def test_buckets_are_cumulative(self):
+        """bucket은 le가 커질수록 줄지 않음"""
+        for _ in range(3):
+            self.client.get(BLOG_URL)
+        text = self.get_metrics().content.decode()
+        buckets = re.findall(
+            r'http_request_db_queries_bucket\{method="GET",route="blog:blog-list",'
+            r'le="[^"]+"\} (\S+)',
+            text,
+        )
+        values = list(map(float, buckets))
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(values[-1], 3.0)
+
+    def test_pool_metrics(self):
+        """이 process의 DB pool 연결 수, 대기, 재생성을 내보냄"""
+        pool = ConnectionPool(lambda: object(), close=lambda c: None, max_size=2)
+        key = (os.getpid(), "pooled", "test")
+        with pools_lock:
+            pools[key] = pool
+        self.addCleanup(pools.pop, key)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.max_lifetime = 0
+        pool.release(second)
+        pool.acquire()
+
+        metrics = samples(self.get_metrics().content.decode())
+        self.assertEqual(
+            metrics['db_pool_connections{alias="pooled",state="in_use"}'], 1.0
+        )
+        self.assertEqual(
+            metrics['db_pool_connections{alias="pooled",state="idle"}'], 0.0
+        )
+        self.assertEqual(metrics['db_pool_max_size{alias="pooled"}'], 2.0)
+        self.assertEqual(
+            metrics['db_pool_events_total{alias="pooled",event="recycled"}'], 2.0
+        )
+        self.assertEqual(
+            metrics['db_pool_events_total{alias="pooled",event="created"}'], 3.0
+        )
+
+    def test_token(self):
+        """Bearer 토큰이 맞아야함"""
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 401)
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(res.status_code, 401)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_denied_without_token_setting(self):
+        """METRICS_TOKEN이 없으면(기본값) 아무도 못 읽음"""
+        self.client.force_authenticate(
+            create_user(email="staff@example.com", is_staff=True)
+        )
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+        self.assertEqual(self.get_metrics().status_code, 403)
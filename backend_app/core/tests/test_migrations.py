@@ -0,0 +1,191 @@
+"""
+Test data migrations
+"""
+
+from importlib import import_module
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.conf import settings
+from django.db import DatabaseError, connection, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase, override_settings
+
+swap = import_module("core.migrations.0004_swap_flat_models")
+
+BEFORE = [("core", "0001_initial")]
+COPIED = [("core", "0003_copy_to_flat_models")]
+AFTER = [("core", "0004_swap_flat_models")]
+
+
+class MigrationTestCase(TransactionTestCase):
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(self.migrate_to_latest())
+
+    def migrate_to_latest(self):
+        executor = MigrationExecutor(connection)
+        return executor.loader.graph.leaf_nodes()
+
+
+class FlattenMigrationTest(MigrationTestCase):
+    def setUp(self):
+        apps = self.migrate(BEFORE)
+        User = apps.get_model("core", "User")
+        BlogTag = apps.get_model("core", "BlogTag")
+        CampingTag = apps.get_model("core", "CampingTag")
+        Blog = apps.get_model("core", "Blog")
+        Camping = apps.get_model("core", "Camping")
+
+        self.user = User.objects.create(email="user@example.com")
+        self.blog_tag = BlogTag.objects.create(user=self.user, name="a", slug="a")
+        self.camping_tag = CampingTag.objects.create(user=self.user, name="b", slug="b")
+        self.blog = Blog.objects.create(user=self.user, title="t", content="c")
+        self.blog.tags.add(self.blog_tag)
+        self.camping = Camping.objects.create(user=self.user, title="t", review="r")
+        self.camping.tags.add(self.camping_tag)
+
+    def test_rows_keep_ids_timestamps_and_tags(self):
+        """기존 id, 시간, 태그 관계가 그대로 유지되어야함"""
+        apps = self.migrate(AFTER)
+        Blog = apps.get_model("core", "Blog")
+        Camping = apps.get_model("core", "Camping")
+
+        blog = Blog.objects.get(id=self.blog.id)
+        self.assertEqual(blog.title, "t")
+        self.assertEqual(blog.updated_at, self.blog.updated_at)
+        self.assertEqual(blog.created_at, self.blog.created_at)
+        self.assertEqual(
+            list(blog.tags.values_list("id", flat=True)), [self.blog_tag.id]
+        )
+
+        camping = Camping.objects.get(id=self.camping.id)
+        self.assertEqual(camping.review, "r")
+        self.assertEqual(
+            list(camping.tags.values_list("slug", flat=True)), [self.camping_tag.slug]
+        )
+
+    def test_writes_between_copy_and_swap_are_caught_up(self):
+        """복사 이후에 생긴 변경도 교체할 때 반영되어야함"""
+        apps = self.migrate(COPIED)
+        Blog = apps.get_model("core", "Blog")
+        BlogTag = apps.get_model("core", "BlogTag")
+
+        Blog.objects.filter(pk=self.blog.id).update(title="new title")
+        new_tag = BlogTag.objects.create(user_id=self.user.id, name="c", slug="c")
+        new_blog = Blog.objects.create(user_id=self.user.id, title="n", content="c")
+        new_blog.tags.add(new_tag)
+        Blog.objects.get(pk=self.blog.id).tags.clear()
+
+        apps = self.migrate(AFTER)
+        Blog = apps.get_model("core", "Blog")
+
+        self.assertEqual(Blog.objects.get(id=self.blog.id).title, "new title")
+        self.assertFalse(Blog.objects.get(id=self.blog.id).tags.exists())
+        self.assertEqual(
+            list(Blog.objects.get(id=new_blog.id).tags.values_list("id", flat=True)),
+            [new_tag.id],
+        )
+
+    def test_writes_during_swap_are_rejected(self):
+        """교체 중에 옛 테이블에 쓰면 사라지지 않고 에러가 나야함"""
+        apps = self.migrate(COPIED)
+        Blog = apps.get_model("core", "Blog")
+        with connection.schema_editor() as schema_editor:
+            swap.block_writes(apps, schema_editor)
+
+        with self.assertRaises(DatabaseError):
+            Blog.objects.create(user_id=self.user.id, title="n", content="c")
+        with self.assertRaises(DatabaseError):
+            Blog.objects.filter(pk=self.blog.id).update(title="new title")
+        with self.assertRaises(DatabaseError):
+            Blog.objects.get(pk=self.blog.id).tags.clear()
+        self.assertEqual(Blog.objects.get(pk=self.blog.id).title, "t")
+
+        apps = self.migrate(AFTER)
+        Blog = apps.get_model("core", "Blog")
+        Blog.objects.create(user_id=self.user.id, title="n", content="c")
+        self.assertEqual(Blog.objects.count(), 2)
+
+    def test_rollback_restores_multi_table_rows(self):
+        """롤백하면 multi-table 테이블로 되돌아가야함"""
+        self.migrate(AFTER)
+        apps = self.migrate(BEFORE)
+        Blog = apps.get_model("core", "Blog")
+
+        blog = Blog.objects.get(id=self.blog.id)
+        self.assertEqual(blog.content, "c")
+        self.assertEqual(
+            list(blog.tags.values_list("id", flat=True)), [self.blog_tag.id]
+        )
+
+
+class SearchTermsMigrationTest(MigrationTestCase):
+    def test_index_with_frozen_tokenizer(self):
+        """기존 글 색인은 migration 안의 tokenizer로 (core.search가 바뀌어도 같은 결과)"""
+        apps = self.migrate([("core", "0006_signed_tokens")])
+        user = apps.get_model("core", "User").objects.create(email="user@example.com")
+        blog = apps.get_model("core", "Blog").objects.create(
+            user=user, title="바다", content="캠핑"
+        )
+
+        with patch("core.search.tokenize", side_effect=AssertionError):
+            apps = self.migrate([("core", "0007_search_terms")])
+
+        BlogTerm = apps.get_model("core", "BlogTerm")
+        self.assertEqual(
+            dict(
+                BlogTerm.objects.filter(document_id=blog.pk).values_list(
+                    "term", "weight"
+                )
+            ),
+            {"바다": 3, "캠핑": 1},
+        )
+
+
+@skipUnless("shard1" in settings.DATABASES, "shard DB가 설정되지 않음")
+@override_settings(SHARD_DATABASES=["default", "shard1"])
+class SummariesMigrationTest(MigrationTestCase):
+    databases = {"default", "shard1"}
+
+    def migrate(self, targets, alias="default"):
+        executor = MigrationExecutor(connections[alias])
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        # shard 먼저
+        self.migrate(self.migrate_to_latest(), "shard1")
+        super().tearDown()
+
+    def test_fill_every_shard_with_frozen_excerpt(self):
+        """shard의 글도 채우고 core.models.make_excerpt는 쓰지 않음"""
+        for alias in ("shard1", "default"):
+            apps = self.migrate([("core", "0008_user_shards")], alias)
+        blogs = {}
+        user = apps.get_model("core", "User").objects.create(email="user@example.com")
+        for alias in ("shard1", "default"):
+            blogs[alias] = (
+                apps.get_model("core", "Blog")
+                .objects.using(alias)
+                .create(user_id=user.pk, title="바다", content=f"{alias} 캠핑  후기")
+            )
+
+        with patch("core.models.make_excerpt", side_effect=AssertionError):
+            self.migrate([("core", "0009_post_summaries")], "shard1")
+            apps = self.migrate([("core", "0009_post_summaries")])
+
+        Blog = apps.get_model("core", "Blog")
+        for alias, blog in blogs.items():
+            self.assertEqual(
+                Blog.objects.using(alias)
+                .values("excerpt", "word_count")
+                .get(pk=blog.pk),
+                {"excerpt": f"{alias} 캠핑 후기", "word_count": 3},
+            )
@@ -1,6 +1,6 @@
 from django.test import TestCase, Client
 from django.contrib.auth import get_user_model
-from core.models import Blog, CampingTag, BlogTag
+from core.models import Blog, CampingTag, BlogTag, ReadOnlyUserError, StatelessUser
 
 
 def create_user(**kwargs):
@@ -64,3 +64,24 @@ class ModelTest(TestCase):
         camping_tag = CampingTag.objects.create(user=self.user, name=name)
 
         self.assertEqual(str(camping_tag), name)
+
+    def test_create_blog_and_tag_insert_single_row(self):
+        """부모 테이블 없이 한 테이블에만 insert 되어야함"""
+        # 검색 색인 insert 포함
+        with self.assertNumQueries(2):
+            Blog.objects.create(user=self.user, title="title", content="content")
+
+        with self.assertNumQueries(1):
+            BlogTag.objects.create(user=self.user, name="tag1")
+
+    def test_stateless_user_is_read_only(self):
+        """토큰 claim으로 만든 유저는 저장, 삭제하면 에러이고 DB는 그대로"""
+        user = StatelessUser(id=self.user.pk, email="changed@example.com")
+
+        with self.assertRaises(ReadOnlyUserError):
+            user.save()
+        with self.assertRaises(ReadOnlyUserError):
+            user.delete()
+        self.assertEqual(
+            get_user_model().objects.get(pk=self.user.pk).email, self.user.email
+        )
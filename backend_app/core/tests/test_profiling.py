@@ -0,0 +1,116 @@
+"""
+Test staff request profiling and /profiles/
+"""
+
+import pstats
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from camping.views import CampingViewSet
+from core.models import Camping
+
+CAMPING_URL = reverse("camping:camping-list")
+PROFILES_URL = reverse("profile-list")
+
+
+def create_user(**kwargs):
+    email = kwargs.pop("email", "user@example.com")
+    password = kwargs.pop("password", "test123!@#")
+    return get_user_model().objects.create_user(email, password, **kwargs)
+
+
+def slow_get_queryset(self):
+    time.sleep(0.05)
+    return original_get_queryset(self)
+
+
+original_get_queryset = CampingViewSet.get_queryset
+
+
+class ProfileTest(TestCase):
+    def setUp(self):
+        caches[settings.API_CACHE_ALIAS].clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        override = override_settings(PROFILE_DIR=directory.name, PROFILE_SAMPLE_MS=1)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.staff = create_user(email="staff@example.com", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+        Camping.objects.create(user=self.staff, title="t", review="r")
+
+    def test_not_staff(self):
+        """staff가 아니면 profile 값을 무시하고 목록도 못 봄"""
+        client = APIClient()
+        client.force_authenticate(create_user())
+        res = client.get(CAMPING_URL + "?profile=1")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(res.has_header("X-Profile-Id"))
+        self.assertEqual(list(self.directory.iterdir()), [])
+        res = client.get(PROFILES_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_sample(self):
+        """collapsed stack을 저장하고 목록, 다운로드로 봄"""
+        self.client.get(CAMPING_URL)
+        with patch.object(CampingViewSet, "get_queryset", slow_get_queryset):
+            res = self.client.get(CAMPING_URL, HTTP_X_PROFILE="1")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["title"], "t")
+        profile_id = res["X-Profile-Id"]
+
+        res = self.client.get(PROFILES_URL)
+        profile = res.data[0]
+        self.assertEqual(profile["id"], profile_id)
+        self.assertEqual(profile["mode"], "sample")
+        self.assertEqual(profile["path"], CAMPING_URL)
+        self.assertEqual(profile["user"], self.staff.pk)
+        self.assertGreater(profile["samples"], 0)
+
+        res = self.client.get(profile["url"])
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        stacks = [line.rsplit(" ", 1)[0].split(";") for line in lines]
+        # 캐시를 건너뛰고 view를 다시 돌았고, dispatch 위는 잘림
+        self.assertTrue([stack for stack in stacks if "slow_get_queryset" in stack[-1]])
+        for stack in stacks:
+            self.assertTrue(stack[0].startswith("dispatch ("))
+
+    def test_cprofile(self):
+        """cProfile 결과는 pstats로 읽힘"""
+        res = self.client.get(CAMPING_URL + "?profile=cprofile")
+        path = self.directory / f"{res['X-Profile-Id']}.prof"
+        stats = pstats.Stats(str(path))
+        self.assertTrue([func for func in stats.stats if func[2] == "get_queryset"])
+
+    def test_invalid_mode(self):
+        res = self.client.get(CAMPING_URL + "?profile=perf")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("profile", res.data)
+
+    @override_settings(PROFILE_KEEP=2)
+    def test_keep(self):
+        """PROFILE_KEEP개만 남기고 파일 id는 경로로 못 빠져나감"""
+        ids = [
+            self.client.get(CAMPING_URL + f"?profile=1&page_size={i}")["X-Profile-Id"]
+            for i in range(1, 4)
+        ]
+        res = self.client.get(PROFILES_URL)
+        self.assertEqual(sorted(profile["id"] for profile in res.data), sorted(ids)[1:])
+        self.assertEqual(len(list(self.directory.iterdir())), 4)
+
+        res = self.client.get(reverse("profile-detail", args=["..%2Fsettings"]))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,104 @@
+"""
+Test query plans of the list/detail endpoints
+
+각 view가 실제로 실행하는 SELECT에 EXPLAIN을 돌려서
+full scan이나 filesort가 생기면 실패
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Blog, BlogTag, Camping, CampingTag
+from core.tests import utils
+from core.tests.utils import QueryPlanTestMixin
+
+
+def create_user(**kwargs):
+    email = kwargs.pop("email", "user@example.com")
+    password = kwargs.pop("password", "test123!@#")
+    return get_user_model().objects.create_user(email, password, **kwargs)
+
+
+class QueryPlanTest(QueryPlanTestMixin, TestCase):
+    def setUp(self):
+        self.user = create_user()
+        other_user = create_user(email="other@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        for user in [self.user, other_user]:
+            blog_tag = BlogTag.objects.create(user=user, name="태그")
+            camping_tag = CampingTag.objects.create(user=user, name="태그")
+            for i in range(3):
+                blog = Blog.objects.create(user=user, title=f"t{i}", content="c")
+                blog.tags.add(blog_tag)
+                camping = Camping.objects.create(user=user, title=f"t{i}", review="r")
+                camping.tags.add(camping_tag)
+
+    def get(self, url):
+        res = self.assertNoFullScanOrFilesort(lambda: self.client.get(url))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res
+
+    def test_blog_list(self):
+        res = self.get(reverse("blog:blog-list") + "?page_size=1")
+        self.get(res.data["next"])
+
+    def test_blog_detail(self):
+        blog = Blog.objects.filter(user=self.user).first()
+        self.get(reverse("blog:blog-detail", args=[blog.id]))
+
+    def test_blog_tag_list(self):
+        self.get(reverse("blog:blogtag-list"))
+
+    def test_blog_tag_detail(self):
+        tag = BlogTag.objects.filter(user=self.user).first()
+        self.get(reverse("blog:blogtag-detail", args=[tag.id]))
+
+    def test_camping_list(self):
+        res = self.get(reverse("camping:camping-list") + "?page_size=1")
+        self.get(res.data["next"])
+
+    def test_camping_detail(self):
+        camping = Camping.objects.filter(user=self.user).first()
+        self.get(reverse("camping:camping-detail", args=[camping.id]))
+
+    def test_tag_lookup_by_slug(self):
+        for model in [BlogTag, CampingTag]:
+            self.assertNoFullScanOrFilesort(
+                lambda: list(model.objects.filter(user=self.user, slug="태그"))
+            )
+
+    def test_export(self):
+        for url in [reverse("blog:blog-export"), reverse("camping:camping-export")]:
+            self.assertNoFullScanOrFilesort(
+                lambda: b"".join(self.client.get(url).streaming_content)
+            )
+
+
+class PlanProblemsTest(SimpleTestCase):
+    def problems(self, vendor, row):
+        with mock.patch.object(connection, "vendor", vendor), mock.patch.object(
+            utils, "explain", return_value=[row]
+        ):
+            return utils.plan_problems("SELECT 1")
+
+    def test_mysql_access_types(self):
+        """인덱스로 찾는 type만 통과. 인덱스 전체 scan, index_merge는 실패"""
+        for access in ["const", "eq_ref", "ref", "range"]:
+            self.assertFalse(self.problems("mysql", {"table": "t", "type": access}))
+        for access in ["ALL", "index", "index_merge", "fulltext"]:
+            self.assertTrue(self.problems("mysql", {"table": "t", "type": access}))
+        self.assertFalse(self.problems("mysql", {"table": None, "type": None}))
+
+    def test_sqlite_scan(self):
+        self.assertFalse(
+            self.problems("sqlite", {"detail": "SEARCH t USING INDEX i (user_id=?)"})
+        )
+        self.assertTrue(self.problems("sqlite", {"detail": "SCAN t USING INDEX i"}))
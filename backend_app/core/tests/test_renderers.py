@@ -0,0 +1,110 @@
+"""
+Test orjson renderer, parser and browsable API negotiation
+"""
+
+import datetime
+import io
+import json
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+BLOG_URL = reverse("blog:blog-list")
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    def test_same_as_json_renderer(self):
+        """datetime, Decimal, UUID, lazy 문자열 등 JSONRenderer와 같은 값으로"""
+        data = {
+            "at": datetime.datetime(
+                2024, 1, 2, 3, 4, 5, 6000, tzinfo=datetime.timezone.utc
+            ),
+            "day": datetime.date(2024, 1, 2),
+            "price": Decimal("1.50"),
+            "id": uuid.UUID(int=1),
+            "label": gettext_lazy("label"),
+            "errors": {0: [ErrorDetail("잘못된 값", code="invalid")]},
+            "text": "한글\u2028",
+        }
+        rendered = ORJSONRenderer().render(data)
+
+        self.assertEqual(
+            json.loads(rendered),
+            json.loads(JSONRenderer().render(data)),
+        )
+        self.assertIn("한글".encode(), rendered)
+        self.assertIn(b"\\u2028", rendered)
+
+    def test_indent_and_empty(self):
+        renderer = ORJSONRenderer()
+        self.assertEqual(renderer.render(None), b"")
+        self.assertIn(
+            b'\n  "a": 1', renderer.render({"a": 1}, "application/json; indent=4")
+        )
+
+
+class ORJSONParserTest(SimpleTestCase):
+    def test_parse(self):
+        stream = io.BytesIO('{"title": "바다", "n": 1.5}'.encode())
+        self.assertEqual(ORJSONParser().parse(stream), {"title": "바다", "n": 1.5})
+
+    def test_invalid_json_raise_parse_error(self):
+        for body in [b"{", b'{"n": NaN}']:
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+
+@override_settings(DEBUG=False, BROWSABLE_API_STAFF_ONLY=True)
+class BrowsableAPINegotiationTest(TestCase):
+    def get_html(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get(BLOG_URL, HTTP_ACCEPT="text/html,*/*;q=0.8")
+
+    def test_json_for_non_staff(self):
+        user = get_user_model().objects.create_user("user@example.com", "pw")
+        res = self.get_html(user)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Content-Type"], "application/json")
+
+    def test_html_for_staff(self):
+        user = get_user_model().objects.create_user(
+            "staff@example.com", "pw", is_staff=True
+        )
+        res = self.get_html(user)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/html"))
+
+    def test_unauthenticated_error_is_json(self):
+        res = APIClient().get(BLOG_URL, HTTP_ACCEPT="text/html")
+        self.assertEqual(res.status_code, 401)
+        self.assertEqual(res["Content-Type"], "application/json")
+
+    def test_invalid_token_fails_authentication(self):
+        """negotiation에서 인증이 실패해도 view에서 인증 실패로 응답함 (익명이 아님)"""
+        res = APIClient().get(
+            BLOG_URL, HTTP_ACCEPT="text/html", HTTP_AUTHORIZATION="Token wrong"
+        )
+        self.assertEqual(res.status_code, 401)
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertEqual(res.data["detail"].code, "authentication_failed")
+
+        # AllowAny view도 익명으로 통과하지 않음
+        res = APIClient().post(
+            reverse("user:create"),
+            {"email": "new@example.com", "password": "test123!@#", "name": "n"},
+            HTTP_ACCEPT="text/html",
+            HTTP_AUTHORIZATION="Basic d3Jvbmc6d3Jvbmc=",
+        )
+        self.assertEqual(res.data["detail"].code, "authentication_failed")
+        self.assertFalse(get_user_model().objects.exists())
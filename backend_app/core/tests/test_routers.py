@@ -0,0 +1,78 @@
+"""
+Test read replica routing
+
+"replica" DB가 있는 경우만 (python manage.py test --settings main.test_settings)
+"""
+
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import Blog
+
+BLOG_URL = reverse("blog:blog-list")
+
+
+def create_user(**kwargs):
+    email = kwargs.pop("email", "user@example.com")
+    password = kwargs.pop("password", "test123!@#")
+    return get_user_model().objects.create_user(email, password, **kwargs)
+
+
+@skipUnless("replica" in settings.DATABASES, "replica DB가 설정되지 않음")
+@override_settings(REPLICA_DATABASES=["replica"])
+class ReplicaRoutingTest(TransactionTestCase):
+    # replica 연결은 default의 transaction 안 데이터를 못 보므로 TransactionTestCase
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        caches[settings.API_CACHE_ALIAS].clear()
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Blog.objects.create(user=self.user, title="title", content="content")
+
+    def get_with_queries(self, url):
+        with CaptureQueriesContext(connections["default"]) as primary:
+            with CaptureQueriesContext(connections["replica"]) as replica:
+                res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return primary, replica
+
+    def test_read_from_replica(self):
+        """GET 리스트의 blog 조회는 replica에서"""
+        primary, replica = self.get_with_queries(BLOG_URL)
+
+        self.assertTrue(any("core_blog" in q["sql"] for q in replica))
+        self.assertFalse(any("core_blog" in q["sql"] for q in primary))
+
+    def test_write_to_primary_and_pin(self):
+        """쓰기는 primary로, 그 뒤 같은 user의 읽기는 잠시 primary에서"""
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            res = self.client.post(
+                BLOG_URL, {"title": "new", "content": "content"}, format="json"
+            )
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(len(replica), 0)
+
+        primary, replica = self.get_with_queries(BLOG_URL)
+        self.assertEqual(len(replica), 0)
+        self.assertTrue(any("core_blog" in q["sql"] for q in primary))
+
+        # 다른 user는 그대로 replica
+        self.client.force_authenticate(create_user(email="other@example.com"))
+        _, replica = self.get_with_queries(BLOG_URL)
+        self.assertTrue(any("core_blog" in q["sql"] for q in replica))
+
+    def test_read_outside_request_from_primary(self):
+        """요청 밖(shell, command)의 읽기는 primary"""
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            list(Blog.objects.all())
+        self.assertEqual(len(replica), 0)
@@ -0,0 +1,65 @@
+"""
+Test search index
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from core.models import Blog, BlogTerm
+from core.search import rank, tokenize
+
+
+def create_user(**kwargs):
+    email = kwargs.pop("email", "user@example.com")
+    password = kwargs.pop("password", "test123!@#")
+    return get_user_model().objects.create_user(email, password, **kwargs)
+
+
+class TokenizeTest(TestCase):
+    def test_hangul_bigram(self):
+        """한글은 2-gram, 한글자 단어는 그대로"""
+        self.assertEqual(list(tokenize("캠핑장 물")), ["캠핑", "핑장", "물"])
+
+    def test_mixed_word(self):
+        """한글, 영문이 붙어 있으면 나눠서 자르고 영문은 소문자로"""
+        self.assertEqual(list(tokenize("Tent캠핑 2박")), ["tent", "캠핑", "2", "박"])
+
+    def test_normalize(self):
+        """전각 문자, 조합형 한글도 같은 term"""
+        self.assertEqual(list(tokenize("ＴＥＮＴ")), ["tent"])
+        self.assertEqual(
+            list(tokenize("\u110f\u1162\u11b7\u1111\u1175\u11bc")), ["캠핑"]
+        )
+
+
+class SearchIndexTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+
+    def test_index_on_save(self):
+        """저장할 때 색인되고 수정하면 다시 색인"""
+        blog = Blog.objects.create(user=self.user, title="바다", content="캠핑")
+        self.assertEqual(
+            dict(blog.terms.values_list("term", "weight")), {"바다": 3, "캠핑": 1}
+        )
+
+        blog.content = "산"
+        blog.save()
+        self.assertEqual(
+            dict(blog.terms.values_list("term", "weight")), {"바다": 3, "산": 1}
+        )
+
+    def test_delete_removes_terms(self):
+        blog = Blog.objects.create(user=self.user, title="바다", content="캠핑")
+        blog.delete()
+        self.assertFalse(BlogTerm.objects.exists())
+
+    def test_rank_requires_all_terms(self):
+        """모든 term이 있는 글만, 제목에 나온 글이 먼저"""
+        in_title = Blog.objects.create(user=self.user, title="바다 캠핑", content="x")
+        in_content = Blog.objects.create(user=self.user, title="x", content="바다 캠핑")
+        Blog.objects.create(user=self.user, title="바다", content="x")
+
+        ranked = [row["document_id"] for row in rank(Blog, self.user.pk, "캠핑 바다")]
+        self.assertEqual(ranked, [in_title.id, in_content.id])
+        self.assertFalse(rank(Blog, self.user.pk, "없는말"))
@@ -0,0 +1,251 @@
+"""
+Test user_id shard routing
+
+"shard1" DB가 있는 경우만 (python manage.py test --settings main.test_settings)
+"""
+
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.db import sharding
+from core.db.routers import (
+    ShardLocked,
+    home_shard,
+    lock_key,
+    lock_shard,
+    unlock_shard,
+    use_shard,
+)
+from core.models import Blog, BlogTag, BlogTerm, Camping
+
+BLOG_URL = reverse("blog:blog-list")
+CAMPING_BULK_URL = reverse("camping:camping-bulk")
+CAMPING_URL = reverse("camping:camping-list")
+
+
+def create_user(**kwargs):
+    email = kwargs.pop("email", "user@example.com")
+    password = kwargs.pop("password", "test123!@#")
+    return get_user_model().objects.create_user(email, password, **kwargs)
+
+
+def set_shard(user, alias):
+    get_user_model().objects.filter(pk=user.pk).update(shard=alias)
+    caches[settings.API_CACHE_ALIAS].clear()
+
+
+@skipUnless("shard1" in settings.DATABASES, "shard DB가 설정되지 않음")
+@override_settings(SHARD_DATABASES=["default", "shard1"])
+class ShardRoutingTest(TestCase):
+    databases = {"default", "shard1"}
+
+    def setUp(self):
+        caches[settings.API_CACHE_ALIAS].clear()
+        self.user = create_user()
+        set_shard(self.user, "shard1")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_write_and_read_in_user_shard(self):
+        """글, 태그, M2M, 검색 term 모두 user의 shard에 저장되고 거기서 읽음"""
+        payload = {"title": "바다", "content": "캠핑", "tags": [{"name": "a"}]}
+        res = self.client.post(BLOG_URL, payload, format="json")
+        self.assertEqual(res.status_code, 201)
+
+        blog = Blog.objects.using("shard1").get(user=self.user)
+        self.assertEqual(list(blog.tags.values_list("name", flat=True)), ["a"])
+        self.assertTrue(BlogTerm.objects.using("shard1").filter(document=blog))
+        self.assertFalse(Blog.objects.using("default").exists())
+        self.assertFalse(BlogTag.objects.using("default").exists())
+
+        res = self.client.get(BLOG_URL)
+        self.assertEqual([post["id"] for post in res.data["results"]], [blog.id])
+        self.assertEqual(res.data["results"][0]["tags"][0]["name"], "a")
+
+    def test_bulk_create_in_user_shard(self):
+        """user가 다른 DB에 있어도 JOIN 없이 목록에 user가 나옴"""
+        payload = [{"title": f"t{i}", "review": "r", "tags": []} for i in range(3)]
+        res = self.client.post(CAMPING_BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(Camping.objects.using("shard1").count(), 3)
+
+        res = self.client.get(CAMPING_URL)
+        self.assertEqual(len(res.data["results"]), 3)
+        self.assertEqual(res.data["results"][0]["user"]["email"], self.user.email)
+
+    def test_export_from_user_shard(self):
+        """export는 view가 끝난 뒤 chunk를 읽어도 user의 shard에서"""
+        with use_shard(self.user):
+            Blog.objects.create(user=self.user, title="t", content="c")
+
+        res = self.client.get(reverse("blog:blog-export"))
+        lines = b"".join(res.streaming_content).splitlines()
+        self.assertEqual(len(lines), 1)
+
+    def test_locked_user_cannot_write(self):
+        """옮기는 중인 user는 읽기만 되고 쓰기는 503"""
+        with use_shard(self.user):
+            Blog.objects.create(user=self.user, title="t", content="c")
+        lock_shard(self.user.pk, 60)
+
+        res = self.client.post(BLOG_URL, {"title": "t", "content": "c"}, format="json")
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(len(self.client.get(BLOG_URL).data["results"]), 1)
+
+        unlock_shard(self.user.pk)
+        res = self.client.post(BLOG_URL, {"title": "t", "content": "c"}, format="json")
+        self.assertEqual(res.status_code, 201)
+
+    def test_assign_home_shard_on_signup(self):
+        """sharding 중에 가입하면 user_id hash로 shard가 정해짐"""
+        user = create_user(email="new@example.com")
+        user.refresh_from_db()
+        self.assertEqual(user.shard, home_shard(user.pk))
+
+    def test_route_outside_request(self):
+        """요청 밖에서는 instance의 user로, queryset은 use_shard로 shard를 정함"""
+        Blog(user=self.user, title="t", content="c").save()
+
+        self.assertFalse(Blog.objects.exists())
+        with use_shard(self.user):
+            self.assertEqual(Blog.objects.count(), 1)
+        self.assertEqual(self.user.blog.count(), 1)
+
+    def test_delete_user_removes_sharded_rows(self):
+        with use_shard(self.user):
+            BlogTag.objects.create(user=self.user, name="a")
+            Blog.objects.create(user=self.user, title="t", content="c")
+
+        self.user.delete()
+
+        self.assertFalse(Blog.objects.using("shard1").exists())
+        self.assertFalse(BlogTag.objects.using("shard1").exists())
+
+
+@skipUnless("shard1" in settings.DATABASES, "shard DB가 설정되지 않음")
+@override_settings(SHARD_DATABASES=["default", "shard1"])
+class RebalanceShardsCommandTest(TestCase):
+    databases = {"default", "shard1"}
+
+    def setUp(self):
+        self.user = create_user()
+        # sharding 전에 가입해서 default에 글이 있는 user
+        set_shard(self.user, "")
+        self.tag = BlogTag.objects.create(user=self.user, name="a")
+        self.blog = Blog.objects.create(user=self.user, title="바다", content="캠핑")
+        self.blog.tags.add(self.tag)
+
+    def test_move_user_rows(self):
+        """글, 태그, 연결, term, 시간을 그대로 옮기고 원래 DB에서는 지움"""
+        out = StringIO()
+        call_command("rebalance_shards", self.user.email, "--to=shard1", stdout=out)
+
+        self.assertIn("default -> shard1", out.getvalue())
+        self.assertFalse(Blog.objects.using("default").exists())
+        self.assertFalse(BlogTag.objects.using("default").exists())
+        self.assertFalse(BlogTerm.objects.using("default").exists())
+
+        # id가 그대로라서 클라이언트가 들고 있던 id가 같은 글을 가리킴
+        blog = Blog.objects.using("shard1").get(pk=self.blog.pk)
+        self.assertEqual(blog.title, "바다")
+        self.assertEqual(BlogTag.objects.using("shard1").get().pk, self.tag.pk)
+        self.assertEqual(blog.created_at, self.blog.created_at)
+        self.assertEqual(blog.updated_at, self.blog.updated_at)
+        self.assertEqual(list(blog.tags.values_list("name", flat=True)), ["a"])
+        self.assertEqual(
+            dict(blog.terms.values_list("term", "weight")), {"바다": 3, "캠핑": 1}
+        )
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.shard, "shard1")
+        client = APIClient()
+        client.force_authenticate(self.user)
+        res = client.get(BLOG_URL)
+        self.assertEqual([post["id"] for post in res.data["results"]], [blog.id])
+
+    def test_writes_blocked_while_copying(self):
+        """복사하는 동안 그 user의 쓰기는 막히고 끝나면 풀림"""
+        copy_family = sharding.copy_family
+        blocked = []
+
+        def copy_and_write(*args, **kwargs):
+            with use_shard(self.user), self.assertRaises(ShardLocked):
+                Blog.objects.create(user=self.user, title="late", content="c")
+            blocked.append(True)
+            return copy_family(*args, **kwargs)
+
+        with mock.patch.object(sharding, "copy_family", copy_and_write):
+            call_command(
+                "rebalance_shards", self.user.email, "--to=shard1", stdout=StringIO()
+            )
+
+        self.assertEqual(blocked, [True, True])
+        self.assertIsNone(caches[settings.API_CACHE_ALIAS].get(lock_key(self.user.pk)))
+        with use_shard(self.user):
+            Blog.objects.create(user=self.user, title="after", content="c")
+        self.assertEqual(Blog.objects.using("shard1").count(), 2)
+
+    def test_in_flight_write_rejected_not_lost(self):
+        """shard를 정한 뒤 진행 중인 요청의 쓰기: lock 전 것은 옮겨지고 뒤의 것은 거부"""
+        rejected = []
+
+        def write_during_grace(seconds):
+            with self.assertRaises(ShardLocked):
+                Blog.objects.create(user=self.user, title="late", content="c")
+            rejected.append(True)
+
+        with use_shard(self.user):
+            early = Blog.objects.create(user=self.user, title="early", content="c")
+            with mock.patch.object(sharding.time, "sleep", write_during_grace):
+                sharding.move_user(self.user, "shard1")
+
+        self.assertEqual(rejected, [True])
+        self.assertEqual(
+            set(Blog.objects.using("shard1").values_list("title", flat=True)),
+            {"바다", "early"},
+        )
+        self.assertEqual(Blog.objects.using("shard1").get(title="early").pk, early.pk)
+        self.assertFalse(Blog.objects.using("default").exists())
+
+    def test_failed_move_keeps_source(self):
+        """복사가 실패하면 target은 rollback, 원래 shard 그대로, lock은 풀림"""
+        copy_rows = sharding.copy_rows
+        calls = []
+
+        def fail_on_posts(model, *args, **kwargs):
+            calls.append(model)
+            if model is Blog:
+                raise RuntimeError
+            return copy_rows(model, *args, **kwargs)
+
+        with mock.patch.object(sharding, "copy_rows", fail_on_posts):
+            with self.assertRaises(RuntimeError):
+                sharding.move_user(self.user, "shard1")
+
+        self.assertEqual(calls, [BlogTag, Blog])
+        self.assertFalse(BlogTag.objects.using("shard1").exists())
+        self.assertTrue(Blog.objects.using("default").exists())
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.shard, "")
+        self.assertIsNone(caches[settings.API_CACHE_ALIAS].get(lock_key(self.user.pk)))
+
+    def test_dry_run(self):
+        out = StringIO()
+        call_command(
+            "rebalance_shards", self.user.email, "--to=shard1", "--dry-run", stdout=out
+        )
+
+        self.assertIn("default -> shard1", out.getvalue())
+        self.assertTrue(Blog.objects.using("default").exists())
+
+    def test_unknown_shard_raise_error(self):
+        with self.assertRaises(CommandError):
+            call_command("rebalance_shards", self.user.email, "--to=nowhere")
@@ -0,0 +1,111 @@
+"""
+Test ?fields=, ?exclude= sparse fieldsets
+"""
+
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blog.views import BlogAPIView
+from camping.views import CampingViewSet
+from core.models import Blog, BlogTag, Camping, CampingTag
+
+BLOG_URL = reverse("blog:blog-list")
+CAMPING_URL = reverse("camping:camping-list")
+TAG_URL = reverse("blog:blogtag-list")
+
+
+def create_user(**kwargs):
+    email = kwargs.pop("email", "user@example.com")
+    password = kwargs.pop("password", "test123!@#")
+    return get_user_model().objects.create_user(email, password, **kwargs)
+
+
+class SparseFieldsTest(TestCase):
+    def setUp(self):
+        caches[settings.API_CACHE_ALIAS].clear()
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        blog_tag = BlogTag.objects.create(user=self.user, name="태그")
+        camping_tag = CampingTag.objects.create(user=self.user, name="태그")
+        for i in range(3):
+            blog = Blog.objects.create(user=self.user, title=f"t{i}", content="긴 글")
+            blog.tags.add(blog_tag)
+            camping = Camping.objects.create(user=self.user, title=f"t{i}", review="r")
+            camping.tags.add(camping_tag)
+
+    def get(self, url):
+        caches[settings.API_CACHE_ALIAS].clear()
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url)
+        return res, [query["sql"] for query in ctx.captured_queries]
+
+    def assertSparse(self, url, keys, skipped_tables):
+        """compiled, 기존 serializer 모두 고른 필드만 내보내고 안 쓰는 테이블을 읽지 않음"""
+        for compiled in [True, False]:
+            with self.subTest(compiled=compiled), patch.object(
+                BlogAPIView, "compiled_list", compiled
+            ), patch.object(CampingViewSet, "compiled_list", compiled):
+                res, queries = self.get(url)
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                results = res.data["results"]
+                self.assertEqual([list(item) for item in results], [keys] * 3)
+                for sql in queries:
+                    for table in skipped_tables:
+                        self.assertNotIn(table, sql)
+
+    def test_blog_fields(self):
+        """글 목록에서 고른 필드만 읽고 content, 태그는 읽지 않음"""
+        self.assertSparse(
+            BLOG_URL + "?fields=id,title,updated_at",
+            ["id", "title", "updated_at"],
+            ['"content"', "core_blogtag", "core_blog_tags"],
+        )
+
+    def test_camping_exclude(self):
+        """캠핑 목록에서 review, user, 태그를 빼면 그 컬럼, 테이블을 읽지 않음"""
+        self.assertSparse(
+            CAMPING_URL + "?exclude=review,user,tags",
+            ["id", "updated_at", "created_at", "title"],
+            ['"review"', "core_campingtag", "core_user"],
+        )
+
+    def test_next_page_keeps_fields(self):
+        """다음 페이지 링크에도 fields가 남음"""
+        res, _ = self.get(BLOG_URL + "?fields=title&page_size=2")
+        res, _ = self.get(res.data["next"])
+        self.assertEqual(res.data["results"], [{"title": "t0"}])
+
+    def test_retrieve_fields(self):
+        """상세 조회도 fields로 고름"""
+        blog = Blog.objects.first()
+        url = reverse("blog:blog-detail", args=[blog.id])
+        res, _ = self.get(url + "?fields=id,tags")
+        self.assertEqual(list(res.data), ["id", "tags"])
+        self.assertEqual(res.data["tags"][0]["name"], "태그")
+
+    def test_tag_fields(self):
+        """태그 목록에서 user를 빼면 user를 읽지 않음"""
+        res, queries = self.get(TAG_URL + "?exclude=user")
+        self.assertEqual(
+            res.data, [{"id": BlogTag.objects.get().id, "name": "태그", "slug": "태그"}]
+        )
+        self.assertFalse(
+            [sql for sql in queries if "core_user" in sql and "core_blogtag" in sql]
+        )
+
+    def test_unknown_field(self):
+        """없는 필드를 고르면 400"""
+        res, _ = self.get(BLOG_URL + "?fields=id,password")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", res.data)
@@ -0,0 +1,133 @@
+"""
+Test stored excerpts and ?view=summary lists
+"""
+
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blog.views import BlogAPIView
+from camping.views import CampingViewSet
+from core.models import EXCERPT_LENGTH, Blog, Camping, make_excerpt
+
+BLOG_URL = reverse("blog:blog-list")
+BLOG_BULK_URL = reverse("blog:blog-bulk")
+CAMPING_URL = reverse("camping:camping-list")
+
+LONG_TEXT = "캠핑장 후기 " * 500
+
+
+def create_user(**kwargs):
+    email = kwargs.pop("email", "user@example.com")
+    password = kwargs.pop("password", "test123!@#")
+    return get_user_model().objects.create_user(email, password, **kwargs)
+
+
+class ExcerptTest(TestCase):
+    def test_make_excerpt(self):
+        """공백을 줄이고 단어 단위로 EXCERPT_LENGTH 안에서 자름"""
+        self.assertEqual(make_excerpt("  짧은\n\n글  "), "짧은 글")
+        excerpt = make_excerpt(LONG_TEXT)
+        self.assertLessEqual(len(excerpt), EXCERPT_LENGTH)
+        self.assertTrue(excerpt.endswith("후기…"))
+
+    def test_save_updates_summary(self):
+        """save()에서 excerpt, word_count를 계산하고 update_fields에도 넣음"""
+        blog = Blog.objects.create(user=create_user(), title="t", content="a b c")
+        self.assertEqual((blog.excerpt, blog.word_count), ("a b c", 3))
+
+        blog.content = "d e"
+        blog.save(update_fields=["content"])
+        blog.refresh_from_db()
+        self.assertEqual((blog.excerpt, blog.word_count), ("d e", 2))
+
+
+class SummaryViewTest(TestCase):
+    def setUp(self):
+        caches[settings.API_CACHE_ALIAS].clear()
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url):
+        caches[settings.API_CACHE_ALIAS].clear()
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res, [query["sql"] for query in ctx.captured_queries]
+
+    def test_bulk_create_and_update(self):
+        """bulk 생성, 수정도 excerpt, word_count를 채움"""
+        payload = [{"title": "t", "content": LONG_TEXT, "tags": []}]
+        res = self.client.post(BLOG_BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        blog = Blog.objects.get()
+        self.assertEqual(blog.word_count, 1000)
+
+        payload = [{"id": blog.id, "content": "바뀐 글"}]
+        res = self.client.patch(BLOG_BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        blog.refresh_from_db()
+        self.assertEqual((blog.excerpt, blog.word_count), ("바뀐 글", 2))
+
+    def assertSummary(self, view, url, text_column, keys):
+        """compiled, 기존 serializer 모두 본문 컬럼을 읽지 않고 excerpt를 내보냄"""
+        for compiled in [True, False]:
+            with self.subTest(compiled=compiled), patch.object(
+                view, "compiled_list", compiled
+            ):
+                res, queries = self.get(url + "?view=summary")
+                item = res.data["results"][0]
+                self.assertEqual(list(item), keys)
+                self.assertEqual(item["excerpt"], make_excerpt(LONG_TEXT))
+                self.assertEqual(item["word_count"], 1000)
+                for sql in queries:
+                    self.assertNotIn(text_column, sql)
+
+    def test_blog_summary(self):
+        """글 목록 ?view=summary"""
+        Blog.objects.create(user=self.user, title="t", content=LONG_TEXT)
+        self.assertSummary(
+            BlogAPIView,
+            BLOG_URL,
+            '"content"',
+            [
+                "id",
+                "title",
+                "excerpt",
+                "word_count",
+                "tags",
+                "updated_at",
+                "created_at",
+            ],
+        )
+        res, _ = self.get(BLOG_URL)
+        self.assertEqual(res.data["results"][0]["content"], LONG_TEXT)
+        self.assertNotIn("excerpt", res.data["results"][0])
+
+    def test_camping_summary(self):
+        """캠핑 목록 ?view=summary"""
+        Camping.objects.create(user=self.user, title="t", review=LONG_TEXT)
+        self.assertSummary(
+            CampingViewSet,
+            CAMPING_URL,
+            '"review"',
+            [
+                "id",
+                "user",
+                "tags",
+                "updated_at",
+                "created_at",
+                "excerpt",
+                "word_count",
+                "title",
+            ],
+        )
@@ -0,0 +1,112 @@
+"""
+Test Server-Timing header and slow query log
+"""
+
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import Blog, BlogTag
+from core.timing import fingerprint
+
+BLOG_URL = reverse("blog:blog-list")
+
+
+def create_user(**kwargs):
+    email = kwargs.pop("email", "user@example.com")
+    password = kwargs.pop("password", "test123!@#")
+    return get_user_model().objects.create_user(email, password, **kwargs)
+
+
+def parse_server_timing(header):
+    """{name: (dur, desc)}"""
+    metrics = {}
+    for item in header.split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        params = dict(param.split("=", 1) for param in params)
+        metrics[name] = (float(params["dur"]), params.get("desc", "").strip('"'))
+    return metrics
+
+
+class FingerprintTest(SimpleTestCase):
+    def test_same_shape_same_fingerprint(self):
+        """값, IN 목록 길이만 다른 SQL은 fingerprint가 같음"""
+        key, sql = fingerprint(
+            'SELECT "core_blog"."id" FROM "core_blog"\n WHERE ("user_id" = 3 '
+            "AND \"title\" = 'it''s' AND \"id\" IN (%s, %s, %s)) LIMIT 21"
+        )
+        other, _ = fingerprint(
+            'SELECT "core_blog"."id" FROM "core_blog" WHERE ("user_id" = 12 '
+            'AND "title" = \'x\' AND "id" IN (%s)) LIMIT 5'
+        )
+        self.assertEqual(key, other)
+        self.assertEqual(
+            sql,
+            'SELECT "core_blog"."id" FROM "core_blog" WHERE ("user_id" = ? '
+            'AND "title" = ? AND "id" IN (...)) LIMIT ?',
+        )
+
+    def test_insert_rows(self):
+        """여러 row INSERT도 row 수와 상관없이 같음"""
+        _, sql = fingerprint('INSERT INTO "t" ("a", "b") VALUES (%s, %s), (%s, %s)')
+        self.assertEqual(sql, 'INSERT INTO "t" ("a", "b") VALUES (...)')
+
+
+class ServerTimingTest(TestCase):
+    def setUp(self):
+        caches[settings.API_CACHE_ALIAS].clear()
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        tag = BlogTag.objects.create(user=self.user, name="태그")
+        for i in range(3):
+            Blog.objects.create(user=self.user, title=f"t{i}", content="c").tags.add(
+                tag
+            )
+
+    def test_server_timing_header(self):
+        """SQL 수, 시간과 단계별 시간이 헤더에 나옴"""
+        res = self.client.get(BLOG_URL)
+        metrics = parse_server_timing(res["Server-Timing"])
+
+        self.assertEqual(metrics["db"][1], "5 queries")
+        for name in ["auth", "view", "serialize", "render", "total"]:
+            self.assertIn(name, metrics)
+        self.assertGreaterEqual(
+            metrics["total"][0],
+            metrics["auth"][0] + metrics["serialize"][0] + metrics["render"][0],
+        )
+
+    def test_cached_response_has_no_queries(self):
+        """응답 캐시에서 나가면 SQL이 없음"""
+        self.client.get(BLOG_URL)
+        res = self.client.get(BLOG_URL)
+        self.assertEqual(
+            parse_server_timing(res["Server-Timing"])["db"][1], "0 queries"
+        )
+
+    @override_settings(SERVER_TIMING=False)
+    def test_disabled(self):
+        res = self.client.get(BLOG_URL)
+        self.assertFalse(res.has_header("Server-Timing"))
+
+    @override_settings(SLOW_QUERY_MS=0, SLOW_REQUEST_MS=0)
+    def test_slow_log(self):
+        """기준을 넘은 요청, SQL은 JSON 한줄로 로그"""
+        with self.assertLogs("core.timing", "WARNING") as logs:
+            self.client.get(BLOG_URL + "?page_size=1")
+
+        records = [json.loads(record.getMessage()) for record in logs.records]
+        queries = [record for record in records if record["type"] == "slow_query"]
+        requests = [record for record in records if record["type"] == "slow_request"]
+        self.assertEqual(len(queries), 5)
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0]["path"], BLOG_URL)
+        self.assertEqual(requests[0]["queries"], 5)
+        self.assertTrue(all(len(record["fingerprint"]) == 16 for record in queries))
+        self.assertFalse([record for record in queries if "'" in record["sql"]])
@@ -0,0 +1,118 @@
+"""
+여러 앱 테스트에서 같이 쓰는 helper
+"""
+
+import re
+import tempfile
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+# mysql EXPLAIN type 중 인덱스로 찾는 것만 통과. ALL, index(인덱스 전체 scan),
+# index_merge 등은 실패. sqlite는 EXPLAIN QUERY PLAN detail이 SEARCH(인덱스, pk로
+# 찾음)이면 통과, SCAN(테이블이나 인덱스 전체)이면 실패
+INDEXED_ACCESS = {"mysql": {"system", "const", "eq_ref", "ref", "ref_or_null", "range"}}
+FILESORT = {
+    "sqlite": ("USE TEMP B-TREE",),
+    "mysql": ("Using filesort", "Using temporary"),
+}
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}")
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def plan_problems(sql):
+    """EXPLAIN 결과에서 인덱스로 찾지 않는 테이블 접근, filesort 찾기"""
+    problems = []
+    for row in explain(sql):
+        if connection.vendor == "mysql":
+            extra = row.get("Extra") or ""
+            # table이 없는 row(No tables used 등)는 접근이 없음
+            if row.get("table") and row.get("type") not in INDEXED_ACCESS["mysql"]:
+                problems.append(f"full scan: {row}")
+        else:
+            extra = row.get("detail", "")
+            if extra.startswith("SCAN "):
+                problems.append(f"full scan: {row}")
+        if any(p in extra for p in FILESORT[connection.vendor]):
+            problems.append(f"filesort: {row}")
+    return problems
+
+
+def from_table(sql):
+    match = re.search(r"\bFROM\s+[`\"]?(\w+)", sql, re.IGNORECASE)
+    return match.group(1) if match else None
+
+
+class QueryPlanTestMixin:
+    # auth_permission 같은 django 기본 테이블은 검사하지 않음
+    plan_tables = {
+        "core_blog",
+        "core_blogtag",
+        "core_blog_tags",
+        "core_camping",
+        "core_campingtag",
+        "core_camping_tags",
+    }
+
+    def assertNoFullScanOrFilesort(self, func):
+        """func 안에서 실행된 plan_tables SELECT의 실행계획에 full scan, filesort가 없어야함"""
+        if connection.vendor not in FILESORT:
+            self.skipTest(f"{connection.vendor}는 실행계획 검사 미지원")
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = func()
+
+        selects = [
+            query["sql"]
+            for query in ctx.captured_queries
+            if query["sql"].lstrip().upper().startswith("SELECT")
+            and from_table(query["sql"]) in self.plan_tables
+        ]
+        self.assertTrue(selects, "실행된 SELECT가 없음")
+        for sql in selects:
+            problems = plan_problems(sql)
+            self.assertFalse(problems, f"{sql}\n" + "\n".join(problems))
+        return result
+
+
+class QueryBudgetTestMixin:
+    def assertQueryBudget(self, budget, func, grow, rounds=2):
+        """
+        grow()로 row를 늘려가면서 func()를 실행해도
+        쿼리 수가 budget 이하로 일정해야함 (N+1 검사)
+        """
+        counts = []
+        for i in range(rounds):
+            if i:
+                grow()
+            with CaptureQueriesContext(connection) as ctx:
+                func()
+            counts.append(len(ctx))
+
+        queries = "\n".join(query["sql"] for query in ctx.captured_queries)
+        self.assertLessEqual(max(counts), budget, f"{counts}\n{queries}")
+        self.assertEqual(len(set(counts)), 1, f"{counts}\n{queries}")
+
+
+@contextmanager
+def shared_api_cache():
+    """API 캐시를 process끼리 공유되는 캐시(파일)로 바꿈. 명령줄 command 테스트용"""
+    with tempfile.TemporaryDirectory() as directory:
+        caches = {
+            **settings.CACHES,
+            settings.API_CACHE_ALIAS: {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": directory,
+                "KEY_PREFIX": "api",
+            },
+        }
+        with override_settings(CACHES=caches):
+            yield
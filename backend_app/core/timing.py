@@ -0,0 +1,202 @@
+"""
+요청 하나의 SQL 수, 시간과 단계(auth, view, serialize, render)별 시간
+
+core.middleware.QueryTimingMiddleware가 요청마다 RequestTiming을 넣고
+Server-Timing 헤더, 느린 요청/SQL 로그를 남긴다. SQL은 connection_created 때
+모든 connection에 건 execute wrapper(record_query)가 잼
+
+    Server-Timing: db;dur=3.1;desc="5 queries", auth;dur=0.4, view;dur=2.2,
+                   serialize;dur=1.3, render;dur=0.2, total;dur=4.6
+"""
+
+import hashlib
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import orjson
+from django.conf import settings
+
+logger = logging.getLogger("core.timing")
+
+# 요청 하나 동안의 RequestTiming. 요청 밖(command 등)에서는 None이라 재지 않음
+_timing = ContextVar("request_timing", default=None)
+
+# 따로 재는 단계. view는 전체에서 이 단계들을 뺀 나머지
+PHASES = ["auth", "serialize", "render"]
+
+_strings = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_numbers = re.compile(r"\b\d+(?:\.\d+)?\b")
+_placeholders = re.compile(r"%s|\?")
+_lists = re.compile(r"\(\?(?:\s*,\s*\?)*\)")
+_rows = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+
+
+def fingerprint(sql):
+    """
+    값만 다른 SQL이 같은 문자열이 되도록 문자열, 숫자, placeholder를 ?로,
+    IN 목록, VALUES row를 (...) 하나로 줄임. (hash, 정규화한 SQL)
+    """
+    sql = _strings.sub("?", sql)
+    sql = _numbers.sub("?", sql)
+    sql = _placeholders.sub("?", sql)
+    sql = _lists.sub("(...)", sql)
+    sql = _rows.sub("(...)", sql)
+    sql = " ".join(sql.split())
+    return hashlib.md5(sql.encode()).hexdigest()[:16], sql
+
+
+class RequestTiming:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.queries = 0
+        self.db = 0.0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.slow_queries = []
+        self.current = None
+
+    @property
+    def total(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def durations(self):
+        """단계별 ms"""
+        measured = sum(self.phases.values())
+        return {
+            "auth": self.phases["auth"] * 1000,
+            "view": max(0.0, self.total - measured) * 1000,
+            "serialize": self.phases["serialize"] * 1000,
+            "render": self.phases["render"] * 1000,
+        }
+
+    def header(self):
+        items = [f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"']
+        items += [
+            f"{name};dur={duration:.1f}"
+            for name, duration in self.durations().items()
+            if duration
+        ]
+        items.append(f"total;dur={self.total * 1000:.1f}")
+        return ", ".join(items)
+
+
+def start_timing():
+    return _timing.set(RequestTiming())
+
+
+def current_timing():
+    return _timing.get()
+
+
+def stop_timing(token):
+    timing = _timing.get()
+    _timing.reset(token)
+    timing.finished = time.perf_counter()
+    return timing
+
+
+@contextmanager
+def phase(name):
+    """name 단계 시간을 더함. 다른 단계 안에서 불리면 바깥 단계에 포함"""
+    timing = _timing.get()
+    if timing is None or timing.current is not None:
+        yield
+        return
+    timing.current = name
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.phases[name] += time.perf_counter() - started
+        timing.current = None
+
+
+def record_query(execute, sql, params, many, context):
+    timing = _timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        timing.queries += 1
+        timing.db += duration
+        if duration * 1000 >= settings.SLOW_QUERY_MS:
+            timing.slow_queries.append((context["connection"].alias, sql, duration))
+
+
+def install(connection):
+    """connection의 모든 SQL을 record_query로 감쌈 (pool에서 다시 받아도 한번만)"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def log_slow(request, response, timing):
+    """SLOW_REQUEST_MS 넘은 요청, SLOW_QUERY_MS 넘은 SQL을 JSON 한줄씩"""
+    base = {"method": request.method, "path": request.path}
+    for alias, sql, duration in timing.slow_queries:
+        key, normalized = fingerprint(sql)
+        record = {
+            "type": "slow_query",
+            **base,
+            "db": alias,
+            "ms": round(duration * 1000, 1),
+            "fingerprint": key,
+            "sql": normalized,
+        }
+        logger.warning(orjson.dumps(record).decode(), extra={"timing": record})
+
+    total = timing.total * 1000
+    if total >= settings.SLOW_REQUEST_MS:
+        record = {
+            "type": "slow_request",
+            **base,
+            "status": response.status_code,
+            "ms": round(total, 1),
+            "queries": timing.queries,
+            "db_ms": round(timing.db * 1000, 1),
+            "phases": {
+                name: round(duration, 1)
+                for name, duration in timing.durations().items()
+            },
+        }
+        logger.warning(orjson.dumps(record).decode(), extra={"timing": record})
+
+
+_timed_classes = {}
+
+
+class TimedDataMixin:
+    @property
+    def data(self):
+        with phase("serialize"):
+            return super().data
+
+
+def timed_serializer(serializer):
+    """serializer.data를 serialize 단계로 재는 subclass로 바꿈 (class마다 한번 만듦)"""
+    cls = type(serializer)
+    if issubclass(cls, TimedDataMixin):
+        return serializer
+    if cls not in _timed_classes:
+        _timed_classes[cls] = type(
+            cls.__name__, (TimedDataMixin, cls), {"__module__": cls.__module__}
+        )
+    serializer.__class__ = _timed_classes[cls]
+    return serializer
+
+
+class ServerTimingMixin:
+    """DRF view의 인증, 권한 확인(initial)과 serializer.data를 단계로 나눠서 잼"""
+
+    def initial(self, request, *args, **kwargs):
+        with phase("auth"):
+            super().initial(request, *args, **kwargs)
+
+    def get_serializer(self, *args, **kwargs):
+        return timed_serializer(super().get_serializer(*args, **kwargs))
@@ -14,6 +14,8 @@ from pathlib import Path
 import pymysql
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 pymysql.install_as_MySQLdb()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -52,7 +54,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.QueryTimingMiddleware",
+    "core.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -87,14 +92,100 @@ WSGI_APPLICATION = "main.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.mysql",
+        # 요청마다 새로 연결하지 않고 프로세스 단위 pool에서 꺼내 씀 (core/db/pool.py)
+        # pool이 연결을 들고 있으므로 CONN_MAX_AGE는 0으로 둠
+        "ENGINE": "core.db.backends.mysql_pool",
         "NAME": os.getenv("DB_NAME"),
         "USER": os.getenv("DB_USER"),
         "PASSWORD": os.getenv("DB_PASSWORD"),
         "HOST": os.getenv("DB_HOST"),
         "PORT": os.getenv("DB_PORT"),
+        "POOL": {
+            "MAX_SIZE": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+            "MAX_LIFETIME": int(os.getenv("DB_POOL_MAX_LIFETIME", 1800)),
+            "TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+            "CHECK_AFTER": float(os.getenv("DB_POOL_CHECK_AFTER", 1)),
+        },
+    }
+}
+
+# DB_REPLICA_HOSTS=host1,host2 면 replica1, replica2 alias로 추가
+# 요청 중 blog/camping 읽기를 replica로 보냄 (core/db/routers.py)
+REPLICA_DATABASES = []
+for i, host in enumerate(filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), 1):
+    alias = f"replica{i}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(alias)
+
+# DB_SHARD_HOSTS=host1,host2 면 default, shard1, shard2에 user별로 글, 태그를 나눔
+# user, token은 default에만. 새 user는 user_id hash로 shard가 정해지고
+# rebalance_shards command로 옮김 (core/db/routers.py)
+SHARD_DATABASES = []
+for i, host in enumerate(filter(None, os.getenv("DB_SHARD_HOSTS", "").split(",")), 1):
+    alias = f"shard{i}"
+    DATABASES[alias] = {**DATABASES["default"], "HOST": host.strip()}
+    SHARD_DATABASES.append(alias)
+if SHARD_DATABASES:
+    SHARD_DATABASES.insert(0, "default")
+# shard끼리 글, 태그 id가 겹치지 않도록 DB마다 auto increment를 SHARD_ID_STEP 간격,
+# SHARD_DATABASES 순서대로 offset 1, 2, ...로. user를 옮겨도 id가 그대로임
+# (세션 설정이라 default의 user, token 등 다른 테이블 id도 같은 간격으로 늘어남)
+SHARD_ID_STEP = int(os.getenv("SHARD_ID_STEP", 16))
+if len(SHARD_DATABASES) > SHARD_ID_STEP:
+    raise ImproperlyConfigured("shard 수가 SHARD_ID_STEP보다 많음")
+for offset, alias in enumerate(SHARD_DATABASES, 1):
+    DATABASES[alias]["OPTIONS"] = {
+        **DATABASES[alias].get("OPTIONS", {}),
+        "init_command": (
+            f"SET SESSION auto_increment_increment={SHARD_ID_STEP}, "
+            f"auto_increment_offset={offset}"
+        ),
     }
+# user -> shard 조회 결과를 API 캐시에 두는 시간(초)
+SHARD_CACHE_TIMEOUT = int(os.getenv("SHARD_CACHE_TIMEOUT", 60))
+# rebalance_shards: 쓰기를 막은 뒤 복사 전에 기다리는 시간(초)과 lock 유지 시간(초)
+SHARD_MOVE_GRACE = float(os.getenv("SHARD_MOVE_GRACE", 2))
+SHARD_MOVE_LOCK_TIMEOUT = int(os.getenv("SHARD_MOVE_LOCK_TIMEOUT", 300))
+
+DATABASE_ROUTERS = ["core.db.routers.ShardRouter", "core.db.routers.ReplicaRouter"]
+
+# 쓰기 후 이 시간(초) 동안은 그 user의 읽기를 primary에서 (replica 지연 대비)
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# API_CACHE_BACKEND로 memcached(PyMemcacheCache), redis(RedisCache)로 바꿀 수 있음
+# LocMemCache는 프로세스마다 따로라서 worker가 여러개면 토큰 폐기, 무효화가 다른
+# worker에 안 보임. 그래서 WEB_CONCURRENCY > 1이면 공유 캐시가 아닐 때
+# manage.py check가 실패함 (core/checks.py)
+
+# run.sh의 uvicorn worker 수
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+
+API_CACHE_ALIAS = "api"
+API_CACHE_TIMEOUT = int(os.getenv("API_CACHE_TIMEOUT", 60))
+API_CACHE_BACKEND = os.getenv(
+    "API_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+)
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    API_CACHE_ALIAS: {
+        "BACKEND": API_CACHE_BACKEND,
+        "LOCATION": os.getenv("API_CACHE_LOCATION", "api"),
+        "TIMEOUT": API_CACHE_TIMEOUT,
+        "KEY_PREFIX": "api",
+    },
 }
+if API_CACHE_BACKEND.endswith("LocMemCache"):
+    CACHES[API_CACHE_ALIAS]["OPTIONS"] = {"MAX_ENTRIES": 10000}
 
 
 # Password validation
@@ -144,14 +235,20 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# DEBUG가 아니면 browsable API(HTML)는 staff에게만 (core/negotiation.py)
+BROWSABLE_API_STAFF_ONLY = True
+
 REST_FRAMEWORK = {
     # YOUR SETTINGS
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    # "DEFAULT_RENDERER_CLASSES": [
-    #     "rest_framework.renderers.JSONRenderer",
-    # ],
+    # JSON 인코딩, 디코딩은 orjson으로 (core/renderers.py, core/parsers.py)
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_CONTENT_NEGOTIATION_CLASS": "core.negotiation.BrowsableAPINegotiation",
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "core.parsers.ORJSONParser",
         "rest_framework.parsers.FormParser",
         "rest_framework.parsers.MultiPartParser",
         "rest_framework.parsers.FileUploadParser",
@@ -168,3 +265,36 @@ SPECTACULAR_SETTINGS = {
 }
 
 AUTH_USER_MODEL = "core.User"
+
+# user/token/signed/ 에서 발급하는 서명 토큰 유효시간(초)
+SIGNED_TOKEN_LIFETIME = int(os.getenv("SIGNED_TOKEN_LIFETIME", 60 * 60 * 24))
+
+# 요청마다 Server-Timing 헤더 (core.middleware.QueryTimingMiddleware)
+SERVER_TIMING = os.getenv("SERVER_TIMING", "1") == "1"
+# 넘으면 core.timing logger에 JSON 한줄 (ms)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 100))
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", 1000))
+
+# worker들이 metrics를 합치는 디렉토리 (core/metrics.py). 없으면 process 메모리에만
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+# GET /metrics/ 에 Authorization: Bearer <token> 필요. 없으면 /metrics/ 를 막음
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+# 기록하는 URL namespace (app_name)
+METRICS_APPS = ["user", "blog", "camping"]
+
+# staff의 ?profile= 요청 결과를 저장하는 곳 (core/profiling.py). 최근 PROFILE_KEEP개만
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(BASE_DIR, "profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", 200))
+# stack sampling 간격 (ms)
+PROFILE_SAMPLE_MS = float(os.getenv("PROFILE_SAMPLE_MS", 5))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core.timing": {"handlers": ["console"], "level": "WARNING"},
+    },
+}
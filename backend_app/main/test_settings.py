@@ -0,0 +1,33 @@
+"""
+MariaDB 없이 로컬 SQLite 파일로 테스트. replica는 default를 mirror 하고
+shard1은 별도 파일. 라우팅, sharding은 해당 테스트에서만 켬
+
+test DB도 메모리 대신 파일로 만듦. fork한 process(generate_data --workers)가
+같은 DB를 봐야함
+
+    python manage.py test --settings main.test_settings
+"""
+
+from main.settings import *  # noqa: F401,F403
+from main.settings import BASE_DIR
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+        "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+        "TEST": {"MIRROR": "default"},
+    },
+    "shard1": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db_shard1.sqlite3",
+        "TEST": {"NAME": BASE_DIR / "test_db_shard1.sqlite3"},
+    },
+}
+REPLICA_DATABASES = []
+SHARD_DATABASES = []
+SHARD_MOVE_GRACE = 0
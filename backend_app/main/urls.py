@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from core.metrics import MetricsView
+from core.profiling import ProfileDetailView, ProfileListView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -14,4 +16,11 @@ urlpatterns = [
     path("user/", include("user.urls")),
     path("camping/", include("camping.urls")),
     path("blog/", include("blog.urls")),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+    path("profiles/", ProfileListView.as_view(), name="profile-list"),
+    path(
+        "profiles/<str:profile_id>/",
+        ProfileDetailView.as_view(),
+        name="profile-detail",
+    ),
 ]
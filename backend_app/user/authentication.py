@@ -0,0 +1,212 @@
+import secrets
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core import signing
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    BaseAuthentication,
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.authtoken.models import Token
+
+from core.cache import get_cache
+from core.models import RevokedToken, StatelessUser
+
+SALT = "user.signed-token"
+DENY_LIST_VERSION_KEY = "signed-token:deny-list:version"
+# 비활성화, 삭제된 user의 토큰을 막은 시각. 이때까지 발급된 토큰은 거부
+USER_REVOKED_KEY = "signed-token:user:{}:revoked"
+
+# 프로세스 안에 들고 있는 deny-list. 공유 캐시의 버전이 바뀔 때만 DB에서 다시 읽음
+_deny_list = {"version": None, "jtis": frozenset()}
+
+
+def issue_token(user):
+    expires_at = int(time.time()) + settings.SIGNED_TOKEN_LIFETIME
+    claims = {
+        "uid": user.pk,
+        "email": user.email,
+        "name": user.name,
+        "staff": user.is_staff,
+        "su": user.is_superuser,
+        "jti": secrets.token_hex(16),
+        "iat": time.time(),
+        "exp": expires_at,
+    }
+    return signing.dumps(claims, salt=SALT, compress=True), expires_at
+
+
+def load_claims(token):
+    try:
+        claims = signing.loads(token, salt=SALT)
+    except signing.BadSignature:
+        raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+    if claims["exp"] <= time.time():
+        raise exceptions.AuthenticationFailed(_("Token expired."))
+    return claims
+
+
+def check_user_revoked(claims, revoked_at):
+    # iat가 없는 예전 토큰은 만료시각에서 발급시각을 거꾸로 계산
+    issued_at = claims.get("iat", claims["exp"] - settings.SIGNED_TOKEN_LIFETIME)
+    if revoked_at is not None and issued_at <= revoked_at:
+        raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+
+def verify_token(token):
+    claims = load_claims(token)
+    check_user_revoked(claims, get_cache().get(USER_REVOKED_KEY.format(claims["uid"])))
+    if claims["jti"] in get_deny_list():
+        raise exceptions.AuthenticationFailed(_("Token revoked."))
+    return claims
+
+
+async def averify_token(token):
+    claims = load_claims(token)
+    check_user_revoked(
+        claims, await get_cache().aget(USER_REVOKED_KEY.format(claims["uid"]))
+    )
+    if claims["jti"] in await aget_deny_list():
+        raise exceptions.AuthenticationFailed(_("Token revoked."))
+    return claims
+
+
+def revoked_jtis():
+    return RevokedToken.objects.filter(expires_at__gt=datetime.now()).values_list(
+        "jti", flat=True
+    )
+
+
+def get_deny_list():
+    cache = get_cache()
+    version = cache.get(DENY_LIST_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(DENY_LIST_VERSION_KEY, version, None):
+            version = cache.get(DENY_LIST_VERSION_KEY, version)
+
+    if version != _deny_list["version"]:
+        _deny_list.update(version=version, jtis=frozenset(revoked_jtis()))
+    return _deny_list["jtis"]
+
+
+async def aget_deny_list():
+    cache = get_cache()
+    version = await cache.aget(DENY_LIST_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not await cache.aadd(DENY_LIST_VERSION_KEY, version, None):
+            version = await cache.aget(DENY_LIST_VERSION_KEY, version)
+
+    if version != _deny_list["version"]:
+        jtis = frozenset([jti async for jti in revoked_jtis()])
+        _deny_list.update(version=version, jtis=jtis)
+    return _deny_list["jtis"]
+
+
+def revoke_token(claims):
+    RevokedToken.objects.filter(expires_at__lte=datetime.now()).delete()
+    RevokedToken.objects.get_or_create(
+        jti=claims["jti"],
+        defaults={"expires_at": datetime.fromtimestamp(claims["exp"])},
+    )
+    get_cache().set(DENY_LIST_VERSION_KEY, time.time_ns(), None)
+
+
+def revoke_user_tokens(user_id):
+    """
+    user에게 지금까지 발급한 토큰을 모두 막음 (user.signals가 비활성화, 삭제 때 부름)
+
+    그 뒤에 발급한 토큰은 통과. 막은 토큰은 SIGNED_TOKEN_LIFETIME 안에 만료되므로
+    그때까지만 캐시에 둠
+    """
+    get_cache().set(
+        USER_REVOKED_KEY.format(user_id), time.time(), settings.SIGNED_TOKEN_LIFETIME
+    )
+
+
+def stateless_user(claims):
+    user = StatelessUser(
+        id=claims["uid"],
+        email=claims["email"],
+        name=claims["name"],
+        is_staff=claims["staff"],
+        is_superuser=claims["su"],
+        is_active=True,
+    )
+    user._state.adding = False
+    user._state.db = DEFAULT_DB_ALIAS
+    return user
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    HMAC 서명된 토큰 인증
+
+        Authorization: Bearer <token>
+
+    토큰 안의 user id, 만료시간을 메모리에서 검증하고 DB의 유저를 읽지 않는다.
+    토큰이 살아있는 동안은 발급 당시의 is_staff 등이 그대로 쓰이므로 권한을 바꾸면
+    revoke 해야함. 비활성화, 삭제된 user의 토큰은 revoke_user_tokens로 막힘
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        token = get_token(request, self.keyword)
+        if token is None:
+            return None
+
+        claims = verify_token(token)
+        return (stateless_user(claims), claims)
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+def get_token(request, keyword):
+    """Authorization: <keyword> <token>의 token. keyword가 다르면 None"""
+    auth = get_authorization_header(request).split()
+
+    if not auth or auth[0].lower() != keyword.lower().encode():
+        return None
+
+    if len(auth) != 2:
+        msg = _("Invalid token header.")
+        raise exceptions.AuthenticationFailed(msg)
+
+    try:
+        return auth[1].decode()
+    except UnicodeError:
+        msg = _(
+            "Invalid token header. Token string should not contain invalid characters."
+        )
+        raise exceptions.AuthenticationFailed(msg)
+
+
+async def aauthenticate(request):
+    """
+    SignedTokenAuthentication, TokenAuthentication 순서로 인증하는 async 버전
+
+    인증 헤더가 없으면 None, 토큰이 잘못되면 AuthenticationFailed
+    """
+    token = get_token(request, SignedTokenAuthentication.keyword)
+    if token is not None:
+        return stateless_user(await averify_token(token))
+
+    key = get_token(request, TokenAuthentication.keyword)
+    if key is None:
+        return None
+    try:
+        token = await Token.objects.select_related("user").aget(key=key)
+    except Token.DoesNotExist:
+        raise exceptions.AuthenticationFailed(_("Invalid token."))
+    if not token.user.is_active:
+        raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+    return token.user
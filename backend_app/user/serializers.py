@@ -21,7 +21,8 @@ class UserInSerializer(serializers.ModelSerializer):
 class UserOutSerializer(serializers.ModelSerializer):
     class Meta:
         model = get_user_model()
-        exclude = ["password"]
+        # shard는 내부 DB alias라서 응답에 넣지 않음
+        exclude = ["password", "shard"]
 
 
 class AuthTokenSerializer(serializers.Serializer):
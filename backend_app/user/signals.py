@@ -0,0 +1,18 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from user.authentication import revoke_user_tokens
+
+
+# queryset.update(is_active=False)는 signal이 없으므로 revoke_user_tokens를 직접 부름
+@receiver(post_save, sender=get_user_model())
+def revoke_inactive_user_tokens(sender, instance, raw=False, **kwargs):
+    """비활성화된 user의 서명 토큰을 막음 (토큰 인증은 DB의 user를 읽지 않음)"""
+    if not raw and not instance.is_active:
+        revoke_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=get_user_model())
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    revoke_user_tokens(instance.pk)
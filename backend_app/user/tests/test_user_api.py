@@ -3,8 +3,16 @@ from rest_framework import status
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Blog
 
 TOKEN_URL = reverse("user:token")
+SIGNED_TOKEN_URL = reverse("user:signed-token")
+REVOKE_TOKEN_URL = reverse("user:revoke-token")
+BLOG_URL = reverse("blog:blog-list")
 
 
 def create_user(email="user@example.com", password="test123!@#"):
@@ -29,3 +37,87 @@ class PrivateTestUserApi(TestCase):
 
         self.assertIn("token", res.data)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class SignedTokenApiTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        res = self.client.post(
+            SIGNED_TOKEN_URL, dict(email="user@example.com", password="test123!@#")
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.token = res.data["token"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_signed_token_authenticates_without_user_lookup(self):
+        """서명 토큰은 user, token 테이블 조회 없이 인증"""
+        self.client.get(BLOG_URL)
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.post(BLOG_URL, dict(title="title", content="content"))
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Blog.objects.get().user, self.user)
+        for query in ctx.captured_queries:
+            self.assertNotIn("authtoken_token", query["sql"])
+            self.assertNotIn("core_revokedtoken", query["sql"])
+            self.assertFalse(query["sql"].startswith('SELECT "core_user"'))
+
+    def test_tampered_token_raise_error(self):
+        """변조된 토큰은 401"""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token[:-1]}x")
+        res = self.client.get(BLOG_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(SIGNED_TOKEN_LIFETIME=-1)
+    def test_expired_token_raise_error(self):
+        """만료된 토큰은 401"""
+        res = self.client.post(
+            SIGNED_TOKEN_URL, dict(email="user@example.com", password="test123!@#")
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['token']}")
+        res = self.client.get(BLOG_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoked_token_raise_error(self):
+        """revoke된 토큰은 401, 다른 토큰은 그대로 사용"""
+        res = self.client.post(
+            SIGNED_TOKEN_URL, dict(email="user@example.com", password="test123!@#")
+        )
+        other_token = res.data["token"]
+
+        res = self.client.post(REVOKE_TOKEN_URL)
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+        res = self.client.get(BLOG_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {other_token}")
+        res = self.client.get(BLOG_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_deactivated_user_token_raise_error(self):
+        """비활성화된 user의 토큰은 401. 다시 활성화한 뒤 새로 받은 토큰은 통과"""
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.post(BLOG_URL, dict(title="title", content="content"))
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.is_active = True
+        self.user.save()
+        res = self.client.get(BLOG_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        res = self.client.post(
+            SIGNED_TOKEN_URL, dict(email="user@example.com", password="test123!@#")
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['token']}")
+        res = self.client.get(BLOG_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_deleted_user_token_raise_error(self):
+        """삭제된 user의 토큰으로는 글을 못 만듦"""
+        self.user.delete()
+        res = self.client.post(BLOG_URL, dict(title="title", content="content"))
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(Blog.objects.exists())
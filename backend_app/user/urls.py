@@ -1,10 +1,13 @@
 from django.urls import path
 from user import views
 
-
 app_name = "user"
 
 urlpatterns = [
     path("token/", views.UserCreateTokenView.as_view(), name="token"),
+    path(
+        "token/signed/", views.UserCreateSignedTokenView.as_view(), name="signed-token"
+    ),
+    path("token/revoke/", views.UserRevokeTokenView.as_view(), name="revoke-token"),
     path("create/", views.UserCreateView.as_view(), name="create"),
 ]
@@ -1,11 +1,37 @@
-from rest_framework import generics
+from datetime import datetime
+
+from rest_framework import generics, status
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from core.timing import ServerTimingMixin
+from user.authentication import SignedTokenAuthentication, issue_token, revoke_token
 from user.serializers import AuthTokenSerializer, UserInSerializer
 
 
-class UserCreateTokenView(ObtainAuthToken):
+class UserCreateTokenView(ServerTimingMixin, ObtainAuthToken):
     serializer_class = AuthTokenSerializer
 
 
-class UserCreateView(generics.CreateAPIView):
+class UserCreateSignedTokenView(UserCreateTokenView):
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        token, expires_at = issue_token(serializer.validated_data["user"])
+        return Response(
+            {"token": token, "expires_at": datetime.fromtimestamp(expires_at)}
+        )
+
+
+class UserRevokeTokenView(ServerTimingMixin, APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [SignedTokenAuthentication]
+
+    def post(self, request, *args, **kwargs):
+        revoke_token(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UserCreateView(ServerTimingMixin, generics.CreateAPIView):
     serializer_class = UserInSerializer
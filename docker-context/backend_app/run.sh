@@ -13,4 +13,20 @@ while ! nc $DB_HOST $DB_PORT; do
   sleep 1
 done
 
-python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+# worker가 여러개면 METRICS_DIR에 process별 metrics 파일을 모아서 /metrics/ 가 합침
+# (core/metrics.py). 이전 실행의 파일이 섞이지 않도록 띄우기 전에 metrics 파일만 지움
+if [ -n "$METRICS_DIR" ]; then
+  mkdir -p "$METRICS_DIR"
+  rm -f "$METRICS_DIR"/*.db
+fi
+
+# worker가 여러개인데 API 캐시가 프로세스마다 따로면 토큰 폐기가 다른 worker에
+# 안 보이므로 띄우지 않음 (core/checks.py)
+python manage.py check
+
+# ASGI worker: async view(/blog/async/, /camping/async/)는 이벤트 루프에서,
+# 나머지 동기 view는 요청마다 따로 thread에서 처리됨
+exec uvicorn main.asgi:application \
+  --host 0.0.0.0 --port 8000 \
+  --workers "${WEB_CONCURRENCY:-1}" \
+  $UVICORN_EXTRA_ARGS
\ No newline at end of file